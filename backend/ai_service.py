@@ -1,34 +1,132 @@
 import os
 import json
 import uuid
+import time
+import random
+import hashlib
+from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from .models import AnalysisResponse, ArgumentResponse
-from .empathy_service import detect_empathy, detect_emotions
+from .empathy_service import analyze_affect_async
+from .prompt_budget import get_budget, pack_items, truncate_to_tokens
+from .database import get_db_connection
+from . import metrics
 
 load_dotenv()
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
 print(f"DEBUG: OpenAI API Key loaded: {bool(os.getenv('OPENAI_API_KEY'))}")
 
-async def analyze_text(text: str) -> AnalysisResponse:
-    try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": """You are an expert in detecting harmful content, radicalization, and extremist ideologies. 
+# Two-tier model routing for analyze_text
+ANALYSIS_MODEL = os.getenv("ANALYSIS_MODEL", "gpt-4o")
+TRIAGE_MODEL = os.getenv("TRIAGE_MODEL", "gpt-4o-mini")
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+# run_pipeline discards anything under 0.1, so only scores at or above it need the full model
+TRIAGE_ESCALATION_THRESHOLD = float(os.getenv("TRIAGE_ESCALATION_THRESHOLD", "0.1"))
+# Share of non-escalated items also scored by the full model to measure recall
+ROUTING_AUDIT_RATE = float(os.getenv("ROUTING_AUDIT_RATE", "0.05"))
+
+ANALYSIS_SYSTEM_PROMPT = """You are an expert in detecting harmful content, radicalization, and extremist ideologies. 
                 Analyze the input text for markers of: Incel Ideology, White Supremacy, Violent Extremism, Anti-LGBTQ+ Hate, Self-Harm.
                 Return a JSON object with:
                 - radicalization_score (0.0 to 1.0)
                 - detected_themes (list of strings)
                 - summary (brief explanation)
-                """},
-                {"role": "user", "content": text}
-            ],
-            response_format={"type": "json_object"}
+                """
+
+async def score_with_model(text: str, model: str) -> dict:
+    """
+    Run the harmful-content analysis prompt on one model.
+    Returns the parsed JSON result plus the model name, latency and token usage.
+    """
+    start = time.perf_counter()
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": text}
+        ],
+        response_format={"type": "json_object"}
+    )
+    
+    result = json.loads(response.choices[0].message.content)
+    result["radicalization_score"] = float(result.get("radicalization_score", 0.0))
+    result["model"] = model
+    result["latency_ms"] = (time.perf_counter() - start) * 1000
+    result["total_tokens"] = response.usage.total_tokens if response.usage else None
+    return result
+
+def record_routing_decision(text: str, triage: Optional[dict], final: dict, escalated: bool, audited: bool):
+    """
+    Persist one routing decision so the threshold can be tuned for cost and recall.
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO model_routing_decisions
+            (id, timestamp, text_hash, text_length, triage_model, triage_score, triage_latency_ms, triage_tokens,
+             escalated, audited, final_model, final_score, final_latency_ms, final_tokens, threshold)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                str(uuid.uuid4()),
+                datetime.now().isoformat(),
+                hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                len(text),
+                triage["model"] if triage else None,
+                triage["radicalization_score"] if triage else None,
+                triage["latency_ms"] if triage else None,
+                triage["total_tokens"] if triage else None,
+                int(escalated),
+                int(audited),
+                final["model"],
+                final["radicalization_score"],
+                final["latency_ms"],
+                final["total_tokens"],
+                TRIAGE_ESCALATION_THRESHOLD
+            )
         )
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        print(f"Error recording routing decision: {e}")
+
+async def analyze_text(text: str) -> AnalysisResponse:
+    """
+    Score text for harmful content with two-tier model routing.
+    The triage model scores everything; only items at or above
+    TRIAGE_ESCALATION_THRESHOLD are re-scored by the full analysis model.
+    A small random share of non-escalated items is also re-scored (audited)
+    so missed escalations can be measured.
+    """
+    text = truncate_to_tokens(text, get_budget(ANALYSIS_MODEL, 0.25), ANALYSIS_MODEL)
+    try:
+        triage = None
+        escalated = True
+        audited = False
         
-        result = json.loads(response.choices[0].message.content)
+        if MODEL_ROUTING_ENABLED:
+            try:
+                triage = await score_with_model(text, TRIAGE_MODEL)
+                escalated = triage["radicalization_score"] >= TRIAGE_ESCALATION_THRESHOLD
+                audited = not escalated and random.random() < ROUTING_AUDIT_RATE
+            except Exception as e:
+                # Triage failures fall through to the full model
+                print(f"Triage model error, escalating: {e}")
+        
+        if escalated or audited:
+            full = await score_with_model(text, ANALYSIS_MODEL)
+            # Audited items keep the triage verdict; the full score is only recorded
+            result = full if escalated else triage
+        else:
+            full = None
+            result = triage
+        
+        if MODEL_ROUTING_ENABLED:
+            metrics.increment("analysis.escalated" if escalated else "analysis.triage_only")
+            record_routing_decision(text, triage, full or triage, escalated, audited)
         
         return AnalysisResponse(
             id=str(uuid.uuid4()),
@@ -46,6 +144,46 @@ async def analyze_text(text: str) -> AnalysisResponse:
             summary=f"Could not perform AI analysis: {str(e)}"
         )
 
+def get_routing_stats() -> dict:
+    """
+    Summarize recorded routing decisions: escalation rate, token spend per tier,
+    and missed escalations among audited items (triage below threshold, full model above).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(escalated), 0) AS escalated,
+            COALESCE(SUM(audited), 0) AS audited,
+            COALESCE(SUM(CASE WHEN audited = 1 AND final_score >= threshold THEN 1 ELSE 0 END), 0) AS missed,
+            COALESCE(SUM(triage_tokens), 0) AS triage_tokens,
+            COALESCE(SUM(CASE WHEN escalated = 1 OR audited = 1 THEN final_tokens ELSE 0 END), 0) AS full_tokens,
+            AVG(triage_latency_ms) AS avg_triage_latency_ms,
+            AVG(CASE WHEN escalated = 1 THEN final_latency_ms END) AS avg_full_latency_ms
+        FROM model_routing_decisions"""
+    )
+    row = cursor.fetchone()
+    conn.close()
+    
+    total = row['total']
+    audited = row['audited']
+    return {
+        "triage_model": TRIAGE_MODEL,
+        "analysis_model": ANALYSIS_MODEL,
+        "threshold": TRIAGE_ESCALATION_THRESHOLD,
+        "total_decisions": total,
+        "escalated": row['escalated'],
+        "escalation_rate": round(row['escalated'] / total, 3) if total else 0.0,
+        "audited": audited,
+        "missed_escalations": row['missed'],
+        "audit_miss_rate": round(row['missed'] / audited, 3) if audited else None,
+        "triage_tokens": row['triage_tokens'],
+        "full_model_tokens": row['full_tokens'],
+        "avg_triage_latency_ms": row['avg_triage_latency_ms'],
+        "avg_full_latency_ms": row['avg_full_latency_ms']
+    }
+
 async def generate_argument(
     topic: str,
     profile: dict = None,
@@ -55,8 +193,9 @@ async def generate_argument(
 ) -> ArgumentResponse:
     try:
         # Analyze topic for emotional triggers
-        topic_empathy = detect_empathy(topic)
-        topic_emotion = detect_emotions(topic)
+        topic_affect = await analyze_affect_async(topic or "")
+        topic_empathy = topic_affect["empathy"]
+        topic_emotion = topic_affect["emotion"]
         
         # Construct a rich system prompt
         system_prompt = """You are an expert in de-radicalization, street epistemology, and empathetic communication. 
@@ -90,10 +229,17 @@ async def generate_argument(
             user_prompt += f"- Notes: {profile.get('notes', '')}\n\n"
 
         if history:
+            # History arrives newest first; pack as many recent items as fit
+            packed_history = pack_items(
+                [f"- {item.get('timestamp')}: {item.get('content')}" for item in history],
+                budget=get_budget("gpt-4o", 0.1),
+                model="gpt-4o",
+                separator="\n",
+                per_item_max=200,
+                label="history items"
+            )
             user_prompt += f"RECENT CONTENT HISTORY (The 'Rabbit Hole'):\n"
-            for item in history[:3]: # Last 3 items
-                user_prompt += f"- {item.get('timestamp')}: {item.get('content')[:100]}...\n"
-            user_prompt += "\n"
+            user_prompt += packed_history["text"] + "\n\n"
 
         if authorities:
             user_prompt += f"TRUSTED AUTHORITIES:\n"
@@ -102,6 +248,7 @@ async def generate_argument(
             user_prompt += "\n"
 
         if rag_context:
+            rag_context = truncate_to_tokens(rag_context, get_budget("gpt-4o", 0.25), "gpt-4o")
             user_prompt += f"FACTUAL CONTEXT & COUNTER-NARRATIVES:\n{rag_context}\n\n"
 
         user_prompt += """TASK:
@@ -144,6 +291,15 @@ async def simulate_subject_response(
     Simulates how the Subject (Digital Clone) would respond to the generated argument.
     """
     try:
+        packed_history = pack_items(
+            [json.dumps(item, indent=2) for item in subject_history or []],
+            budget=get_budget("gpt-4o", 0.1),
+            model="gpt-4o",
+            separator=",\n",
+            per_item_max=300,
+            label="history items"
+        )
+
         system_prompt = f"""You are roleplaying as a young person named {subject_profile.get('name', 'Alex')}.
         
         YOUR PROFILE:
@@ -152,7 +308,7 @@ async def simulate_subject_response(
         - Personality/Notes: {subject_profile.get('notes', '')}
         
         YOUR RECENT CONSUMPTION HISTORY (What you've been reading/watching):
-        {json.dumps(subject_history[:5], indent=2)}
+        [{packed_history["text"]}]
         
         INSTRUCTIONS:
         - Respond to the input argument as if you are this person.
@@ -40,6 +40,40 @@ class AuthorityMatcher:
         }
     }
     
+    # Keyword indicators for each theme group, and the themes each group implies
+    THEME_KEYWORDS = {
+        # Incel/Blackpill indicators
+        "incel": {
+            "keywords": ["blackpill", "chad", "stacy", "incel", "cope", "rope"],
+            "themes": ["incel"]
+        },
+        # Accelerationism/Extremism
+        "accelerationism": {
+            "keywords": ["accelerat", "collapse", "burn it down", "system", "revolution"],
+            "themes": ["accelerationism", "extremism"]
+        },
+        # Violence
+        "violence": {
+            "keywords": ["weapon", "gun", "kill", "attack", "violence", "hurt", "hate them"],
+            "themes": ["violence", "threats"]
+        },
+        # Isolation/Loneliness
+        "isolation": {
+            "keywords": ["alone", "lonely", "no friends", "isolation", "rotting"],
+            "themes": ["isolation", "loneliness"]
+        },
+        # Hopelessness/Depression
+        "hopelessness": {
+            "keywords": ["no hope", "pointless", "why try", "give up", "it's over"],
+            "themes": ["hopelessness", "depression"]
+        },
+        # Nihilism
+        "nihilism": {
+            "keywords": ["meaningless", "pointless", "nothing matters", "nihil"],
+            "themes": ["nihilism"]
+        }
+    }
+    
     @staticmethod
     def extract_themes_from_posts(subject_id: str) -> List[str]:
         """Extract primary themes from subject's social media posts."""
@@ -61,34 +95,9 @@ class AuthorityMatcher:
         all_content = " ".join([p['content'].lower() for p in posts])
         
         themes = []
-        
-        # Incel/Blackpill indicators
-        if any(word in all_content for word in ["blackpill", "chad", "stacy", "incel", "cope", "rope"]):
-            themes.append("incel")
-            
-        # Accelerationism/Extremism
-        if any(word in all_content for word in ["accelerat", "collapse", "burn it down", "system", "revolution"]):
-            themes.append("accelerationism")
-            themes.append("extremism")
-            
-        # Violence
-        if any(word in all_content for word in ["weapon", "gun", "kill", "attack", "violence", "hurt", "hate them"]):
-            themes.append("violence")
-            themes.append("threats")
-            
-        # Isolation/Loneliness
-        if any(word in all_content for word in ["alone", "lonely", "no friends", "isolation", "rotting"]):
-            themes.append("isolation")
-            themes.append("loneliness")
-            
-        # Hopelessness/Depression
-        if any(word in all_content for word in ["no hope", "pointless", "why try", "give up", "it's over"]):
-            themes.append("hopelessness")
-            themes.append("depression")
-            
-        # Nihilism
-        if any(word in all_content for word in ["meaningless", "pointless", "nothing matters", "nihil"]):
-            themes.append("nihilism")
+        for rule in AuthorityMatcher.THEME_KEYWORDS.values():
+            if any(word in all_content for word in rule["keywords"]):
+                themes.extend(rule["themes"])
             
         if not themes:
             themes.append("general")
@@ -0,0 +1,87 @@
+"""
+Load test for the hot API paths.
+
+Start the LLM stand-in and the API pointed at it, then run this script:
+    uvicorn backend.llm_standin_server:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=standin uvicorn backend.main:app --port 8000
+    python backend/benchmark_api.py --scenario chat --concurrency 16 --requests 200
+
+Reports throughput, error count and p50/p95/p99 latency.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from metrics import summarize
+
+BASE_URL = "http://127.0.0.1:8000"
+
+SCENARIOS = {
+    "chat": ("POST", "/chat", {"query": "My son keeps talking about the blackpill. What should I do?", "language": "en"}),
+    "chat_zu": ("POST", "/chat", {"query": "Indodana yami ikhuluma ngebhlakhiphili. Ngenzeni?", "language": "zu"}),
+    "analyze": ("POST", "/analyze", {"text": "It's over for guys like us, the system is rigged and we should burn it down."}),
+    "feed": ("GET", "/api/listening/feed", None),
+}
+
+
+async def run_scenario(base_url: str, scenario: str, concurrency: int, total: int, clone_id: str = None):
+    if scenario == "clone_chat":
+        method, path, body = "POST", f"/api/clones/{clone_id}/chat", {
+            "clone_id": clone_id,
+            "message": "I get why you're angry. What made you start feeling this way?",
+            "language": "en"
+        }
+    else:
+        method, path, body = SCENARIOS[scenario]
+
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    print(f"Scenario: {scenario} ({method} {path})")
+    print(f"  Requests: {total}, concurrency: {concurrency}, errors: {errors}")
+    print(f"  Throughput: {total / elapsed:.1f} req/s over {elapsed:.1f}s")
+    print(f"  Latency (ms): {summarize(latencies)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the RECAPTURE API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--scenario", default="chat", choices=list(SCENARIOS) + ["clone_chat"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--clone-id", default=None, help="Required for the clone_chat scenario")
+    args = parser.parse_args()
+
+    if args.scenario == "clone_chat" and not args.clone_id:
+        parser.error("--clone-id is required for clone_chat")
+
+    asyncio.run(run_scenario(args.base_url, args.scenario, args.concurrency, args.requests, args.clone_id))
@@ -0,0 +1,100 @@
+"""
+End-to-end clone chat latency for non-English users: the old sequential
+translation flow vs. chat_with_clone's concurrent one.
+
+Run against the LLM stand-in (recorded cassettes give realistic suggestions):
+    LLM_STANDIN_LATENCY_MS=150 uvicorn backend.llm_standin_server:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=standin \\
+        python -m backend.benchmark_clone_chat --clone-id <id> --iterations 10
+
+The translation cache is disabled so every run makes the same API calls.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("TRANSLATION_CACHE_ENABLED", "false")
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.database import get_db_connection
+from backend.digital_clone_service import (
+    chat_with_clone,
+    evaluate_argument_effectiveness,
+    generate_clone_response,
+    load_clone_conversation,
+    save_clone_conversation
+)
+from backend.empathy_service import analyze_affect_async
+from backend.metrics import summarize
+from backend.translation_service import translate_input_to_english, translate_output_from_english
+
+MESSAGES = {
+    "zu": "Ngiyakuzwa ukuthi uthukuthele. Yini eyaqala ukukwenza uzizwe kanjena?",
+    "sw": "Naelewa kwa nini una hasira. Ni nini kilichokufanya uanze kujisikia hivi?"
+}
+
+
+async def sequential_chat_with_clone(clone_id: str, message: str, language: str) -> str:
+    """The previous chat_with_clone: every translation awaited one after another."""
+    processed_message = await translate_input_to_english(message, language)
+    await analyze_affect_async(processed_message)
+    clone, conversation_history, conversation_id = load_clone_conversation(clone_id, None)
+
+    clone_response_en = await generate_clone_response(clone, processed_message, conversation_history)
+    effectiveness_score, suggestions_en = await evaluate_argument_effectiveness(clone, processed_message, clone_response_en)
+
+    await translate_output_from_english(clone_response_en, language)
+    for suggestion in suggestions_en:
+        await translate_output_from_english(suggestion, language)
+
+    save_clone_conversation(conversation_id, clone_id, conversation_history, processed_message, clone_response_en, effectiveness_score)
+    return conversation_id
+
+
+async def concurrent_chat_with_clone(clone_id: str, message: str, language: str) -> str:
+    result = await chat_with_clone(clone_id, message, None, language)
+    return result["conversation_id"]
+
+
+async def measure(label: str, chat, clone_id: str, language: str, iterations: int, conversation_ids: list):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        conversation_ids.append(await chat(clone_id, MESSAGES[language], language))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    summary = summarize(latencies)
+    print(f"  {label:>10}: mean {summary['mean']:8.1f} ms, p50 {summary['p50']:8.1f} ms, p95 {summary['p95']:8.1f} ms")
+
+
+async def benchmark(clone_id: str, iterations: int):
+    print(f"🧪 Clone chat latency, {iterations} messages per language\n")
+    print("=" * 60)
+
+    conversation_ids = []
+    for language in MESSAGES:
+        print(f"Language: {language}")
+        await measure("sequential", sequential_chat_with_clone, clone_id, language, iterations, conversation_ids)
+        await measure("concurrent", concurrent_chat_with_clone, clone_id, language, iterations, conversation_ids)
+
+    # Remove the benchmark conversations
+    conn = get_db_connection()
+    conn.executemany("DELETE FROM clone_conversations WHERE id = ?", [(cid,) for cid in conversation_ids])
+    conn.commit()
+    conn.close()
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark clone chat translation latency")
+    parser.add_argument("--clone-id", required=True)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.clone_id, args.iterations))
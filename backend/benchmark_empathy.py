@@ -0,0 +1,66 @@
+"""
+CPU benchmark for batched empathy and emotion inference.
+Reports messages/sec at batch sizes 1, 8 and 32.
+"""
+
+import sys
+import os
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.empathy_service import (
+    load_empathy_model,
+    load_emotion_model,
+    detect_empathy_batch,
+    detect_emotions_batch
+)
+
+BATCH_SIZES = [1, 8, 32]
+MESSAGE_COUNT = 128
+
+SAMPLE_MESSAGES = [
+    "I can really understand how you're feeling. I'm here for you.",
+    "You're just wrong about this. The facts clearly show otherwise.",
+    "I can't take this anymore. Everything feels hopeless and I don't know what to do.",
+    "This is absolutely ridiculous! Nobody understands what I'm going through!",
+    "Can you explain what you mean by that? I'm interested in learning more.",
+    "It's over for guys like us, the system is rigged from the start and nothing will ever change.",
+    "Thanks for listening, honestly it helps more than you know.",
+    "Why would I trust anyone who says that? They've lied before."
+]
+
+
+def benchmark():
+    print("🧪 Benchmarking batched empathy/emotion inference (CPU)\n")
+    print("=" * 60)
+
+    if load_empathy_model() is None or load_emotion_model() is None:
+        print("❌ Models unavailable (is transformers/torch installed?)")
+        return
+
+    messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(MESSAGE_COUNT)]
+
+    # Warm up so first-call overhead isn't measured
+    detect_empathy_batch(messages[:8], batch_size=8)
+    detect_emotions_batch(messages[:8], batch_size=8)
+
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        detect_empathy_batch(messages, batch_size=batch_size)
+        empathy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detect_emotions_batch(messages, batch_size=batch_size)
+        emotion_elapsed = time.perf_counter() - start
+
+        print(f"Batch size {batch_size:>2}: "
+              f"empathy {MESSAGE_COUNT / empathy_elapsed:7.1f} msg/s, "
+              f"emotion {MESSAGE_COUNT / emotion_elapsed:7.1f} msg/s")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,110 @@
+"""
+Load test of the listening pipeline against replayed posts, no network.
+
+Replays a recorded dump (or synthetic posts) through ReplayConnectors at the
+given rate into a scratch database and reports committed posts per second
+and per-stage throughput.
+
+    python -m backend.benchmark_listening_pipeline --rate 2000 --seconds 20
+    python -m backend.benchmark_listening_pipeline --dump dumps/listening.jsonl --rate 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+SYNTHETIC_POSTS = 5000
+
+
+def make_synthetic_dump(path: str, rng: random.Random):
+    words = ["the", "they", "never", "tell", "you", "about", "real", "men", "truth", "media", "wake", "up", "system", "women", "alpha", "male", "rigged", "it's", "over"]
+    with open(path, "w") as f:
+        for index in range(SYNTHETIC_POSTS):
+            f.write(json.dumps({
+                "id": f"synthetic_{index}",
+                "platform": "Synthetic",
+                "author": f"user{rng.randint(1, 500)}",
+                "content": " ".join(rng.choices(words, k=rng.randint(10, 80))),
+                "url": f"https://example.invalid/{index}"
+            }) + "\n")
+
+
+def replay_configs(dump: str, rate: float, sources: int):
+    # Split the target rate across several replay sources over the same dump
+    return [
+        {"type": "replay", "paths": [dump], "name": f"bench{index}", "rate": rate / sources, "loop": True, "batch_size": 100000, "id_prefix": f"bench{index}_"}
+        for index in range(sources)
+    ]
+
+
+def configure_environment(dump: str, rate: float, sources: int):
+    """Scratch database, a fast schedule and replay connectors, set before the backend modules read them."""
+    os.environ.setdefault("DB_NAME", os.path.join(tempfile.mkdtemp(), "listening_benchmark.db"))
+    os.environ.setdefault("POLL_BASE_INTERVAL_SECONDS", "1")
+    os.environ.setdefault("POLL_MIN_INTERVAL_SECONDS", "0.5")
+    os.environ.setdefault("POLL_MAX_INTERVAL_SECONDS", "2")
+    os.environ.setdefault("SOURCE_CURSORS_ENABLED", "false")
+    os.environ["LISTENING_CONNECTORS"] = json.dumps(replay_configs(dump, rate, sources))
+
+
+async def run_benchmark(rate: float, seconds: float, sources: int):
+    from backend.database import init_db, get_db_connection
+    from backend.listening_service import ListeningService
+    from backend.models import DisinformationTrend
+
+    init_db()
+    service = ListeningService()
+
+    await service.start_listening()
+    service.set_trends([
+        DisinformationTrend(id="alpha", topic="Alpha male", description="", severity="Medium", common_phrases=["alpha male"], counter_arguments=[]),
+        DisinformationTrend(id="over", topic="It's over", description="", severity="High", common_phrases=["it's over"], counter_arguments=[])
+    ])
+
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    stats = service.get_pipeline_stats()
+    await service.stop_listening()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM listening_results")
+    committed = cursor.fetchone()[0]
+    conn.close()
+
+    print()
+    print(f"Target rate:        {rate:,.0f} posts/s across {sources} sources")
+    print(f"Committed:          {committed:,} posts in {elapsed:.1f}s ({committed / elapsed:,.0f} posts/s)")
+    print()
+    print(f"{'Stage':<12}{'Processed':>12}{'Per second':>14}{'Busy':>10}{'Queue':>12}")
+    for stage in stats:
+        print(f"{stage['stage']:<12}{stage['processed']:>12,}{stage['per_second']:>14,.0f}{stage['busy_ratio']:>10.1%}{stage['queue_depth']:>6}/{stage['queue_size']:<5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the listening pipeline with replayed posts")
+    parser.add_argument("--dump", help="JSON or JSON Lines dump (default: synthetic posts)")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Total posts per second")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--sources", type=int, default=4)
+    args = parser.parse_args()
+
+    print("🧪 Listening Pipeline Load Test\n")
+    print("=" * 60)
+
+    dump = args.dump
+    if not dump:
+        dump = os.path.join(tempfile.mkdtemp(), "synthetic.jsonl")
+        make_synthetic_dump(dump, random.Random(42))
+
+    configure_environment(dump, args.rate, args.sources)
+    asyncio.run(run_benchmark(args.rate, args.seconds, args.sources))
@@ -0,0 +1,85 @@
+"""
+Synthetic load benchmark for empathy micro-batching.
+
+Simulates concurrent callers each sending unique messages (so the result
+cache never hits) and compares one forward pass per request against the
+micro-batcher at several max-wait settings. Reports p50/p99 latency and
+throughput.
+
+    python -m backend.benchmark_microbatch --concurrency 32 --requests 256
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend import inference_pool
+from backend.empathy_service import MicroBatcher, _run_affect_inference
+from backend.metrics import summarize
+
+SAMPLE_MESSAGES = [
+    "I can really understand how you're feeling. I'm here for you.",
+    "You're just wrong about this. The facts clearly show otherwise.",
+    "I can't take this anymore. Everything feels hopeless and I don't know what to do.",
+    "This is absolutely ridiculous! Nobody understands what I'm going through!",
+    "Can you explain what you mean by that? I'm interested in learning more.",
+    "It's over for guys like us, the system is rigged from the start and nothing will ever change."
+]
+
+# (label, max_wait_ms, max_size); None means no batching
+CONFIGURATIONS = [
+    ("unbatched", None, None),
+    ("wait 2ms", 2, 32),
+    ("wait 5ms", 5, 32),
+    ("wait 10ms", 10, 32),
+]
+
+
+async def run_load(label: str, max_wait_ms, max_size, concurrency: int, total: int):
+    batcher = MicroBatcher(max_wait_ms, max_size) if max_wait_ms is not None else None
+    latencies = []
+    counter = iter(range(total))
+
+    async def caller():
+        for i in counter:
+            text = f"{SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]} ({label} #{i})"
+            start = time.perf_counter()
+            if batcher:
+                await batcher.submit(text)
+            else:
+                await _run_affect_inference([text])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[caller() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies)
+    print(f"{label:>10}: {total / elapsed:7.1f} msg/s, "
+          f"p50 {summary['p50']:8.1f} ms, p99 {summary['p99']:8.1f} ms")
+
+
+async def benchmark(concurrency: int, total: int):
+    print(f"🧪 Micro-batching benchmark: {concurrency} concurrent callers, {total} messages\n")
+    print("=" * 60)
+
+    await inference_pool.warm_up()
+    for label, max_wait_ms, max_size in CONFIGURATIONS:
+        await run_load(label, max_wait_ms, max_size, concurrency, total)
+    inference_pool.shutdown()
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark empathy micro-batching")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=256)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.concurrency, args.requests))
@@ -0,0 +1,90 @@
+"""
+Latency and memory benchmark of the PyTorch vs ONNX (int8) empathy/emotion backends.
+Each backend runs in a fresh process so resident memory is measured separately.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+BACKENDS = ["pytorch", "onnx"]
+CALLS = 50
+
+SAMPLE_MESSAGES = [
+    "I can really understand how you're feeling. I'm here for you.",
+    "You're just wrong about this. The facts clearly show otherwise.",
+    "I can't take this anymore. Everything feels hopeless and I don't know what to do.",
+    "This is absolutely ridiculous! Nobody understands what I'm going through!",
+    "Can you explain what you mean by that? I'm interested in learning more.",
+    "It's over for guys like us, the system is rigged from the start and nothing will ever change."
+]
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_backend(backend: str, results):
+    from backend.empathy_service import EMPATHY_MODEL_NAME, EMOTION_MODEL_NAME, _load_pipeline
+    from backend.metrics import summarize
+
+    baseline = rss_mb()
+    start = time.perf_counter()
+    empathy_model = _load_pipeline(EMPATHY_MODEL_NAME, backend=backend)
+    emotion_model = _load_pipeline(EMOTION_MODEL_NAME, backend=backend)
+    load_seconds = time.perf_counter() - start
+
+    # Warm up so first-call overhead isn't measured
+    empathy_model(SAMPLE_MESSAGES[0])
+    emotion_model(SAMPLE_MESSAGES[0])
+
+    latencies = []
+    for i in range(CALLS):
+        text = SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]
+        start = time.perf_counter()
+        empathy_model(text)
+        emotion_model(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    results.put({
+        "backend": backend,
+        "load_seconds": round(load_seconds, 1),
+        "rss_mb": round(rss_mb() - baseline, 1),
+        "latency_ms": summarize(latencies)
+    })
+
+
+def benchmark():
+    print("🧪 Benchmarking empathy/emotion backends (CPU, single message, both models)\n")
+    print("=" * 60)
+
+    context = multiprocessing.get_context("spawn")
+    for backend in BACKENDS:
+        results = context.Queue()
+        process = context.Process(target=run_backend, args=(backend, results))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print(f"{backend:>8}: ❌ failed (exit code {process.exitcode})")
+            continue
+
+        result = results.get()
+        latency = result["latency_ms"]
+        print(f"{backend:>8}: load {result['load_seconds']}s, "
+              f"+{result['rss_mb']} MB RSS, "
+              f"p50 {latency['p50']} ms, p95 {latency['p95']} ms")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the Aho-Corasick trend matcher against the previous
+per-trend, per-phrase substring scan.
+
+Defaults to 10k phrases over 100k synthetic posts; the naive scan is timed
+on a sample and extrapolated, as running it in full takes hours.
+
+    python -m backend.benchmark_trend_matcher --phrases 10000 --posts 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.models import DisinformationTrend
+from backend.trend_matcher import TrendMatcher
+
+PHRASES_PER_TREND = 10
+NAIVE_SAMPLE_POSTS = 200
+
+
+def make_vocabulary(rng: random.Random, size: int = 20000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def make_trends(rng: random.Random, vocabulary, phrase_count: int):
+    trends = []
+    for index in range(phrase_count // PHRASES_PER_TREND):
+        phrases = [" ".join(rng.sample(vocabulary, rng.randint(2, 4))) for _ in range(PHRASES_PER_TREND)]
+        trends.append(DisinformationTrend(
+            id=f"trend_{index}",
+            topic=f"Trend {index}",
+            description="",
+            severity=rng.choice(["High", "Medium", "Low"]),
+            common_phrases=phrases,
+            counter_arguments=[]
+        ))
+    return trends
+
+
+def make_posts(rng: random.Random, vocabulary, trends, count: int):
+    phrases = [phrase for trend in trends for phrase in trend.common_phrases]
+    posts = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(20, 60))
+        # About one post in five contains a known phrase
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), rng.choice(phrases))
+        posts.append(" ".join(words))
+    return posts
+
+
+def naive_match(trends, content: str):
+    """The previous ListeningService._match_trends."""
+    content_lower = content.lower()
+    for trend in trends:
+        for phrase in trend.common_phrases:
+            if phrase.lower() in content_lower:
+                return trend
+    return None
+
+
+def benchmark(phrase_count: int, post_count: int):
+    print(f"🧪 Trend matching: {phrase_count} phrases x {post_count} posts\n")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    # Phrases share words with ordinary posts, but whole phrases only occur where inserted
+    trends = make_trends(rng, vocabulary[:5000], phrase_count)
+    posts = make_posts(rng, vocabulary, trends, post_count)
+
+    start = time.perf_counter()
+    matcher = TrendMatcher(trends)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = sum(1 for post in posts if matcher.match(post))
+    automaton_seconds = time.perf_counter() - start
+
+    sample = posts[:NAIVE_SAMPLE_POSTS]
+    start = time.perf_counter()
+    for post in sample:
+        naive_match(trends, post)
+    naive_seconds = (time.perf_counter() - start) / len(sample) * post_count
+
+    print(f"Automaton build: {build_seconds:.2f}s ({matcher.phrase_count} unique phrases)")
+    print(f"Automaton match: {automaton_seconds:.2f}s, {post_count / automaton_seconds:,.0f} posts/s, "
+          f"{matched} posts matched")
+    print(f"Naive scan (extrapolated from {len(sample)} posts): {naive_seconds:.1f}s, "
+          f"{post_count / naive_seconds:,.0f} posts/s")
+    print(f"Speed-up: {naive_seconds / automaton_seconds:.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the trend matcher")
+    parser.add_argument("--phrases", type=int, default=10000)
+    parser.add_argument("--posts", type=int, default=100000)
+    args = parser.parse_args()
+
+    benchmark(args.phrases, args.posts)
@@ -9,8 +9,10 @@ from .digital_clone_service import (
     train_clone,
     chat_with_clone,
     get_clone_conversations,
-    get_all_clones
+    get_all_clones,
+    stream_chat_with_clone
 )
+from .streaming import sse_response
 
 router = APIRouter()
 
@@ -71,6 +73,15 @@ async def send_message_to_clone(clone_id: str, request: CloneTestRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/clones/{clone_id}/chat/stream")
+async def stream_message_to_clone(clone_id: str, request: CloneTestRequest):
+    """
+    Streaming variant of clone chat as server-sent events: "token" events with the
+    clone's reply, then "empathy_analysis", "effectiveness" and "done".
+    """
+    return sse_response(stream_chat_with_clone(clone_id, request.message, language=request.language), "clone_chat_stream")
+
+
 @router.get("/clones/{clone_id}/conversations", response_model=List[CloneConversation])
 async def get_conversations(clone_id: str):
     """Get all conversation history for a clone"""
@@ -0,0 +1,112 @@
+"""
+Registry of listening connector types and the configured connector set.
+
+Connectors are built from, in order of precedence:
+1. enabled rows of the listening_connectors table,
+2. LISTENING_CONNECTORS (a JSON list, or the path of a JSON file holding one),
+3. DEFAULT_CONNECTORS.
+
+Each entry is {"type": <registered type>, ...constructor arguments}, e.g.
+{"type": "reddit", "subreddits": ["MensRights"]} or
+{"type": "replay", "paths": ["dumps/reddit.jsonl"], "rate": 500, "loop": true}.
+"""
+
+from typing import Dict, List, Type
+import json
+import os
+from .connectors import SocialConnector, RedditConnector, FourChanConnector, ReplayConnector
+from .database import get_db_connection
+
+LISTENING_CONNECTORS = os.getenv("LISTENING_CONNECTORS", "")
+
+DEFAULT_CONNECTORS = [
+    # Monitoring subreddits known for potential radicalization vectors or harmful ideologies
+    {"type": "reddit", "subreddits": ["TheRedPill", "MensRights", "Antifeminists", "PurplePillDebate", "4chan", "greentext"]},
+    {"type": "4chan", "boards": ["pol", "b", "r9k", "x"]}
+]
+
+CONNECTOR_TYPES: Dict[str, Type[SocialConnector]] = {
+    "reddit": RedditConnector,
+    "4chan": FourChanConnector,
+    "replay": ReplayConnector
+}
+
+
+def register_connector_type(name: str, connector_class: Type[SocialConnector]):
+    """Make a SocialConnector subclass available to connector configs as `name`."""
+    CONNECTOR_TYPES[name] = connector_class
+
+
+def get_connector_rows() -> List[Dict]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM listening_connectors ORDER BY id")
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [
+        {"id": row['id'], "type": row['type'], "config": json.loads(row['config']) if row['config'] else {}, "enabled": bool(row['enabled'])}
+        for row in rows
+    ]
+
+
+def save_connector_row(connector_id: str, connector_type: str, config: Dict, enabled: bool = True):
+    if connector_type not in CONNECTOR_TYPES:
+        raise ValueError(f"Unknown connector type: {connector_type}")
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT OR REPLACE INTO listening_connectors (id, type, config, enabled) VALUES (?, ?, ?, ?)",
+        (connector_id, connector_type, json.dumps(config), int(enabled))
+    )
+    conn.commit()
+    conn.close()
+
+
+def delete_connector_row(connector_id: str) -> bool:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM listening_connectors WHERE id = ?", (connector_id,))
+    deleted = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+    return deleted
+
+
+def load_connector_configs() -> List[Dict]:
+    """The connector configs in effect, from the database, the environment or the defaults."""
+    try:
+        rows = [row for row in get_connector_rows() if row["enabled"]]
+    except Exception as e:
+        print(f"Error reading listening_connectors: {e}")
+        rows = []
+    if rows:
+        return [{"type": row["type"], **row["config"]} for row in rows]
+
+    if LISTENING_CONNECTORS:
+        try:
+            if os.path.exists(LISTENING_CONNECTORS):
+                with open(LISTENING_CONNECTORS, "r") as f:
+                    return json.load(f)
+            return json.loads(LISTENING_CONNECTORS)
+        except Exception as e:
+            print(f"Error parsing LISTENING_CONNECTORS, using defaults: {e}")
+
+    return DEFAULT_CONNECTORS
+
+
+def build_connectors(configs: List[Dict] = None) -> List[SocialConnector]:
+    """Instantiate connectors; a bad entry is reported and skipped."""
+    connectors = []
+    for config in configs if configs is not None else load_connector_configs():
+        config = dict(config)
+        connector_type = config.pop("type", None)
+        if connector_type not in CONNECTOR_TYPES:
+            print(f"Unknown connector type: {connector_type}")
+            continue
+        try:
+            connectors.append(CONNECTOR_TYPES[connector_type](**config))
+        except Exception as e:
+            print(f"Error creating {connector_type} connector: {e}")
+    return connectors
@@ -1,95 +1,424 @@
 import requests
+import asyncio
+import hashlib
 import html
+import json
+import os
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from datetime import datetime
+from urllib.parse import urlparse
 import time
+import httpx
+from .source_cursors import SOURCE_CURSORS_ENABLED, load_cursor, save_cursor, conditional_headers, update_validators
+from . import metrics
+
+# Shared async HTTP client: connections (and TLS sessions) are reused across
+# sources and listening cycles
+CONNECTOR_MAX_CONNECTIONS = int(os.getenv("CONNECTOR_MAX_CONNECTIONS", "20"))
+# Concurrent requests per host, to stay polite and under rate limits
+CONNECTOR_PER_HOST_CONCURRENCY = int(os.getenv("CONNECTOR_PER_HOST_CONCURRENCY", "4"))
+CONNECTOR_TIMEOUT_SECONDS = float(os.getenv("CONNECTOR_TIMEOUT_SECONDS", "10"))
+# Empty `before` polls in a row after which a subreddit cursor is reset
+REDDIT_CURSOR_MAX_EMPTY_POLLS = int(os.getenv("REDDIT_CURSOR_MAX_EMPTY_POLLS", "20"))
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared async client for the running event loop."""
+    global _http_client, _http_client_loop, _host_semaphores
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=CONNECTOR_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=CONNECTOR_MAX_CONNECTIONS,
+                max_keepalive_connections=CONNECTOR_MAX_CONNECTIONS
+            ),
+            follow_redirects=True
+        )
+        _http_client_loop = loop
+        _host_semaphores = {}
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def fetch_url(url: str, headers: Optional[Dict] = None) -> httpx.Response:
+    """GET through the shared client, limited to CONNECTOR_PER_HOST_CONCURRENCY requests per host."""
+    client = get_http_client()
+    host = urlparse(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(CONNECTOR_PER_HOST_CONCURRENCY)
+
+    async with _host_semaphores[host]:
+        return await client.get(url, headers=headers)
+
 
 class SocialConnector:
     def fetch_posts(self, limit: int = 20) -> List[Dict]:
         raise NotImplementedError
 
+    async def fetch_posts_async(self, limit: int = 20) -> List[Dict]:
+        # Connectors without a native async implementation run in a thread
+        return await asyncio.to_thread(self.fetch_posts, limit)
+
+    def source_keys(self) -> List[str]:
+        """Independently scheduled sources (subreddits, boards) of this connector."""
+        return [type(self).__name__]
+
+    async def fetch_source_async(self, source_key: str, limit: int = 20) -> List[Dict]:
+        return await self.fetch_posts_async(limit)
+
+    def _record_response(self, source_key: str, response):
+        # Status and headers of the last poll, read by the poll scheduler
+        if not hasattr(self, "last_responses"):
+            self.last_responses = {}
+        self.last_responses[source_key] = {"status": response.status_code, "headers": response.headers}
+
+    def pop_last_response(self, source_key: str) -> Optional[Dict]:
+        return getattr(self, "last_responses", {}).pop(source_key, None)
+
 class RedditConnector(SocialConnector):
     def __init__(self, subreddits: List[str] = ["all"]):
         self.subreddits = subreddits
         # Reddit requires a custom User-Agent to avoid 429 Too Many Requests
         self.headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
+        self.session = requests.Session()
+
+    def _source_key(self, sub: str) -> str:
+        return f"reddit:{sub}"
+
+    def _listing_url(self, sub: str, limit: int, before: Optional[str] = None) -> str:
+        url = f"https://www.reddit.com/r/{sub}/new.json?limit={limit}"
+        # Only posts newer than the newest one already seen
+        if before:
+            url += f"&before={before}"
+        return url
+
+    def _prepare_request(self, sub: str, limit: int):
+        source_cursor = load_cursor(self._source_key(sub))
+        url = self._listing_url(sub, limit, source_cursor["state"].get("before"))
+        return url, conditional_headers(source_cursor, self.headers), source_cursor
+
+    def _handle_response(self, sub: str, response, source_cursor: Dict) -> List[Dict]:
+        self._record_response(self._source_key(sub), response)
+        if response.status_code == 304:
+            metrics.increment("connector.not_modified")
+            return []
+        if response.status_code != 200:
+            print(f"Failed to fetch Reddit r/{sub}: {response.status_code}")
+            return []
+
+        metrics.increment("connector.bytes", len(response.content))
+        data = response.json()
+        update_validators(source_cursor, response.headers)
+
+        state = source_cursor["state"]
+        children = data.get('data', {}).get('children', [])
+        if children:
+            state["before"] = children[0]['data'].get('name')
+            state["empty_polls"] = 0
+        elif state.get("before"):
+            # A deleted anchor post makes `before` return nothing forever; start over
+            state["empty_polls"] = state.get("empty_polls", 0) + 1
+            if state["empty_polls"] >= REDDIT_CURSOR_MAX_EMPTY_POLLS:
+                state.pop("before")
+                state["empty_polls"] = 0
+        save_cursor(self._source_key(sub), source_cursor)
+
+        return self._parse_listing(data)
+
+    def _parse_listing(self, data: Dict) -> List[Dict]:
+        posts = []
+        for child in data.get('data', {}).get('children', []):
+            post = child['data']
+            posts.append({
+                "platform": "Reddit",
+                "author": post.get('author', 'unknown'),
+                "content": f"{post.get('title', '')}\n{post.get('selftext', '')}",
+                "url": f"https://reddit.com{post.get('permalink', '')}",
+                "timestamp": datetime.fromtimestamp(post.get('created_utc', time.time())).isoformat(),
+                "id": f"reddit_{post.get('id')}"
+            })
+        return posts
 
     def fetch_posts(self, limit: int = 25) -> List[Dict]:
         all_posts = []
         for sub in self.subreddits:
             try:
-                url = f"https://www.reddit.com/r/{sub}/new.json?limit={limit}"
-                response = requests.get(url, headers=self.headers, timeout=10)
-                
-                if response.status_code != 200:
-                    print(f"Failed to fetch Reddit r/{sub}: {response.status_code}")
-                    continue
-
-                data = response.json()
-                children = data.get('data', {}).get('children', [])
-                
-                for child in children:
-                    post = child['data']
-                    all_posts.append({
-                        "platform": "Reddit",
-                        "author": post.get('author', 'unknown'),
-                        "content": f"{post.get('title', '')}\n{post.get('selftext', '')}",
-                        "url": f"https://reddit.com{post.get('permalink', '')}",
-                        "timestamp": datetime.fromtimestamp(post.get('created_utc', time.time())).isoformat(),
-                        "id": f"reddit_{post.get('id')}"
-                    })
+                url, headers, source_cursor = self._prepare_request(sub, limit)
+                response = self.session.get(url, headers=headers, timeout=10)
+                all_posts.extend(self._handle_response(sub, response, source_cursor))
             except Exception as e:
                 print(f"Error fetching Reddit r/{sub}: {e}")
-        
+
         return all_posts
 
+    async def _fetch_subreddit(self, sub: str, limit: int) -> List[Dict]:
+        try:
+            # Cursor reads and writes are SQLite calls; keep them off the event loop
+            url, headers, source_cursor = await asyncio.to_thread(self._prepare_request, sub, limit)
+            response = await fetch_url(url, headers=headers)
+            return await asyncio.to_thread(self._handle_response, sub, response, source_cursor)
+        except Exception as e:
+            print(f"Error fetching Reddit r/{sub}: {e}")
+            return []
+
+    async def fetch_posts_async(self, limit: int = 25) -> List[Dict]:
+        """Fetch all subreddits in parallel."""
+        results = await asyncio.gather(*[self._fetch_subreddit(sub, limit) for sub in self.subreddits])
+        return [post for posts in results for post in posts]
+
+    def source_keys(self) -> List[str]:
+        return [self._source_key(sub) for sub in self.subreddits]
+
+    async def fetch_source_async(self, source_key: str, limit: int = 25) -> List[Dict]:
+        return await self._fetch_subreddit(source_key.split(":", 1)[1], limit)
+
 class FourChanConnector(SocialConnector):
     def __init__(self, boards: List[str] = ["pol"]):
         self.boards = boards
+        self.session = requests.Session()
+
+    def _source_key(self, board: str) -> str:
+        return f"4chan:{board}"
+
+    def _catalog_url(self, board: str) -> str:
+        # 4chan catalog gives all threads
+        return f"https://a.4cdn.org/{board}/catalog.json"
+
+    def _threads_url(self, board: str) -> str:
+        # Thread numbers and last_modified only, a fraction of the catalog's size
+        return f"https://a.4cdn.org/{board}/threads.json"
+
+    def _diff_threads(self, board: str, response, source_cursor: Dict) -> Optional[Set[str]]:
+        """
+        Thread numbers on the board that have not been emitted yet, or None
+        if the board is unchanged. Threads that fell off the board are
+        dropped from the cursor; newly emitted ones are added by
+        _handle_catalog once the catalog has been fetched.
+        """
+        self._record_response(self._source_key(board), response)
+        if response.status_code == 304:
+            metrics.increment("connector.not_modified")
+            return None
+        if response.status_code != 200:
+            print(f"Failed to fetch 4chan /{board}/ threads: {response.status_code}")
+            return None
+
+        metrics.increment("connector.bytes", len(response.content))
+        update_validators(source_cursor, response.headers)
+
+        # Cursors written before "seen" existed hold a thread -> last_modified map
+        state = source_cursor["state"]
+        previous = set(state.pop("threads", {})) | set(state.get("seen", []))
+        current = {str(thread['no']) for page in response.json() for thread in page.get('threads', [])}
+        state["seen"] = sorted(previous & current)
+        new_threads = current - previous
+        if not new_threads:
+            save_cursor(self._source_key(board), source_cursor)
+        return new_threads
+
+    def _parse_catalog(self, board: str, pages: List[Dict], limit: int, thread_nos: Optional[Set[str]] = None) -> List[Dict]:
+        posts = []
+        for page in pages:
+            for thread in page.get('threads', []):
+                if len(posts) >= limit:
+                    break
+                if thread_nos is not None and str(thread.get('no')) not in thread_nos:
+                    continue
+
+                # Clean HTML tags from comment
+                com = thread.get('com', '')
+                # Replace <br> with newlines first
+                text_with_newlines = re.sub(r'<br\s*/?>', '\n', html.unescape(com))
+                clean_text = re.sub('<[^<]+?>', '', text_with_newlines)
+
+                # 4chan images
+                img_url = ""
+                if 'tim' in thread and 'ext' in thread:
+                    img_url = f"https://i.4cdn.org/{board}/{thread['tim']}{thread['ext']}"
+
+                posts.append({
+                    "platform": f"4chan /{board}/",
+                    "author": thread.get('name', 'Anonymous'),
+                    "content": f"{thread.get('sub', '')}\n{clean_text}",
+                    "url": f"https://boards.4chan.org/{board}/thread/{thread.get('no')}",
+                    "timestamp": datetime.fromtimestamp(thread.get('time', time.time())).isoformat(),
+                    "id": f"4chan_{board}_{thread.get('no')}",
+                    "image": img_url
+                })
+        return posts
+
+    def _handle_catalog(self, board: str, response, limit: int, thread_nos: Optional[Set[str]], source_cursor: Optional[Dict]) -> List[Dict]:
+        self._record_response(self._source_key(board), response)
+        if response.status_code != 200:
+            print(f"Failed to fetch 4chan /{board}/: {response.status_code}")
+            return []
+
+        metrics.increment("connector.bytes", len(response.content))
+        posts = self._parse_catalog(board, response.json(), limit, thread_nos)
+        if source_cursor is not None:
+            # Only emitted threads count as seen; the rest are picked up next poll
+            emitted = {post["id"].rsplit("_", 1)[1] for post in posts}
+            source_cursor["state"]["seen"] = sorted(set(source_cursor["state"]["seen"]) | emitted)
+            if thread_nos - emitted:
+                # Skip the conditional request so threads.json is not answered with a 304
+                source_cursor["etag"], source_cursor["last_modified"] = None, None
+            save_cursor(self._source_key(board), source_cursor)
+        return posts
 
     def fetch_posts(self, limit: int = 50) -> List[Dict]:
         all_posts = []
         for board in self.boards:
             try:
-                # 4chan catalog gives all threads
-                url = f"https://a.4cdn.org/{board}/catalog.json"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code != 200:
-                    print(f"Failed to fetch 4chan /{board}/: {response.status_code}")
-                    continue
+                thread_nos, source_cursor = None, None
+                if SOURCE_CURSORS_ENABLED:
+                    source_cursor = load_cursor(self._source_key(board))
+                    response = self.session.get(self._threads_url(board), headers=conditional_headers(source_cursor), timeout=10)
+                    thread_nos = self._diff_threads(board, response, source_cursor)
+                    if not thread_nos:
+                        continue
 
-                pages = response.json()
-                
-                count = 0
-                for page in pages:
-                    for thread in page.get('threads', []):
-                        if count >= limit:
-                            break
-                        
-                        # Clean HTML tags from comment
-                        com = thread.get('com', '')
-                        # Replace <br> with newlines first
-                        text_with_newlines = re.sub(r'<br\s*/?>', '\n', html.unescape(com))
-                        clean_text = re.sub('<[^<]+?>', '', text_with_newlines)
-                        
-                        # 4chan images
-                        img_url = ""
-                        if 'tim' in thread and 'ext' in thread:
-                            img_url = f"https://i.4cdn.org/{board}/{thread['tim']}{thread['ext']}"
-
-                        all_posts.append({
-                            "platform": f"4chan /{board}/",
-                            "author": thread.get('name', 'Anonymous'),
-                            "content": f"{thread.get('sub', '')}\n{clean_text}",
-                            "url": f"https://boards.4chan.org/{board}/thread/{thread.get('no')}",
-                            "timestamp": datetime.fromtimestamp(thread.get('time', time.time())).isoformat(),
-                            "id": f"4chan_{board}_{thread.get('no')}",
-                            "image": img_url
-                        })
-                        count += 1
+                response = self.session.get(self._catalog_url(board), timeout=10)
+                all_posts.extend(self._handle_catalog(board, response, limit, thread_nos, source_cursor))
             except Exception as e:
                 print(f"Error fetching 4chan /{board}/: {e}")
-                
+
         return all_posts
+
+    async def _fetch_board(self, board: str, limit: int) -> List[Dict]:
+        try:
+            thread_nos, source_cursor = None, None
+            if SOURCE_CURSORS_ENABLED:
+                # Only download the catalog when threads.json shows new threads.
+                # Cursor reads and writes are SQLite calls; keep them off the event loop
+                source_cursor = await asyncio.to_thread(load_cursor, self._source_key(board))
+                response = await fetch_url(self._threads_url(board), headers=conditional_headers(source_cursor))
+                thread_nos = await asyncio.to_thread(self._diff_threads, board, response, source_cursor)
+                if not thread_nos:
+                    return []
+
+            response = await fetch_url(self._catalog_url(board))
+            return await asyncio.to_thread(self._handle_catalog, board, response, limit, thread_nos, source_cursor)
+        except Exception as e:
+            print(f"Error fetching 4chan /{board}/: {e}")
+            return []
+
+    async def fetch_posts_async(self, limit: int = 50) -> List[Dict]:
+        """Fetch all boards in parallel."""
+        results = await asyncio.gather(*[self._fetch_board(board, limit) for board in self.boards])
+        return [post for posts in results for post in posts]
+
+    def source_keys(self) -> List[str]:
+        return [self._source_key(board) for board in self.boards]
+
+    async def fetch_source_async(self, source_key: str, limit: int = 50) -> List[Dict]:
+        return await self._fetch_board(source_key.split(":", 1)[1], limit)
+
+class ReplayConnector(SocialConnector):
+    """
+    Replays recorded posts from JSON (a list of posts) or JSON Lines dumps at
+    `rate` posts per second, so the listening pipeline can run and be
+    load-tested without the live sites. Each poll returns every post that has
+    come due since the previous one, up to batch_size.
+    """
+
+    def __init__(self, paths: List[str], name: str = "replay", rate: float = 10.0, loop: bool = False, batch_size: int = 1000, id_prefix: str = ""):
+        self.paths = [paths] if isinstance(paths, str) else paths
+        self.name = name
+        # Lets several replay connectors share one dump without their posts being deduplicated
+        self.id_prefix = id_prefix
+        self.rate = rate
+        # Start again from the first post when the dump runs out
+        self.loop = loop
+        self.batch_size = batch_size
+        self.posts = self._load()
+        self.released = 0
+        self.started = None
+        self.last_responses = {}
+
+    def _load(self) -> List[Dict]:
+        posts = []
+        for path in self.paths:
+            with open(path, "r") as f:
+                if path.endswith(".jsonl"):
+                    rows = []
+                    for line_number, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            rows.append((line_number, json.loads(line)))
+                        except ValueError as e:
+                            print(f"Skipping replay row {path}:{line_number}: {e}")
+                else:
+                    rows = list(enumerate(json.load(f), 1))
+            for line_number, row in rows:
+                post = self._check_row(row)
+                if post is None:
+                    print(f"Skipping replay row {path}:{line_number}: not a post with content")
+                    continue
+                posts.append(post)
+        print(f"Loaded {len(posts)} recorded posts for replay:{self.name}")
+        return posts
+
+    @staticmethod
+    def _check_row(row) -> Optional[Dict]:
+        """The row as a post, with an id derived from its content if it has none; None if unusable."""
+        if not isinstance(row, dict) or not isinstance(row.get("content"), str):
+            return None
+        if not row.get("id"):
+            # Stable across loads, so replays of the same dump deduplicate the same way
+            row = {**row, "id": "replay_" + hashlib.sha1(row["content"].encode("utf-8")).hexdigest()[:16]}
+        return row
+
+    def _take(self) -> List[Dict]:
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+
+        due = int((now - self.started) * self.rate)
+        if not self.loop:
+            due = min(due, len(self.posts))
+        count = min(due - self.released, self.batch_size)
+
+        batch = []
+        for index in range(self.released, self.released + count):
+            post = dict(self.posts[index % len(self.posts)])
+            post["id"] = f"{self.id_prefix}{post['id']}"
+            replay = index // len(self.posts)
+            # Later passes over a looping dump get fresh ids so they aren't deduplicated
+            if replay:
+                post["id"] = f"{post['id']}_replay{replay}"
+            post.setdefault("platform", f"Replay {self.name}")
+            post.setdefault("author", "unknown")
+            post.setdefault("url", "")
+            post.setdefault("timestamp", datetime.now().isoformat())
+            batch.append(post)
+        self.released += count
+        return batch
+
+    def fetch_posts(self, limit: int = 20) -> List[Dict]:
+        return self._take() if self.posts else []
+
+    async def fetch_posts_async(self, limit: int = 20) -> List[Dict]:
+        return self.fetch_posts(limit)
+
+    def source_keys(self) -> List[str]:
+        return [f"replay:{self.name}"]
+
+    async def fetch_source_async(self, source_key: str, limit: int = 20) -> List[Dict]:
+        posts = self.fetch_posts(limit)
+        self.last_responses[source_key] = {"status": 200, "headers": {}}
+        return posts
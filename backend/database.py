@@ -48,9 +48,12 @@ def init_db():
         timestamp TEXT,
         analysis_id TEXT,
         detected_trends TEXT, -- Stored as JSON
+        prefilter_score REAL,
         FOREIGN KEY(subject_id) REFERENCES subjects(id)
     )
     ''')
+    # Older databases predate the pre-filter score
+    _add_column_if_missing(cursor, "content_logs", "prefilter_score", "REAL")
     
     # Authorities Table
     cursor.execute('''
@@ -101,9 +104,14 @@ def init_db():
         matched_trend_id TEXT,
         matched_trend_topic TEXT,
         severity TEXT,
-        url TEXT
+        url TEXT,
+        matched_trend_ids TEXT,
+        trend_similarities TEXT -- Stored as JSON
     )
     ''')
+    # Older databases predate the all-matches and similarity columns
+    _add_column_if_missing(cursor, "listening_results", "matched_trend_ids", "TEXT")
+    _add_column_if_missing(cursor, "listening_results", "trend_similarities", "TEXT")
 
     # Social Media Feeds Table
     cursor.execute('''
@@ -181,9 +189,97 @@ def init_db():
     )
     ''')
     
+    # Model Routing Decisions Table (triage vs. full analysis model)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS model_routing_decisions (
+        id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        text_hash TEXT,
+        text_length INTEGER,
+        triage_model TEXT,
+        triage_score REAL,
+        triage_latency_ms REAL,
+        triage_tokens INTEGER,
+        escalated INTEGER DEFAULT 0,
+        audited INTEGER DEFAULT 0,
+        final_model TEXT,
+        final_score REAL,
+        final_latency_ms REAL,
+        final_tokens INTEGER,
+        threshold REAL
+    )
+    ''')
+    
+    # Translation Cache (successful translations, shared across workers)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS translation_cache (
+        text_hash TEXT NOT NULL,
+        source_lang TEXT NOT NULL,
+        target_lang TEXT NOT NULL,
+        translated_text TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (text_hash, source_lang, target_lang)
+    )
+    ''')
+    
+    # Source Cursors (per-subreddit/board polling position and HTTP validators)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS source_cursors (
+        source_key TEXT PRIMARY KEY,
+        state TEXT, -- Stored as JSON
+        etag TEXT,
+        last_modified TEXT,
+        updated_at TEXT NOT NULL
+    )
+    ''')
+    
+    # Listening Connectors (overrides LISTENING_CONNECTORS / the defaults when any are enabled)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS listening_connectors (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        config TEXT, -- Stored as JSON (constructor arguments)
+        enabled INTEGER DEFAULT 1
+    )
+    ''')
+    
+    # Service Leases (which worker runs a singleton task, e.g. the listening loop)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS service_leases (
+        name TEXT PRIMARY KEY,
+        holder TEXT,
+        expires_at REAL NOT NULL,
+        running INTEGER DEFAULT 0,
+        renewed_at TEXT
+    )
+    ''')
+    
+    # Service State (whether a singleton task should be running, shared by all workers)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS service_state (
+        name TEXT PRIMARY KEY,
+        active INTEGER NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    ''')
+
+    # Shared Versions (bumped on every write, so workers notice each other's changes)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS service_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    ''')
+    
     conn.commit()
     conn.close()
 
+def _add_column_if_missing(cursor, table: str, column: str, definition: str):
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
 def get_db_connection():
     conn = sqlite3.connect(DB_NAME)
     conn.row_factory = sqlite3.Row
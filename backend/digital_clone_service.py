@@ -1,15 +1,19 @@
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+import asyncio
 import json
 import uuid
 from datetime import datetime
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from .database import get_db_connection
 from .models import DigitalClone, CloneConversation, CloneMessage, SubjectSocialPost
-from .empathy_service import detect_empathy, detect_emotions, get_empathy_guidance
-from .translation_service import translate_input_to_english, translate_output_from_english
+from .empathy_service import analyze_affect_async, get_empathy_guidance
+from .translation_service import translate_input_to_english, translate_output_from_english, translate_batch, stream_translate_sentences
+from .prompt_budget import get_budget, pack_items
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+# Async client for the chat paths, so replies don't block the event loop
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
 
 
 async def extract_personality_traits(posts: List[SubjectSocialPost]) -> Dict:
@@ -23,10 +27,13 @@ async def extract_personality_traits(posts: List[SubjectSocialPost]) -> Dict:
             'communication_style': ''
         }
     
-    posts_text = "\n\n".join([
-        f"[{post.platform} - {post.posted_at}]: {post.content}"
-        for post in posts[:40]
-    ])
+    posts_text = pack_items(
+        [f"[{post.platform} - {post.posted_at}]: {post.content}" for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         response = client.chat.completions.create(
@@ -79,7 +86,14 @@ async def build_writing_style_model(posts: List[SubjectSocialPost]) -> Dict:
     if not posts:
         return {}
     
-    posts_text = "\n".join([post.content for post in posts[:30]])
+    posts_text = pack_items(
+        [post.content for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        separator="\n",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         response = client.chat.completions.create(
@@ -128,7 +142,14 @@ async def extract_interests_and_beliefs(posts: List[SubjectSocialPost]) -> tuple
     if not posts:
         return [], {}
     
-    posts_text = "\n".join([post.content for post in posts[:35]])
+    posts_text = pack_items(
+        [post.content for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        separator="\n",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         response = client.chat.completions.create(
@@ -372,9 +393,9 @@ async def get_all_clones() -> List[DigitalClone]:
     return clones
 
 
-async def generate_clone_response(clone: DigitalClone, message: str, conversation_history: List[CloneMessage] = None) -> str:
+def build_clone_messages(clone: DigitalClone, message: str, conversation_history: List[CloneMessage] = None) -> List[Dict]:
     """
-    Generate a response from the digital clone based on their personality and writing style
+    Build the chat messages that make the model respond as the clone
     """
     if conversation_history is None:
         conversation_history = []
@@ -413,16 +434,33 @@ Respond to the following message as this person would:"""
         {"role": "system", "content": personality_context}
     ]
     
-    # Add conversation history
-    for msg in conversation_history[-6:]:  # Last 6 messages for context
+    # Add as much recent conversation history as fits the budget (newest first, then restore order)
+    recent_history = list(reversed(conversation_history))
+    packed = pack_items(
+        [msg.content for msg in recent_history],
+        budget=get_budget("gpt-4", 0.5),
+        model="gpt-4",
+        separator="",
+        label="messages"
+    )
+    for msg in reversed(recent_history[:packed["included"]]):
         role = "assistant" if msg.role == "clone" else "user"
         messages.append({"role": role, "content": msg.content})
     
     # Add current message
     messages.append({"role": "user", "content": message})
     
+    return messages
+
+
+async def generate_clone_response(clone: DigitalClone, message: str, conversation_history: List[CloneMessage] = None) -> str:
+    """
+    Generate a response from the digital clone based on their personality and writing style
+    """
+    messages = build_clone_messages(clone, message, conversation_history)
+    
     try:
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-4",
             messages=messages,
             temperature=0.8,  # Higher temperature for more authentic variation
@@ -442,7 +480,7 @@ async def evaluate_argument_effectiveness(clone: DigitalClone, argument: str, cl
     Returns: (effectiveness_score 0-100, list of suggestions for improvement)
     """
     try:
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-4",
             messages=[
                 {
@@ -500,18 +538,11 @@ Evaluate the effectiveness of this argument."""
         return 50.0, ["Unable to generate suggestions due to an error."]
 
 
-async def chat_with_clone(clone_id: str, message: str, conversation_id: Optional[str] = None, language: str = "en") -> Dict:
+def load_clone_conversation(clone_id: str, conversation_id: Optional[str] = None) -> tuple[DigitalClone, List[CloneMessage], str]:
     """
-    Send a message to a clone and get response with effectiveness and empathy evaluation.
-    Supports multi-language via translation layer.
+    Load a clone and the history of one of its conversations.
+    Returns (clone, conversation_history, conversation_id); a new id is issued if none was given.
     """
-    # Translate input if needed
-    processed_message = await translate_input_to_english(message, language)
-
-    # Analyze empathy in user's argument (on English text)
-    empathy_result = detect_empathy(processed_message)
-    emotion_result = detect_emotions(processed_message)
-    
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -520,6 +551,7 @@ async def chat_with_clone(clone_id: str, message: str, conversation_id: Optional
     clone_row = cursor.fetchone()
     
     if not clone_row:
+        conn.close()
         raise Exception("Clone not found")
     
     clone = DigitalClone(
@@ -548,30 +580,30 @@ async def chat_with_clone(clone_id: str, message: str, conversation_id: Optional
     else:
         conversation_id = str(uuid.uuid4())
     
-    # Generate clone response (English)
-    clone_response_en = await generate_clone_response(clone, processed_message, conversation_history)
-    
-    # Evaluate effectiveness (on English text)
-    effectiveness_score, suggestions_en = await evaluate_argument_effectiveness(clone, processed_message, clone_response_en)
-    
-    # Translate response and suggestions back to target language
-    clone_response = await translate_output_from_english(clone_response_en, language)
-    
-    suggestions = []
-    for suggestion in suggestions_en:
-        translated_suggestion = await translate_output_from_english(suggestion, language)
-        suggestions.append(translated_suggestion)
-    
-    # Add messages to conversation (Store English version for consistency? Or translated? 
-    # Let's store the English version for model consistency, but maybe we should store both?
-    # For now, storing the English version ensures the clone model stays consistent.)
+    conn.close()
+    return clone, conversation_history, conversation_id
+
+
+def save_clone_conversation(
+    conversation_id: str,
+    clone_id: str,
+    conversation_history: List[CloneMessage],
+    user_message: str,
+    clone_response: str,
+    effectiveness_score: float
+):
+    """
+    Append the latest exchange to a conversation and persist it.
+    The English versions are stored so the clone model stays consistent across languages.
+    """
     now = datetime.now().isoformat()
-    conversation_history.append(CloneMessage(role="user", content=processed_message, timestamp=now))
-    conversation_history.append(CloneMessage(role="clone", content=clone_response_en, timestamp=now))
+    conversation_history.append(CloneMessage(role="user", content=user_message, timestamp=now))
+    conversation_history.append(CloneMessage(role="clone", content=clone_response, timestamp=now))
     
-    # Save conversation
     conversation_json = json.dumps([msg.dict() for msg in conversation_history])
     
+    conn = get_db_connection()
+    cursor = conn.cursor()
     cursor.execute(
         """INSERT OR REPLACE INTO clone_conversations
         (id, clone_id, conversation, effectiveness_score, timestamp, notes)
@@ -585,27 +617,124 @@ async def chat_with_clone(clone_id: str, message: str, conversation_id: Optional
             None
         )
     )
-    
     conn.commit()
     conn.close()
+
+
+def build_clone_empathy_analysis(empathy_result: Dict, emotion_result: Dict, language: str = "en") -> Dict:
+    """Empathy section of a clone chat response"""
+    return {
+        'argument_empathy_score': empathy_result.get('empathy_score'),
+        'argument_distress_score': empathy_result.get('distress_score'),
+        'dominant_emotion': emotion_result.get('dominant_emotion'),
+        'empathy_guidance': get_empathy_guidance(
+            empathy_result.get('empathy_score', 0.5),
+            empathy_result.get('distress_score', 0.5),
+            language
+        )
+    }
+
+
+async def chat_with_clone(clone_id: str, message: str, conversation_id: Optional[str] = None, language: str = "en") -> Dict:
+    """
+    Send a message to a clone and get response with effectiveness and empathy evaluation.
+    Supports multi-language via translation layer.
+    """
+    # Translate input if needed
+    processed_message = await translate_input_to_english(message, language)
+
+    # Analyze empathy in user's argument (on English text)
+    affect = await analyze_affect_async(processed_message)
+    empathy_result = affect["empathy"]
+    emotion_result = affect["emotion"]
+    
+    clone, conversation_history, conversation_id = load_clone_conversation(clone_id, conversation_id)
+    
+    # Generate clone response (English)
+    clone_response_en = await generate_clone_response(clone, processed_message, conversation_history)
+    
+    # Translate the reply while effectiveness is evaluated (on English text)
+    response_translation = asyncio.create_task(translate_output_from_english(clone_response_en, language))
+    effectiveness_score, suggestions_en = await evaluate_argument_effectiveness(clone, processed_message, clone_response_en)
+    
+    # Translate suggestions in one call while the (English) conversation is saved
+    clone_response, suggestions, _ = await asyncio.gather(
+        response_translation,
+        translate_batch(suggestions_en, language, "en"),
+        asyncio.to_thread(
+            save_clone_conversation,
+            conversation_id, clone_id, conversation_history, processed_message, clone_response_en, effectiveness_score
+        )
+    )
     
     return {
         'conversation_id': conversation_id,
         'clone_response': clone_response,
         'effectiveness_score': effectiveness_score,
         'suggestions': suggestions,
-        'empathy_analysis': {
-            'argument_empathy_score': empathy_result.get('empathy_score'),
-            'argument_distress_score': empathy_result.get('distress_score'),
-            'dominant_emotion': emotion_result.get('dominant_emotion'),
-            'empathy_guidance': get_empathy_guidance(
-                empathy_result.get('empathy_score', 0.5),
-                empathy_result.get('distress_score', 0.5)
-            )
-        }
+        'empathy_analysis': build_clone_empathy_analysis(empathy_result, emotion_result, language)
     }
 
 
+async def stream_chat_with_clone(clone_id: str, message: str, conversation_id: Optional[str] = None, language: str = "en") -> AsyncIterator[Dict]:
+    """
+    Streaming variant of chat_with_clone.
+    Yields {"event", "data"} dicts: "token" events with the clone's reply as it
+    is generated, then trailing "empathy_analysis", "effectiveness" and "done" events.
+    For non-English users each sentence of the English reply is translated as
+    soon as it is complete, and the translated sentences are streamed.
+    """
+    try:
+        processed_message = await translate_input_to_english(message, language)
+        
+        affect = await analyze_affect_async(processed_message)
+        empathy_result = affect["empathy"]
+        emotion_result = affect["emotion"]
+        
+        clone, conversation_history, conversation_id = load_clone_conversation(clone_id, conversation_id)
+        
+        stream = await async_client.chat.completions.create(
+            model="gpt-4",
+            messages=build_clone_messages(clone, processed_message, conversation_history),
+            temperature=0.8,
+            max_tokens=300,
+            stream=True
+        )
+        
+        english_parts = []
+        async def english_tokens():
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    english_parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        
+        tokens = english_tokens()
+        if language != "en":
+            tokens = stream_translate_sentences(tokens, language, "en")
+        response_parts = []
+        async for token in tokens:
+            response_parts.append(token)
+            yield {"event": "token", "data": token}
+        clone_response_en = "".join(english_parts)
+        
+        yield {"event": "empathy_analysis", "data": build_clone_empathy_analysis(empathy_result, emotion_result, language)}
+        
+        effectiveness_score, suggestions_en = await evaluate_argument_effectiveness(clone, processed_message, clone_response_en)
+        suggestions, _ = await asyncio.gather(
+            translate_batch(suggestions_en, language, "en"),
+            asyncio.to_thread(
+                save_clone_conversation,
+                conversation_id, clone_id, conversation_history, processed_message, clone_response_en, effectiveness_score
+            )
+        )
+        
+        yield {"event": "effectiveness", "data": {"effectiveness_score": effectiveness_score, "suggestions": suggestions}}
+        
+        yield {"event": "done", "data": {"conversation_id": conversation_id, "clone_response": "".join(response_parts)}}
+    except Exception as e:
+        yield {"event": "error", "data": {"message": str(e)}}
+
+
 async def get_clone_conversations(clone_id: str) -> List[CloneConversation]:
     """Get all conversations for a clone"""
     conn = get_db_connection()
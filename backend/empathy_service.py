@@ -4,8 +4,14 @@ Integrates empathy and emotion analysis into RAG and conversation systems.
 """
 
 from typing import Dict, List, Optional
+import asyncio
 import logging
-from functools import lru_cache
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from . import metrics
+from .message_catalog import get_message
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,10 +21,62 @@ logger = logging.getLogger(__name__)
 EMPATHY_MODEL_NAME = "bdotloh/roberta-base-empathy"
 EMOTION_MODEL_NAME = "michellejieli/emotion_text_classifier"
 
+# Inference backend: "pytorch" (transformers) or "onnx" (ONNX Runtime, int8 by default)
+EMPATHY_BACKEND = os.getenv("EMPATHY_BACKEND", "pytorch").lower()
+
+# Texts per forward pass in the batch APIs
+EMPATHY_BATCH_SIZE = int(os.getenv("EMPATHY_BATCH_SIZE", "16"))
+
+# Inputs are truncated to the model's token limit. In "sliding" mode long texts
+# are instead split into overlapping token windows, scored in one batch and the
+# window scores aggregated per label ("max" or "mean")
+EMPATHY_MAX_TOKENS = int(os.getenv("EMPATHY_MAX_TOKENS", "512"))
+EMPATHY_LONG_TEXT_MODE = os.getenv("EMPATHY_LONG_TEXT_MODE", "truncate").lower()
+EMPATHY_WINDOW_STRIDE = int(os.getenv("EMPATHY_WINDOW_STRIDE", "128"))
+EMPATHY_WINDOW_AGGREGATE = os.getenv("EMPATHY_WINDOW_AGGREGATE", "max").lower()
+EMPATHY_MAX_WINDOWS = int(os.getenv("EMPATHY_MAX_WINDOWS", "8"))
+
+# Bounded LRU cache of combined empathy/emotion results, keyed by text hash
+AFFECT_CACHE_SIZE = int(os.getenv("AFFECT_CACHE_SIZE", "2048"))
+
+# Micro-batching of concurrent async requests: a batch runs once it has
+# MAX_SIZE texts or the oldest text has waited MAX_WAIT_MS
+EMPATHY_MICROBATCH_ENABLED = os.getenv("EMPATHY_MICROBATCH_ENABLED", "true").lower() == "true"
+EMPATHY_MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMPATHY_MICROBATCH_MAX_WAIT_MS", "5"))
+EMPATHY_MICROBATCH_MAX_SIZE = int(os.getenv("EMPATHY_MICROBATCH_MAX_SIZE", "32"))
+
 # Global model cache
 _empathy_pipeline = None
 _emotion_pipeline = None
 
+# Affect result cache
+_affect_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_affect_cache_lock = threading.Lock()
+_affect_cache_hits = 0
+_affect_cache_misses = 0
+
+
+def _load_pipeline(model_name: str, backend: Optional[str] = None):
+    """
+    Build a text-classification pipeline returning all label scores, using the
+    configured backend. Falls back to PyTorch if ONNX Runtime isn't installed.
+    """
+    backend = backend or EMPATHY_BACKEND
+    
+    if backend == "onnx":
+        try:
+            from .onnx_backend import load_onnx_pipeline
+            return load_onnx_pipeline(model_name)
+        except ImportError as e:
+            logger.warning(f"ONNX backend unavailable ({e}), using PyTorch")
+    
+    from transformers import pipeline
+    return pipeline(
+        "text-classification",
+        model=model_name,
+        top_k=None  # Return all scores
+    )
+
 
 def load_empathy_model():
     """
@@ -31,13 +89,8 @@ def load_empathy_model():
         return _empathy_pipeline
     
     try:
-        from transformers import pipeline
-        logger.info(f"Loading empathy model: {EMPATHY_MODEL_NAME}")
-        _empathy_pipeline = pipeline(
-            "text-classification",
-            model=EMPATHY_MODEL_NAME,
-            top_k=None  # Return all scores
-        )
+        logger.info(f"Loading empathy model: {EMPATHY_MODEL_NAME} ({EMPATHY_BACKEND})")
+        _empathy_pipeline = _load_pipeline(EMPATHY_MODEL_NAME)
         logger.info("Empathy model loaded successfully")
         return _empathy_pipeline
     except Exception as e:
@@ -56,13 +109,8 @@ def load_emotion_model():
         return _emotion_pipeline
     
     try:
-        from transformers import pipeline
-        logger.info(f"Loading emotion model: {EMOTION_MODEL_NAME}")
-        _emotion_pipeline = pipeline(
-            "text-classification",
-            model=EMOTION_MODEL_NAME,
-            top_k=None
-        )
+        logger.info(f"Loading emotion model: {EMOTION_MODEL_NAME} ({EMPATHY_BACKEND})")
+        _emotion_pipeline = _load_pipeline(EMOTION_MODEL_NAME)
         logger.info("Emotion model loaded successfully")
         return _emotion_pipeline
     except Exception as e:
@@ -71,6 +119,139 @@ def load_emotion_model():
         return None
 
 
+def _scores_by_label(item_scores) -> Dict[str, float]:
+    """
+    Turn one pipeline result (a list of {label, score} dicts) into a label -> score map.
+    """
+    if isinstance(item_scores, dict):
+        item_scores = [item_scores]
+    return {item['label'].lower(): item['score'] for item in item_scores}
+
+
+def _split_windows(tokenizer, text: str) -> List[str]:
+    """
+    Split text into overlapping windows that each fit the model's token limit.
+    Overlap is EMPATHY_WINDOW_STRIDE tokens; at most EMPATHY_MAX_WINDOWS are kept.
+    """
+    token_ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+    # Leave room for the <s> and </s> special tokens
+    window = EMPATHY_MAX_TOKENS - 2
+    if len(token_ids) <= window:
+        return [text]
+    
+    step = max(1, window - EMPATHY_WINDOW_STRIDE)
+    windows = []
+    for start in range(0, len(token_ids) - EMPATHY_WINDOW_STRIDE, step):
+        windows.append(tokenizer.decode(token_ids[start:start + window], skip_special_tokens=True))
+        if len(windows) >= EMPATHY_MAX_WINDOWS:
+            break
+    return windows
+
+
+def _aggregate_windows(window_scores: List[Dict[str, float]]) -> Dict[str, float]:
+    if len(window_scores) == 1:
+        return window_scores[0]
+    
+    labels = {label for scores in window_scores for label in scores}
+    if EMPATHY_WINDOW_AGGREGATE == "mean":
+        return {
+            label: sum(scores.get(label, 0.0) for scores in window_scores) / len(window_scores)
+            for label in labels
+        }
+    return {label: max(scores.get(label, 0.0) for scores in window_scores) for label in labels}
+
+
+def _score_texts(model, texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Label -> score map per text, truncating to EMPATHY_MAX_TOKENS tokens or,
+    in sliding-window mode, aggregating over all windows of each text.
+    """
+    if EMPATHY_LONG_TEXT_MODE == "sliding":
+        inputs, owners = [], []
+        for index, text in enumerate(texts):
+            for window in _split_windows(model.tokenizer, text):
+                inputs.append(window)
+                owners.append(index)
+    else:
+        inputs, owners = texts, list(range(len(texts)))
+    
+    results = model(
+        inputs,
+        batch_size=batch_size or EMPATHY_BATCH_SIZE,
+        truncation=True,
+        max_length=EMPATHY_MAX_TOKENS
+    )
+    
+    grouped: List[List[Dict[str, float]]] = [[] for _ in texts]
+    for owner, item_scores in zip(owners, results):
+        grouped[owner].append(_scores_by_label(item_scores))
+    return [_aggregate_windows(window_scores) for window_scores in grouped]
+
+
+def _empathy_fallback(error: Optional[str] = None) -> Dict:
+    if error:
+        return {
+            "empathy_score": 0.5,
+            "distress_score": 0.5,
+            "model_available": False,
+            "error": error
+        }
+    return {
+        "empathy_score": 0.5,
+        "distress_score": 0.5,
+        "model_available": False,
+        "note": "Empathy model unavailable, using fallback"
+    }
+
+
+def _emotion_fallback(error: Optional[str] = None) -> Dict:
+    if error:
+        return {
+            "model_available": False,
+            "error": error
+        }
+    return {
+        "model_available": False,
+        "note": "Emotion model unavailable"
+    }
+
+
+def detect_empathy_batch(texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+    """
+    Analyze many texts for empathy and distress levels.
+    Texts are padded and run through the model one batch at a time.
+    
+    Args:
+        texts: The input texts to analyze
+        batch_size: Texts per forward pass (defaults to EMPATHY_BATCH_SIZE)
+        
+    Returns:
+        One detect_empathy result dict per input text, in order
+    """
+    if not texts:
+        return []
+    
+    model = load_empathy_model()
+    
+    if model is None:
+        return [_empathy_fallback() for _ in texts]
+    
+    try:
+        # Parse results (format depends on model output)
+        # bdotloh/roberta-base-empathy returns scores for empathy and distress
+        analyses = []
+        for scores in _score_texts(model, texts, batch_size):
+            analyses.append({
+                "empathy_score": scores.get('empathy', 0.5),
+                "distress_score": scores.get('distress', 0.5),
+                "model_available": True
+            })
+        return analyses
+    except Exception as e:
+        logger.error(f"Error detecting empathy: {e}")
+        return [_empathy_fallback(str(e)) for _ in texts]
+
+
 def detect_empathy(text: str) -> Dict[str, float]:
     """
     Analyze text for empathy and distress levels.
@@ -84,40 +265,45 @@ def detect_empathy(text: str) -> Dict[str, float]:
             - distress_score: 0.0-1.0 (higher = more distressed)
             - model_available: bool indicating if model loaded successfully
     """
-    model = load_empathy_model()
+    return detect_empathy_batch([text], batch_size=1)[0]
+
+
+def detect_emotions_batch(texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+    """
+    Analyze many texts for broader emotional content, one forward pass per batch.
+    
+    Args:
+        texts: The input texts to analyze
+        batch_size: Texts per forward pass (defaults to EMPATHY_BATCH_SIZE)
+        
+    Returns:
+        One detect_emotions result dict per input text, in order
+    """
+    if not texts:
+        return []
+    
+    model = load_emotion_model()
     
     if model is None:
-        return {
-            "empathy_score": 0.5,
-            "distress_score": 0.5,
-            "model_available": False,
-            "note": "Empathy model unavailable, using fallback"
-        }
+        return [_emotion_fallback() for _ in texts]
     
     try:
-        results = model(text[:512])  # Limit to 512 tokens for RoBERTa
-        
-        # Parse results (format depends on model output)
-        # bdotloh/roberta-base-empathy returns scores for empathy and distress
-        scores = {}
-        for item in results[0]:  # First result set
-            label = item['label'].lower()
-            score = item['score']
-            scores[label] = score
-        
-        return {
-            "empathy_score": scores.get('empathy', 0.5),
-            "distress_score": scores.get('distress', 0.5),
-            "model_available": True
-        }
+        analyses = []
+        for emotions in _score_texts(model, texts, batch_size):
+            
+            # Find dominant emotion
+            dominant = max(emotions.items(), key=lambda x: x[1])
+            
+            analyses.append({
+                **emotions,
+                "dominant_emotion": dominant[0],
+                "dominant_score": dominant[1],
+                "model_available": True
+            })
+        return analyses
     except Exception as e:
-        logger.error(f"Error detecting empathy: {e}")
-        return {
-            "empathy_score": 0.5,
-            "distress_score": 0.5,
-            "model_available": False,
-            "error": str(e)
-        }
+        logger.error(f"Error detecting emotions: {e}")
+        return [_emotion_fallback(str(e)) for _ in texts]
 
 
 def detect_emotions(text: str) -> Dict[str, float]:
@@ -131,37 +317,214 @@ def detect_emotions(text: str) -> Dict[str, float]:
         dict with emotion names as keys and confidence scores as values
         Also includes 'model_available' and 'dominant_emotion'
     """
-    model = load_emotion_model()
+    return detect_emotions_batch([text], batch_size=1)[0]
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compute_affect_batch(texts: List[str]) -> List[Dict]:
+    """
+    Run both models over texts without the cache.
+    Module-level so it can be sent to the inference pool.
+    """
+    return [
+        {"empathy": empathy, "emotion": emotion}
+        for empathy, emotion in zip(detect_empathy_batch(texts), detect_emotions_batch(texts))
+    ]
+
+
+def _lookup_cached(texts: List[str]) -> tuple:
+    """
+    Split texts into cached results and (deduplicated) misses.
     
-    if model is None:
-        return {
-            "model_available": False,
-            "note": "Emotion model unavailable"
-        }
+    Returns:
+        (keys, results by key, {key: text} for texts that need inference)
+    """
+    global _affect_cache_hits
+    
+    keys = [_text_key(text) for text in texts]
+    results: Dict[str, Dict] = {}
+    
+    with _affect_cache_lock:
+        for key in keys:
+            if key in _affect_cache:
+                _affect_cache.move_to_end(key)
+                results[key] = _affect_cache[key]
+                _affect_cache_hits += 1
+                metrics.increment("affect_cache.hits")
+    
+    # Deduplicate misses so repeated texts in one batch are scored once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in results and key not in missing:
+            missing[key] = text
+    return keys, results, missing
+
+
+def _store_computed(results: Dict[str, Dict], missing: Dict[str, str], computed: List[Dict]):
+    global _affect_cache_misses
+    
+    with _affect_cache_lock:
+        _affect_cache_misses += len(missing)
+        for key, affect in zip(missing.keys(), computed):
+            results[key] = affect
+            # Don't cache fallbacks, so results appear once the models load
+            if affect["empathy"].get("model_available") and affect["emotion"].get("model_available"):
+                _affect_cache[key] = affect
+                _affect_cache.move_to_end(key)
+        while len(_affect_cache) > AFFECT_CACHE_SIZE:
+            _affect_cache.popitem(last=False)
+    metrics.increment("affect_cache.misses", len(missing))
+
+
+def _copy_results(keys: List[str], results: Dict[str, Dict]) -> List[Dict]:
+    # Copies, so callers can't modify cached results
+    return [
+        {"empathy": dict(results[key]["empathy"]), "emotion": dict(results[key]["emotion"])}
+        for key in keys
+    ]
+
+
+def analyze_affect_batch(texts: List[str]) -> List[Dict]:
+    """
+    Combined empathy and emotion analysis for many texts, memoized per text.
+    Only texts missing from the cache are sent through the models.
+    
+    Returns:
+        One {"empathy": detect_empathy result, "emotion": detect_emotions result}
+        dict per input text, in order
+    """
+    keys, results, missing = _lookup_cached(texts)
+    if missing:
+        _store_computed(results, missing, compute_affect_batch(list(missing.values())))
+    return _copy_results(keys, results)
+
+
+def analyze_affect(text: str) -> Dict:
+    """
+    Empathy and emotion analysis of one text in a single call, memoized.
+    
+    Returns:
+        {"empathy": detect_empathy result, "emotion": detect_emotions result}
+    """
+    return analyze_affect_batch([text])[0]
+
+
+async def _run_affect_inference(texts: List[str]) -> List[Dict]:
+    """
+    One batched inference call in the inference pool. On failure or timeout
+    every text gets the fallback results.
+    """
+    from .inference_pool import run_inference
     
     try:
-        results = model(text[:512])
+        return await run_inference(compute_affect_batch, texts)
+    except Exception as e:
+        error = "Inference timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+        logger.error(f"Affect inference failed: {error}")
+        return [
+            {"empathy": _empathy_fallback(error), "emotion": _emotion_fallback(error)}
+            for _ in texts
+        ]
+
+
+class MicroBatcher:
+    """
+    Collects texts from concurrent callers and runs them as one batch, once
+    max_size texts are waiting or the oldest has waited max_wait_ms.
+    Each caller awaits only its own result.
+    """
+    
+    def __init__(self, max_wait_ms: float = None, max_size: int = None):
+        self.max_wait_ms = EMPATHY_MICROBATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.max_size = max_size or EMPATHY_MICROBATCH_MAX_SIZE
+        self._pending: List[tuple] = []
+        self._timer = None
+        self._running = set()
+    
+    async def submit(self, text: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
         
-        emotions = {}
-        for item in results[0]:
-            emotion = item['label'].lower()
-            score = item['score']
-            emotions[emotion] = score
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
         
-        # Find dominant emotion
-        dominant = max(emotions.items(), key=lambda x: x[1])
+        return await future
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
         
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the task isn't garbage collected mid-run
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+    
+    async def _run(self, batch: List[tuple]):
+        metrics.observe("affect_microbatch.size", len(batch))
+        results = await _run_affect_inference([text for text, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_batcher: Optional[MicroBatcher] = None
+_batcher_loop = None
+
+
+def get_batcher() -> MicroBatcher:
+    """The shared micro-batcher for the running event loop."""
+    global _batcher, _batcher_loop
+    
+    loop = asyncio.get_running_loop()
+    if _batcher is None or _batcher_loop is not loop:
+        _batcher = MicroBatcher()
+        _batcher_loop = loop
+    return _batcher
+
+
+async def analyze_affect_batch_async(texts: List[str]) -> List[Dict]:
+    """
+    analyze_affect_batch for async handlers: cache misses run in the inference
+    pool, so the event loop isn't blocked. With micro-batching on, misses from
+    concurrent requests share forward passes. On timeout the fallback results
+    are returned (and not cached).
+    """
+    keys, results, missing = _lookup_cached(texts)
+    if missing:
+        missing_texts = list(missing.values())
+        if EMPATHY_MICROBATCH_ENABLED:
+            batcher = get_batcher()
+            computed = await asyncio.gather(*[batcher.submit(text) for text in missing_texts])
+        else:
+            computed = await _run_affect_inference(missing_texts)
+        _store_computed(results, missing, computed)
+    return _copy_results(keys, results)
+
+
+async def analyze_affect_async(text: str) -> Dict:
+    """analyze_affect without blocking the event loop."""
+    return (await analyze_affect_batch_async([text]))[0]
+
+
+def get_affect_cache_stats() -> Dict:
+    """Size and hit rate of the affect result cache."""
+    with _affect_cache_lock:
+        lookups = _affect_cache_hits + _affect_cache_misses
         return {
-            **emotions,
-            "dominant_emotion": dominant[0],
-            "dominant_score": dominant[1],
-            "model_available": True
-        }
-    except Exception as e:
-        logger.error(f"Error detecting emotions: {e}")
-        return {
-            "model_available": False,
-            "error": str(e)
+            "size": len(_affect_cache),
+            "max_size": AFFECT_CACHE_SIZE,
+            "hits": _affect_cache_hits,
+            "misses": _affect_cache_misses,
+            "hit_rate": round(_affect_cache_hits / lookups, 3) if lookups else 0.0
         }
 
 
@@ -182,11 +545,11 @@ def analyze_conversation_empathy(messages: List[str]) -> Dict:
             "message_count": 0
         }
     
-    empathy_scores = []
-    for msg in messages:
-        result = detect_empathy(msg)
-        if result.get("model_available"):
-            empathy_scores.append(result["empathy_score"])
+    empathy_scores = [
+        result["empathy_score"]
+        for result in detect_empathy_batch(messages)
+        if result.get("model_available")
+    ]
     
     if not empathy_scores:
         return {
@@ -221,86 +584,85 @@ def analyze_conversation_empathy(messages: List[str]) -> Dict:
     }
 
 
-def suggest_empathetic_response(context: str, user_message: str) -> str:
+def suggest_empathetic_response(
+    context: str,
+    user_message: str,
+    empathy_result: Optional[Dict] = None,
+    emotion_result: Optional[Dict] = None,
+    language: str = "en"
+) -> str:
     """
     Generate suggestions for making a response more empathetic.
     
     Args:
         context: Background context about the conversation
         user_message: The message to respond to
+        empathy_result: detect_empathy result for user_message, if already computed
+        emotion_result: detect_emotions result for user_message, if already computed
+        language: Language code for the suggestions (from the message catalog)
         
     Returns:
         String with empathy suggestions
     """
-    # Analyze the user's emotional state
-    empathy_result = detect_empathy(user_message)
-    emotion_result = detect_emotions(user_message)
+    # Analyze the user's emotional state (reusing results the caller already has)
+    if empathy_result is None or emotion_result is None:
+        affect = analyze_affect(user_message)
+        empathy_result = empathy_result or affect["empathy"]
+        emotion_result = emotion_result or affect["emotion"]
     
     suggestions = []
     
     # Check empathy level of incoming message
     if empathy_result.get("model_available"):
         if empathy_result["distress_score"] > 0.6:
-            suggestions.append(
-                "⚠️ High distress detected. Acknowledge their feelings first: "
-                "'I can see this is really difficult for you...'"
-            )
+            suggestions.append(get_message("empathy.high_distress", language))
         
         if empathy_result["empathy_score"] < 0.3:
-            suggestions.append(
-                "💡 Low empathy in message. They may be defensive. Use validating language: "
-                "'It makes sense you'd feel that way given...'"
-            )
+            suggestions.append(get_message("empathy.low_empathy", language))
     
     # Check dominant emotion
     if emotion_result.get("model_available"):
         emotion = emotion_result.get("dominant_emotion", "")
         
         if emotion in ["anger", "disgust"]:
-            suggestions.append(
-                f"😤 {emotion.title()} detected. Don't argue directly. "
-                "Try: 'I hear your frustration. Can we explore...'"
-            )
+            suggestions.append(get_message(
+                "empathy.anger", language, emotion=get_message(f"emotion.{emotion}", language)
+            ))
         elif emotion in ["sadness", "fear"]:
-            suggestions.append(
-                f"😔 {emotion.title()} detected. Offer support: "
-                "'This sounds overwhelming. You're not alone in this...'"
-            )
+            suggestions.append(get_message(
+                "empathy.sadness", language, emotion=get_message(f"emotion.{emotion}", language)
+            ))
         elif emotion == "joy":
-            suggestions.append(
-                "😊 Positive emotion detected. Build on it: "
-                "'It's great that you're curious about this...'"
-            )
+            suggestions.append(get_message("empathy.joy", language))
     
     if not suggestions:
-        suggestions.append(
-            "💬 General tip: Start with validation, then gently introduce new perspectives."
-        )
+        suggestions.append(get_message("empathy.general", language))
     
     return "\n".join(suggestions)
 
 
-def get_empathy_guidance(empathy_score: float, distress_score: float) -> str:
+def get_empathy_guidance(empathy_score: float, distress_score: float, language: str = "en") -> str:
     """
     Get guidance text based on empathy and distress scores.
     
     Args:
         empathy_score: 0-1 empathy level
         distress_score: 0-1 distress level
+        language: Language code for the guidance (from the message catalog)
         
     Returns:
         Human-readable guidance string
     """
     if distress_score > 0.7:
-        return "High distress - prioritize emotional support and safety"
+        return get_message("guidance.high_distress", language)
     elif distress_score > 0.5:
-        return "Moderate distress - acknowledge feelings before facts"
+        return get_message("guidance.moderate_distress", language)
     elif empathy_score > 0.7:
-        return "Empathetic communication - maintain this tone"
+        return get_message("guidance.empathetic", language)
     elif empathy_score < 0.3:
-        return "Low empathy - try more validating language"
+        return get_message("guidance.low_empathy", language)
     else:
-        return "Balanced approach - continue with empathy"
+        return get_message("guidance.balanced", language)
 
 
 # Preload models on module import (optional - comment out if causing startup issues)
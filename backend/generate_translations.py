@@ -1,8 +1,10 @@
+import argparse
 import asyncio
 import json
 import os
 import sys
-from translation_service import translate_text, SUPPORTED_LANGUAGES
+from backend.translation_service import translate_text, SUPPORTED_LANGUAGES
+from backend.message_catalog import MESSAGES, CATALOG_PATH, build_catalog
 
 # Path to translations directory
 TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'src', 'translations')
@@ -17,6 +19,13 @@ async def translate_recursive(data, target_lang):
     else:
         return data
 
+async def build_message_catalog():
+    """Pre-translate the backend's static strings into every supported language."""
+    catalog = await build_catalog()
+    for lang_code, entries in catalog.items():
+        print(f"{SUPPORTED_LANGUAGES.get(lang_code, lang_code)} ({lang_code}): {len(entries)}/{len(MESSAGES)} strings")
+    print(f"Saved message catalog to {CATALOG_PATH}")
+
 async def main():
     # Load English translations
     with open(EN_FILE, 'r') as f:
@@ -40,5 +49,12 @@ async def main():
         
         print(f"Saved {lang_name} translations to {target_file}")
 
+    await build_message_catalog()
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run from the repository root: python -m backend.generate_translations [--catalog]
+    parser = argparse.ArgumentParser(description="Generate frontend translations and the backend message catalog")
+    parser.add_argument("--catalog", action="store_true", help="Only build the backend message catalog")
+    args = parser.parse_args()
+
+    asyncio.run(build_message_catalog() if args.catalog else main())
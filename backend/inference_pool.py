@@ -0,0 +1,155 @@
+"""
+Inference executor for the empathy and emotion models.
+
+Transformer forward passes are CPU-bound and synchronous, so running them in
+an async handler blocks the event loop. This module runs them in a process
+pool whose workers load both models once at start-up, with torch's thread
+count split across workers so they don't oversubscribe the cores.
+
+Every API worker process starts its own pool, so with uvicorn --workers N
+the host runs N pools. The core split accounts for that through
+WEB_CONCURRENCY, which uvicorn also reads as its default worker count.
+
+Set INFERENCE_WORKERS=0 to run inference in a thread of the API process instead.
+"""
+
+from typing import Callable
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Worker processes (0 = run in a thread of the API process)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+# torch threads per worker (0 = divide the CPU cores evenly across workers)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))
+# API worker processes on this host, each with its own pool
+API_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "10"))
+# Load the models at API start-up rather than on the first request
+INFERENCE_WARMUP = os.getenv("INFERENCE_WARMUP", "true").lower() == "true"
+
+_executor = None
+_queue_depth = 0
+
+
+def threads_per_worker() -> int:
+    if INFERENCE_THREADS > 0:
+        return INFERENCE_THREADS
+    pool_processes = max(1, INFERENCE_WORKERS) * max(1, API_WORKERS)
+    return max(1, (os.cpu_count() or 1) // pool_processes)
+
+
+def _init_worker(num_threads: int):
+    """Runs once in each worker process: tune torch and preload both models."""
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    from .empathy_service import load_empathy_model, load_emotion_model
+    load_empathy_model()
+    load_emotion_model()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def get_executor():
+    """The shared process pool, created on first use. None when running in-process."""
+    global _executor
+
+    if INFERENCE_WORKERS <= 0:
+        return None
+
+    if _executor is None:
+        num_threads = threads_per_worker()
+        logger.info(f"Starting inference pool: {INFERENCE_WORKERS} workers x {num_threads} threads")
+        _executor = ProcessPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            # spawn, not fork: forking a process with torch/OpenMP threads can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(num_threads,)
+        )
+    return _executor
+
+
+async def run_inference(func: Callable, *args, timeout: float = None):
+    """
+    Run a picklable, module-level function in the inference pool.
+
+    Raises asyncio.TimeoutError if no result arrives within the timeout
+    (INFERENCE_TIMEOUT_SECONDS by default). The caller stops waiting, but the
+    call is not cancelled: it keeps its worker busy until it finishes.
+    """
+    global _executor, _queue_depth
+
+    _queue_depth += 1
+    metrics.set_gauge("inference.queue_depth", _queue_depth)
+    start = time.perf_counter()
+
+    try:
+        executor = get_executor()
+        if executor is None:
+            call = asyncio.to_thread(func, *args)
+        else:
+            call = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        return await asyncio.wait_for(call, timeout or INFERENCE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        metrics.increment("inference.timeouts")
+        raise
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool on the next call
+        logger.error("Inference worker crashed, restarting pool")
+        metrics.increment("inference.pool_restarts")
+        _executor = None
+        raise
+    finally:
+        _queue_depth -= 1
+        metrics.set_gauge("inference.queue_depth", _queue_depth)
+        metrics.observe("inference.latency_ms", (time.perf_counter() - start) * 1000)
+
+
+async def warm_up():
+    """Start every worker (loading its models) and run one inference on each."""
+    if not INFERENCE_WARMUP:
+        return
+
+    from .empathy_service import compute_affect_batch
+
+    start = time.perf_counter()
+    executor = get_executor()
+    try:
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            # One task per worker so the pool spawns all of them now
+            await asyncio.gather(*[
+                loop.run_in_executor(executor, _ping) for _ in range(INFERENCE_WORKERS)
+            ])
+            await asyncio.gather(*[
+                loop.run_in_executor(executor, compute_affect_batch, ["Warm-up message."])
+                for _ in range(INFERENCE_WORKERS)
+            ])
+        else:
+            await asyncio.to_thread(compute_affect_batch, ["Warm-up message."])
+        logger.info(f"Inference models warmed up in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        logger.error(f"Inference warm-up failed: {e}")
+
+
+def shutdown():
+    """Stop the worker processes."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,8 +1,42 @@
-from .vector_store import add_documents, clear_collection
+from .vector_store import add_documents, upsert_documents, clear_collection
 from .subjects import get_subjects
 from .trend_monitor import get_active_trends
+from .trend_registry import trend_registry
 import asyncio
 
+def _trend_document(t):
+    doc_text = f"Disinformation Trend: {t.topic}, Severity: {t.severity}. Common Phrases: {', '.join(t.common_phrases)}"
+    return doc_text, {"type": "trend", "topic": t.topic}, f"trend_{t.topic}"
+
+# Background index writes, referenced until done so they are not garbage collected
+_index_tasks = set()
+
+async def _upsert_trend_document(doc_text, metadata, doc_id):
+    try:
+        # Chroma embeds locally, so keep it off the event loop
+        await asyncio.to_thread(upsert_documents, [doc_text], [metadata], [doc_id])
+    except Exception as e:
+        print(f"Error indexing trend {doc_id}: {e}")
+
+def _on_trends_changed(trends, change):
+    """
+    Index a trend as soon as it is written instead of waiting for the next
+    full ingestion. The initial load is covered by ingest_all_data.
+    """
+    if change["trend"] is None:
+        return
+    doc_text, metadata, doc_id = _trend_document(change["trend"])
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        upsert_documents([doc_text], [metadata], [doc_id])
+        return
+    task = loop.create_task(_upsert_trend_document(doc_text, metadata, doc_id))
+    _index_tasks.add(task)
+    task.add_done_callback(_index_tasks.discard)
+
+trend_registry.subscribe(_on_trends_changed)
+
 async def ingest_all_data():
     """
     Ingests all relevant application data into the vector store.
@@ -28,10 +62,10 @@ async def ingest_all_data():
     # 2. Ingest Trends
     trends = await get_active_trends()
     for t in trends:
-        doc_text = f"Disinformation Trend: {t.topic}, Severity: {t.severity}. Common Phrases: {', '.join(t.common_phrases)}"
+        doc_text, metadata, doc_id = _trend_document(t)
         documents.append(doc_text)
-        metadatas.append({"type": "trend", "topic": t.topic})
-        ids.append(f"trend_{t.topic}")
+        metadatas.append(metadata)
+        ids.append(doc_id)
         
     # Database connection for other entities
     from .database import get_db_connection
@@ -0,0 +1,210 @@
+"""
+Local language identification for the supported languages.
+
+A character n-gram (1-3) naive Bayes model built from short seed texts per
+language. It runs in microseconds on CPU and is used to skip translation
+calls when text is already in the target language. Identification is only
+trusted for texts of a minimum length and a clear margin over the runner-up.
+"""
+
+from typing import Dict, List, Optional
+from collections import Counter
+import math
+import os
+import re
+
+LANGUAGE_ID_ENABLED = os.getenv("LANGUAGE_ID_ENABLED", "true").lower() == "true"
+# Shorter texts are never identified (too few n-grams to be reliable)
+LANGUAGE_ID_MIN_CHARS = int(os.getenv("LANGUAGE_ID_MIN_CHARS", "20"))
+# Minimum gap in mean per-n-gram log-probability between the best and second language
+LANGUAGE_ID_MIN_MARGIN = float(os.getenv("LANGUAGE_ID_MIN_MARGIN", "0.15"))
+
+NGRAM_SIZES = (1, 2, 3)
+
+# Seed text per SUPPORTED_LANGUAGES code: the first article of the Universal
+# Declaration of Human Rights plus everyday parent/helper phrases
+SEED_TEXTS = {
+    "en": (
+        "All human beings are born free and equal in dignity and rights. They are endowed with reason "
+        "and conscience and should act towards one another in a spirit of brotherhood. My son spends all "
+        "his time online and I am worried about what he is reading. How can I talk to him about this "
+        "without making him angry? Hello, thank you very much for your help. I understand why you feel "
+        "that way, what made you start thinking like this?"
+    ),
+    "sw": (
+        "Watu wote wamezaliwa huru, hadhi na haki zao ni sawa. Wote wamejaliwa akili na dhamiri, hivyo "
+        "yapasa watendeane kindugu. Mwanangu anatumia muda wake wote mtandaoni na nina wasiwasi kuhusu "
+        "anachosoma. Ninawezaje kuzungumza naye kuhusu hili bila kumkasirisha? Habari yako, asante sana "
+        "kwa msaada wako. Naelewa kwa nini unajisikia hivyo, ni nini kilichokufanya uanze kufikiri hivi?"
+    ),
+    "zu": (
+        "Bonke abantu bazalwa bekhululekile belingana ngesithunzi nangamalungelo. Bahlanganiswe "
+        "wumcabango nanembeza futhi kufanele baphathane ngomoya wobunye. Indodana yami ichitha sonke "
+        "isikhathi sayo ku-inthanethi futhi ngikhathazekile ngalokho ayekufundayo. Ngingakhuluma kanjani "
+        "naye ngalokhu ngaphandle kokumthukuthelisa? Sawubona, ngiyabonga kakhulu ngosizo lwakho. "
+        "Ngiyakuzwa ukuthi uthukuthele, yini eyaqala ukukwenza uzizwe kanjena?"
+    ),
+    "xh": (
+        "Bonke abantu bazalwa bekhululekile kwaye belingana ngesidima nangokweemfanelo. Bonke abantu "
+        "banesiphiwo sesazela nesizathu, kufuneka baphathane ngomoya wobuzalwana. Unyana wam uchitha "
+        "lonke ixesha lakhe kwi-intanethi kwaye ndixhalabile ngento ayifundayo. Ndingathetha njani naye "
+        "ngale nto ngaphandle kokumcaphukisa? Molo, enkosi kakhulu ngoncedo lwakho. Ndiyaqonda ukuba "
+        "kutheni uziva ngolo hlobo, yintoni eyakwenza waqala ukucinga ngale ndlela?"
+    ),
+    "yo": (
+        "Gbogbo ènìyàn ni a bí ní òmìnira; iyì àti ẹ̀tọ́ kọ̀ọ̀kan sì dọ́gba. Wọ́n ní ẹ̀bùn ti làákàyè àti "
+        "ti ẹ̀rí-ọkàn, ó sì yẹ kí wọn ó máa hùwà sí ara wọn gẹ́gẹ́ bí ọmọ ìyá. Ọmọkùnrin mi ń lo gbogbo "
+        "àkókò rẹ̀ lórí ayélujára, mo sì ń ṣàníyàn nípa ohun tí ó ń kà. Báwo ni mo ṣe lè bá a sọ̀rọ̀ nípa "
+        "èyí láìjẹ́ kí inú bí i? Ẹ kú àárọ̀, ẹ ṣé púpọ̀ fún ìrànlọ́wọ́ yín. Mo yé ìdí tí o fi ń ronú bẹ́ẹ̀."
+    ),
+    "ig": (
+        "A mụrụ mmadụ niile n'onwe ha, hakwa nha n'ugwu na ikike. E nyere ha uche na akọ na uche, ha "
+        "kwesịrị ịkpaso ibe ha àgwà n'obi ụmụnna. Nwa m nwoke na-anọ n'ịntanetị oge niile, ọ na-echegbu "
+        "m maka ihe ọ na-agụ. Kedu ka m ga-esi gwa ya okwu banyere nke a n'emeghị ka iwe were ya? "
+        "Ndewo, daalụ nke ukwuu maka enyemaka gị. Aghọtara m ihe mere i ji na-eche otu a."
+    ),
+    "ha": (
+        "Dukkan 'yan Adam an haife su 'yantattu, kuma mutunci da hakkoki duk daya ne. An ba su hankali "
+        "da tunani, saboda haka duk abin da za su aikata wa juna ya kasance cikin 'yan'uwanci. Dana yana "
+        "ciyar da duk lokacinsa a intanet kuma ina damuwa game da abin da yake karantawa. Ta yaya zan iya "
+        "magana da shi game da wannan ba tare da na bata masa rai ba? Sannu, na gode sosai da taimakonka. "
+        "Na fahimci dalilin da yasa kake jin haka."
+    ),
+    "am": (
+        "የሰው ልጅ ሁሉ ሲወለድ ነጻና በክብርና በመብትም እኩልነት ያለው ነው። የተፈጥሮ ማስተዋልና ሕሊና ስላለው "
+        "አንዱ ሌላውን በወንድማማችነት መንፈስ መመልከት ይገባዋል። ልጄ ሁሉንም ጊዜውን በኢንተርኔት ያሳልፋል እና "
+        "ስለሚያነበው ነገር እጨነቃለሁ። ሳላስቆጣው ስለዚህ ጉዳይ እንዴት ላነጋግረው እችላለሁ? ሰላም፣ ለእርዳታዎ "
+        "በጣም አመሰግናለሁ።"
+    ),
+    "so": (
+        "Dadka oo dhami waxay dhashaan iyagoo xor ah kana siman xagga sharafta iyo xuquuqda. Waxaa Alle "
+        "siiyey aqoon iyo wacyi, waana in qof la arkaa qofka kale si walaaltinimo ah. Wiilkaygu wuxuu "
+        "waqtigiisa oo dhan ku qaataa internetka, waxaanan ka welwelsanahay waxa uu akhrinayo. Sideen "
+        "ula hadli karaa arrintan anigoon ka cadhaysiin? Salaan, aad baad ugu mahadsantahay "
+        "caawimaaddaada. Waan fahmay sababta aad sidaas u dareemayso."
+    ),
+    "sn": (
+        "Vanhu vese vanoberekwa vakasununguka uye vakaenzana pakukosha nekodzero. Vakapiwa njere nehana "
+        "uye vanofanira kubatana nemweya wehukama. Mwanakomana wangu anopedza nguva yake yose ari pa "
+        "internet uye ndinonetseka nezvaari kuverenga. Ndingataura sei naye nezvenyaya iyi "
+        "ndisingamutsamwisi? Mhoro, ndatenda zvikuru nerubatsiro rwenyu. Ndinonzwisisa kuti sei uchinzwa "
+        "saizvozvo."
+    ),
+    "af": (
+        "Alle menslike wesens word vry, met gelyke waardigheid en regte, gebore. Hulle het rede en "
+        "gewete en behoort in die gees van broederskap teenoor mekaar op te tree. My seun spandeer al sy "
+        "tyd aanlyn en ek is bekommerd oor wat hy lees. Hoe kan ek met hom hieroor praat sonder om hom "
+        "kwaad te maak? Goeie more, baie dankie vir jou hulp. Ek verstaan hoekom jy so voel, wat het "
+        "jou so laat begin dink?"
+    ),
+    "om": (
+        "Namni hundi bilisa ta'ee dhalata; ulfinaa fi mirgaan walqixxee dha. Sammuu fi qalbii qabaachuun "
+        "isaanii waan beekamuuf, hafuura obbolummaatiin walitti dhiyaachuu qabu. Ilmi koo yeroo isaa "
+        "hunda interneetii irratti dabarsa, waan inni dubbisuuf nan yaadda'a. Akkamittan isa aarsuu malee "
+        "waa'ee kanaa isa waliin haasa'uu danda'a? Akkam, gargaarsa keessaniif baay'ee galatoomaa. Maaliif "
+        "akkas akka sitti dhaga'amu nan hubadha."
+    ),
+    "rw": (
+        "Abantu bose bavuka aringaniye mu gaciro no mu burenganzira. Bafite ubushobozi bwo gutekereza "
+        "n'umutimanama, bagomba gukorana kivandimwe. Umuhungu wanjye amara igihe cye cyose kuri "
+        "interineti kandi mpangayikishijwe n'ibyo asoma. Nabasha nte kuvugana na we kuri ibi "
+        "ntamurakaje? Muraho, murakoze cyane ku bufasha bwanyu. Ndumva impamvu wumva umeze utyo."
+    ),
+    "tw": (
+        "Wɔwo adesamma nyinaa sɛ nnipa a wɔwɔ ahofadi, na wɔn nyinaa yɛ pɛ wɔ nidi ne kyɛfa mu. Wɔwɔ "
+        "adwene ne ahonim, ɛsɛ sɛ wɔne wɔn ho wɔn ho di no anuanom su mu. Me babarima de ne bere nyinaa "
+        "di dwuma wɔ intanɛt so, na mema me ho haw wɔ nea ɔkenkan no ho. Ɛbɛyɛ dɛn na matumi ne no "
+        "akasa wɔ eyi ho a ne bo remfu? Maakye, meda wo ase paa wɔ wo mmoa no ho."
+    ),
+    "st": (
+        "Batho bohle ba tswetswe ba lokolohile mme ba lekana ka seriti le ditokelo. Ba filwe monahano le "
+        "letswalo mme ba tshwanetse ho phedisana ka moya wa boena. Mora wa ka o qeta nako yohle ya hae "
+        "inthaneteng mme ke tshwenyehile ka seo a se balang. Nka bua le yena jwang ka taba ena ntle le "
+        "ho mo halefisa? Dumela, ke leboha haholo ka thuso ya hao. Ke utlwisisa hore hobaneng o ikutlwa "
+        "jwalo."
+    ),
+}
+
+# Languages written in their own script are identified by script alone
+ETHIOPIC = re.compile(r"[ሀ-፿]")
+
+_NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+
+# language -> (n-gram counts, total n-grams)
+_profiles: Optional[Dict[str, tuple]] = None
+_vocabulary_size = 0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_LETTERS.sub(" ", text.lower()).split())
+
+
+def _ngrams(text: str) -> List[str]:
+    padded = f" {_normalize(text)} "
+    return [
+        padded[i:i + n]
+        for n in NGRAM_SIZES
+        for i in range(len(padded) - n + 1)
+        if padded[i:i + n].strip()
+    ]
+
+
+def _load_profiles() -> Dict[str, tuple]:
+    global _profiles, _vocabulary_size
+
+    if _profiles is None:
+        profiles = {}
+        vocabulary = set()
+        for language, seed in SEED_TEXTS.items():
+            counts = Counter(_ngrams(seed))
+            profiles[language] = (counts, sum(counts.values()))
+            vocabulary.update(counts)
+        _vocabulary_size = len(vocabulary)
+        _profiles = profiles
+    return _profiles
+
+
+def identify_language(text: str) -> Dict:
+    """
+    Identify the language of text.
+
+    Returns:
+        {
+            "language": code of the most likely language, or None if unsure,
+            "best_guess": most likely language even when unsure,
+            "margin": score gap to the runner-up (higher = more certain)
+        }
+    """
+    letters = [c for c in text if c.isalpha()]
+    if len(text.strip()) < LANGUAGE_ID_MIN_CHARS or not letters:
+        return {"language": None, "best_guess": None, "margin": 0.0}
+
+    ethiopic = sum(1 for c in letters if ETHIOPIC.match(c))
+    if ethiopic / len(letters) > 0.5:
+        return {"language": "am", "best_guess": "am", "margin": float("inf")}
+
+    grams = _ngrams(text)
+    if not grams:
+        return {"language": None, "best_guess": None, "margin": 0.0}
+
+    profiles = _load_profiles()
+    scores = {}
+    for language, (counts, total) in profiles.items():
+        denominator = total + _vocabulary_size
+        log_prob = sum(math.log((counts.get(gram, 0) + 1) / denominator) for gram in grams)
+        scores[language] = log_prob / len(grams)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    margin = ranked[0][1] - ranked[1][1]
+    return {
+        "language": ranked[0][0] if margin >= LANGUAGE_ID_MIN_MARGIN else None,
+        "best_guess": ranked[0][0],
+        "margin": round(margin, 3)
+    }
+
+
+def is_language(text: str, language: str) -> bool:
+    """True only if text is confidently identified as the given language."""
+    if not LANGUAGE_ID_ENABLED:
+        return False
+    return identify_language(text)["language"] == language
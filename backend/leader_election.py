@@ -0,0 +1,130 @@
+"""
+Lease-based leader election and shared desired state over SQLite.
+
+Every uvicorn worker shares the database, so a row in service_leases decides
+which worker runs a singleton task (the listening loop): the holder renews
+its lease well before it expires, and when a worker dies its lease lapses
+and another worker takes over on its next attempt. Acquisition is a single
+conditional UPDATE, which SQLite applies atomically.
+
+service_state holds what the task *should* be doing (e.g. listening started
+or stopped), so an API call on any worker reaches whichever worker leads.
+service_versions holds counters bumped on writes to shared data (e.g.
+trends), so other workers can tell when their in-memory copy is stale.
+"""
+
+from typing import Dict, Optional
+from datetime import datetime
+import os
+import socket
+import time
+import uuid
+from .database import get_db_connection
+
+# Seconds a lease stays valid without renewal
+LEASE_TTL_SECONDS = float(os.getenv("LEASE_TTL_SECONDS", "15"))
+# Seconds between renewals; keep well under the TTL
+LEASE_RENEW_SECONDS = float(os.getenv("LEASE_RENEW_SECONDS", "5"))
+
+# Identifies this worker process in lease rows
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire(name: str, worker_id: str = WORKER_ID, ttl: float = LEASE_TTL_SECONDS, running: bool = False) -> bool:
+    """
+    Take or renew the lease. Succeeds if nobody holds it, it has expired, or
+    this worker already holds it.
+    """
+    now = time.time()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT OR IGNORE INTO service_leases (name, holder, expires_at, running, renewed_at) VALUES (?, NULL, 0, 0, NULL)",
+        (name,)
+    )
+    cursor.execute(
+        "UPDATE service_leases SET holder = ?, expires_at = ?, running = ?, renewed_at = ? WHERE name = ? AND (holder IS NULL OR holder = ? OR expires_at < ?)",
+        (worker_id, now + ttl, int(running), datetime.now().isoformat(), name, worker_id, now)
+    )
+    acquired = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+    return acquired
+
+
+def release(name: str, worker_id: str = WORKER_ID):
+    """Give up the lease so another worker can take over immediately."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE service_leases SET holder = NULL, expires_at = 0, running = 0 WHERE name = ? AND holder = ?",
+        (name, worker_id)
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_lease(name: str) -> Dict:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM service_leases WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    conn.close()
+
+    now = time.time()
+    if not row or not row['holder'] or row['expires_at'] < now:
+        return {"holder": None, "valid": False, "running": False, "expires_in_seconds": None, "renewed_at": row['renewed_at'] if row else None}
+    return {
+        "holder": row['holder'],
+        "valid": True,
+        "running": bool(row['running']),
+        "expires_in_seconds": round(row['expires_at'] - now, 1),
+        "renewed_at": row['renewed_at']
+    }
+
+
+def set_desired_state(name: str, active: bool):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT OR REPLACE INTO service_state (name, active, updated_at) VALUES (?, ?, ?)",
+        (name, int(active), datetime.now().isoformat())
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_desired_state(name: str) -> Optional[bool]:
+    """True/False once set through set_desired_state, otherwise None."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT active FROM service_state WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    conn.close()
+    return bool(row['active']) if row else None
+
+
+def bump_version(name: str) -> int:
+    """Increment and return the shared version counter `name`."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO service_versions (name, version, updated_at) VALUES (?, 1, ?) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at",
+        (name, datetime.now().isoformat())
+    )
+    cursor.execute("SELECT version FROM service_versions WHERE name = ?", (name,))
+    version = cursor.fetchone()['version']
+    conn.commit()
+    conn.close()
+    return version
+
+
+def get_version(name: str) -> int:
+    """The shared version counter `name`, 0 if never bumped."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT version FROM service_versions WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    conn.close()
+    return row['version'] if row else 0
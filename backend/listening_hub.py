@@ -0,0 +1,227 @@
+"""
+In-process pub/sub for newly stored listening results.
+
+The listening pipeline's writer publishes every group commit; each
+/api/listening/stream client holds a subscription with its filters and a
+bounded queue. Clients resume from a cursor (the listening_results rowid of
+the last result they saw): missed rows are read from the database, then the
+live queue takes over. A client that falls too far behind is caught up from
+the database the same way instead of growing its queue.
+"""
+
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+from .models import ListeningResult
+from .database import get_db_connection
+from . import metrics
+
+LISTENING_STREAM_QUEUE_SIZE = int(os.getenv("LISTENING_STREAM_QUEUE_SIZE", "1000"))
+LISTENING_STREAM_CATCHUP_LIMIT = int(os.getenv("LISTENING_STREAM_CATCHUP_LIMIT", "500"))
+LISTENING_STREAM_HEARTBEAT_SECONDS = float(os.getenv("LISTENING_STREAM_HEARTBEAT_SECONDS", "15"))
+# How often a worker that isn't running the listening loop checks the database for new results
+LISTENING_STREAM_POLL_SECONDS = float(os.getenv("LISTENING_STREAM_POLL_SECONDS", "2"))
+
+
+def parse_filters(severity: Optional[str] = None, trend_id: Optional[str] = None, platform: Optional[str] = None) -> Dict:
+    """Comma-separated query parameters to filter sets (empty means any)."""
+    def split(value):
+        return {item.strip().lower() for item in value.split(",") if item.strip()} if value else set()
+
+    return {"severity": split(severity), "trend_id": split(trend_id), "platform": split(platform)}
+
+
+def matches_filters(result: ListeningResult, filters: Dict) -> bool:
+    if filters["severity"] and (result.severity or "").lower() not in filters["severity"]:
+        return False
+    if filters["trend_id"] and not filters["trend_id"] & {trend_id.lower() for trend_id in result.matched_trend_ids}:
+        return False
+    # "reddit" matches "Reddit", "4chan" matches "4chan /pol/"
+    if filters["platform"] and not any(platform in result.source_platform.lower() for platform in filters["platform"]):
+        return False
+    return True
+
+
+class Subscription:
+    def __init__(self, filters: Dict):
+        self.filters = filters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=LISTENING_STREAM_QUEUE_SIZE)
+        # Set when results were dropped; the stream re-reads them from the database
+        self.lagged = False
+
+
+class ListeningHub:
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self._tail_task = None
+
+    def set_tailing(self, enabled: bool):
+        """
+        On workers that don't run the listening loop, publish results other
+        workers store by reading them from the database. Only queries while
+        clients are connected.
+        """
+        if enabled and self._tail_task is None:
+            self._tail_task = asyncio.create_task(self._tail())
+        elif not enabled and self._tail_task is not None:
+            self._tail_task.cancel()
+            self._tail_task = None
+
+    async def _tail(self):
+        cursor = None
+        any_result = parse_filters()
+        while True:
+            await asyncio.sleep(LISTENING_STREAM_POLL_SECONDS)
+            if not self.subscriptions:
+                cursor = None
+                continue
+            try:
+                if cursor is None:
+                    cursor = await asyncio.to_thread(latest_rowid)
+                    continue
+                rows = [row async for row in catch_up(any_result, cursor)]
+                if rows:
+                    cursor = rows[-1][0]
+                    self.publish(rows)
+            except Exception as e:
+                print(f"Error tailing listening results: {e}")
+
+    def subscribe(self, filters: Dict) -> Subscription:
+        subscription = Subscription(filters)
+        self.subscriptions.append(subscription)
+        metrics.set_gauge("listening_stream.subscribers", len(self.subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        metrics.set_gauge("listening_stream.subscribers", len(self.subscriptions))
+
+    def publish(self, rows: List[Tuple[int, ListeningResult]]):
+        """Hand newly committed (rowid, result) pairs to every matching subscriber."""
+        for subscription in self.subscriptions:
+            if subscription.lagged:
+                continue
+            for row in rows:
+                if not matches_filters(row[1], subscription.filters):
+                    continue
+                try:
+                    subscription.queue.put_nowait(row)
+                except asyncio.QueueFull:
+                    subscription.lagged = True
+                    metrics.increment("listening_stream.lagged")
+                    break
+
+    async def stream(self, filters: Dict, cursor: int = 0) -> AsyncIterator[Dict]:
+        """
+        Events for one client: results after `cursor` (only new results if
+        negative), then live results as they are stored, with heartbeats while
+        idle.
+        """
+        # Subscribe before catching up so nothing committed in between is missed
+        subscription = self.subscribe(filters)
+        try:
+            if cursor < 0:
+                cursor = await asyncio.to_thread(latest_rowid)
+            async for rowid, result in catch_up(filters, cursor):
+                cursor = rowid
+                yield result_event(rowid, result)
+
+            while True:
+                if subscription.lagged:
+                    # Drain what was queued and re-read from the database instead
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.lagged = False
+                    async for rowid, result in catch_up(filters, cursor):
+                        cursor = rowid
+                        yield result_event(rowid, result)
+                    continue
+
+                try:
+                    rowid, result = await asyncio.wait_for(subscription.queue.get(), LISTENING_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield {"event": "heartbeat", "data": {"cursor": cursor}}
+                    continue
+
+                # Already sent during catch-up
+                if rowid <= cursor:
+                    continue
+                cursor = rowid
+                yield result_event(rowid, result)
+        finally:
+            self.unsubscribe(subscription)
+
+
+def result_event(rowid: int, result: ListeningResult) -> Dict:
+    return {"event": "result", "id": rowid, "data": {**result.dict(), "cursor": rowid}}
+
+
+def latest_rowid() -> int:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM listening_results")
+    rowid = cursor.fetchone()[0]
+    conn.close()
+    return rowid
+
+
+def _row_to_result(row) -> ListeningResult:
+    return ListeningResult(
+        id=row['id'],
+        source_platform=row['source_platform'],
+        author=row['author'],
+        content=row['content'],
+        timestamp=row['timestamp'],
+        matched_trend_id=row['matched_trend_id'],
+        matched_trend_topic=row['matched_trend_topic'],
+        severity=row['severity'],
+        url=row['url'],
+        matched_trend_ids=json.loads(row['matched_trend_ids']) if row['matched_trend_ids'] else [],
+        trend_similarities=json.loads(row['trend_similarities']) if row['trend_similarities'] else {}
+    )
+
+
+def _read_page(cursor: int) -> List[Tuple[int, ListeningResult]]:
+    """
+    Up to LISTENING_STREAM_CATCHUP_LIMIT stored results after cursor, oldest
+    first; with cursor 0, the most recent ones. Opens its own connection so
+    nothing is held between pages.
+    """
+    conn = get_db_connection()
+    db_cursor = conn.cursor()
+    if not cursor:
+        db_cursor.execute(
+            "SELECT * FROM (SELECT rowid, * FROM listening_results ORDER BY rowid DESC LIMIT ?) ORDER BY rowid",
+            (LISTENING_STREAM_CATCHUP_LIMIT,)
+        )
+    else:
+        db_cursor.execute(
+            "SELECT rowid, * FROM listening_results WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (cursor, LISTENING_STREAM_CATCHUP_LIMIT)
+        )
+    rows = db_cursor.fetchall()
+    conn.close()
+    return [(row['rowid'], _row_to_result(row)) for row in rows]
+
+
+async def catch_up(filters: Dict, cursor: int) -> AsyncIterator[Tuple[int, ListeningResult]]:
+    """
+    Stored results after cursor that pass the filters, oldest first. A new
+    client (cursor 0) gets the most recent LISTENING_STREAM_CATCHUP_LIMIT.
+    Each page is read in a worker thread and resumes from the last rowid.
+    """
+    while True:
+        rows = await asyncio.to_thread(_read_page, cursor)
+        for rowid, result in rows:
+            cursor = rowid
+            if matches_filters(result, filters):
+                yield rowid, result
+
+        if len(rows) < LISTENING_STREAM_CATCHUP_LIMIT:
+            break
+
+
+# Global instance
+listening_hub = ListeningHub()
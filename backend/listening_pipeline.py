@@ -0,0 +1,351 @@
+"""
+Staged listening pipeline.
+
+fetch -> normalize -> dedup -> match -> write, each stage an asyncio task
+connected to the next by a bounded queue. A slow source or a slow commit
+only fills its queue and pushes back on the stage before it; it never stalls
+the others. The writer group-commits every LISTENING_WRITE_BATCH_SIZE rows
+or LISTENING_WRITE_INTERVAL_MS, whichever comes first.
+
+Items flow through the queues in order, so the end-of-source marker that
+follows a source's posts reaches the writer after all of them, and the
+writer then reports the source's yield to the poll scheduler.
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import json
+import os
+import time
+from .models import ListeningResult
+from .database import get_db_connection
+from .poll_scheduler import PollScheduler
+from . import metrics
+
+LISTENING_QUEUE_SIZE = int(os.getenv("LISTENING_QUEUE_SIZE", "500"))
+LISTENING_WRITE_BATCH_SIZE = int(os.getenv("LISTENING_WRITE_BATCH_SIZE", "50"))
+LISTENING_WRITE_INTERVAL_MS = float(os.getenv("LISTENING_WRITE_INTERVAL_MS", "500"))
+LISTENING_DEDUP_BATCH_SIZE = int(os.getenv("LISTENING_DEDUP_BATCH_SIZE", "100"))
+LISTENING_MATCH_BATCH_SIZE = int(os.getenv("LISTENING_MATCH_BATCH_SIZE", "64"))
+# Recently seen post ids, so a post fetched twice before it is written is only kept once
+LISTENING_DEDUP_CACHE_SIZE = int(os.getenv("LISTENING_DEDUP_CACHE_SIZE", "10000"))
+LISTENING_FETCH_LIMIT = int(os.getenv("LISTENING_FETCH_LIMIT", "20"))
+
+# Characters of content stored for display
+DISPLAY_CONTENT_LENGTH = 500
+
+STAGES = ["fetch", "normalize", "dedup", "match", "write"]
+
+# Queue items: ("post", source_key, payload) or ("end", source_key, last_response)
+POST = "post"
+END = "end"
+
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.started = time.time()
+
+    def record(self, count: int, seconds: float):
+        self.processed += count
+        self.busy_seconds += seconds
+        metrics.increment(f"listening.{self.name}.processed", count)
+
+    def snapshot(self, queue: Optional[asyncio.Queue]) -> Dict:
+        elapsed = max(time.time() - self.started, 1e-9)
+        return {
+            "stage": self.name,
+            "processed": self.processed,
+            "per_second": round(self.processed / elapsed, 2),
+            "busy_ratio": round(self.busy_seconds / elapsed, 4),
+            # Items waiting to be consumed by this stage
+            "queue_depth": queue.qsize() if queue is not None else 0,
+            "queue_size": queue.maxsize if queue is not None else 0
+        }
+
+
+class ListeningPipeline:
+    def __init__(self, sources: Dict, scheduler: PollScheduler, match: Callable[[List[str]], Awaitable[List[List[Dict]]]],
+                 on_results: Optional[Callable[[List[Tuple[int, ListeningResult]]], None]] = None):
+        """
+        Args:
+            sources: source key -> connector
+            scheduler: Decides which sources are due and receives their yield
+            match: contents -> trend matches for each, highest severity first
+            on_results: Called with the (rowid, result) pairs of each group commit
+        """
+        self.sources = sources
+        self.scheduler = scheduler
+        self.match = match
+        self.on_results = on_results
+
+        # queue feeding each stage
+        self.queues = {stage: asyncio.Queue(maxsize=LISTENING_QUEUE_SIZE) for stage in STAGES[1:]}
+        self.stats = {stage: StageStats(stage) for stage in STAGES}
+        self._seen_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._fetches = set()
+        self._tasks: List[asyncio.Task] = []
+
+    async def run(self):
+        """Run every stage until cancelled."""
+        self._tasks = [
+            asyncio.create_task(self._fetch_stage()),
+            asyncio.create_task(self._normalize_stage()),
+            asyncio.create_task(self._dedup_stage()),
+            asyncio.create_task(self._match_stage()),
+            asyncio.create_task(self._write_stage())
+        ]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks + list(self._fetches):
+                task.cancel()
+
+    def get_stats(self) -> List[Dict]:
+        return [self.stats[stage].snapshot(self.queues.get(stage)) for stage in STAGES]
+
+    def _report_queue_depths(self):
+        for stage, queue in self.queues.items():
+            metrics.set_gauge(f"listening.queue.{stage}", queue.qsize())
+
+    # Stage 1: start a fetch for every due source; each puts its posts and an end marker downstream
+
+    async def _fetch_stage(self):
+        while True:
+            try:
+                for source_key in self.scheduler.due():
+                    # Not due again until the writer reports this poll's yield
+                    self.scheduler.start(source_key)
+                    task = asyncio.create_task(self._fetch_source(source_key))
+                    self._fetches.add(task)
+                    task.add_done_callback(self._fetches.discard)
+
+                self._report_queue_depths()
+                delay = min(5.0, max(1.0, self.scheduler.seconds_until_next()))
+            except Exception as e:
+                print(f"Error scheduling listening fetches: {e}")
+                delay = 5.0
+            await asyncio.sleep(delay)
+
+    async def _fetch_source(self, source_key: str):
+        connector = self.sources[source_key]
+        start = time.perf_counter()
+        try:
+            posts = await connector.fetch_source_async(source_key, limit=LISTENING_FETCH_LIMIT)
+        except Exception as e:
+            print(f"Error fetching from {source_key}: {e}")
+            posts = []
+        elapsed = time.perf_counter() - start
+        self.stats["fetch"].record(len(posts), elapsed)
+        metrics.observe("listening.fetch_ms", elapsed * 1000)
+
+        # Blocks while normalize is behind
+        for post in posts:
+            await self.queues["normalize"].put((POST, source_key, post))
+        await self.queues["normalize"].put((END, source_key, connector.pop_last_response(source_key)))
+
+    # Stage 2: clean up raw posts
+
+    async def _normalize_stage(self):
+        queue, out = self.queues["normalize"], self.queues["dedup"]
+        while True:
+            kind, source_key, payload = await queue.get()
+            start = time.perf_counter()
+            if kind == POST:
+                try:
+                    payload = self._normalize(payload)
+                except Exception as e:
+                    print(f"Error normalizing post from {source_key}: {e}")
+                    continue
+                if payload is None:
+                    continue
+            self.stats["normalize"].record(1 if kind == POST else 0, time.perf_counter() - start)
+            await out.put((kind, source_key, payload))
+
+    @staticmethod
+    def _normalize(post: Dict) -> Optional[Dict]:
+        content = (post.get('content') or '').strip()
+        if not post.get('id') or not content:
+            return None
+        return {
+            **post,
+            "content": content,
+            "display_content": content[:DISPLAY_CONTENT_LENGTH] + ("..." if len(content) > DISPLAY_CONTENT_LENGTH else "")
+        }
+
+    # Stage 3: drop posts already stored or already in flight, one IN query per batch
+
+    async def _dedup_stage(self):
+        queue, out = self.queues["dedup"], self.queues["match"]
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < LISTENING_DEDUP_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            start = time.perf_counter()
+            try:
+                passed = await self._dedup(batch)
+            except Exception as e:
+                print(f"Error deduplicating listening posts: {e}")
+                # Drop the posts but pass the end markers on, so their sources are polled again
+                passed = [item for item in batch if item[0] == END]
+            self.stats["dedup"].record(sum(1 for kind, _, _ in batch if kind == POST), time.perf_counter() - start)
+
+            for item in passed:
+                await out.put(item)
+
+    async def _dedup(self, batch: List[Tuple]) -> List[Tuple]:
+        ids = [payload['id'] for kind, _, payload in batch if kind == POST and payload['id'] not in self._seen_ids]
+        stored = await asyncio.to_thread(self._stored_ids, ids)
+
+        passed = []
+        for kind, source_key, payload in batch:
+            if kind == POST:
+                if payload['id'] in self._seen_ids or payload['id'] in stored:
+                    continue
+                self._remember(payload['id'])
+            passed.append((kind, source_key, payload))
+        return passed
+
+    @staticmethod
+    def _stored_ids(ids: List[str]) -> set:
+        if not ids:
+            return set()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        placeholders = ",".join("?" * len(ids))
+        cursor.execute(f"SELECT id FROM listening_results WHERE id IN ({placeholders})", ids)
+        stored = {row['id'] for row in cursor.fetchall()}
+        conn.close()
+        return stored
+
+    def _remember(self, post_id: str):
+        self._seen_ids[post_id] = None
+        if len(self._seen_ids) > LISTENING_DEDUP_CACHE_SIZE:
+            self._seen_ids.popitem(last=False)
+
+    def _forget(self, post_ids: List[str]):
+        """Let dedup pass these posts again, e.g. when they were never stored."""
+        for post_id in post_ids:
+            self._seen_ids.pop(post_id, None)
+
+    # Stage 4: trend matching
+
+    async def _match_stage(self):
+        queue, out = self.queues["match"], self.queues["write"]
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < LISTENING_MATCH_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            posts = [payload for kind, _, payload in batch if kind == POST]
+            start = time.perf_counter()
+            try:
+                # One call per batch, so semantic matching embeds the posts together
+                matches = iter(await self.match([post['content'] for post in posts]) if posts else [])
+            except Exception as e:
+                print(f"Error matching listening posts: {e}")
+                self._forget([post['id'] for post in posts])
+                batch = [item for item in batch if item[0] == END]
+            self.stats["match"].record(len(posts), time.perf_counter() - start)
+
+            for kind, source_key, payload in batch:
+                if kind == POST:
+                    try:
+                        payload = self._to_result(payload, next(matches))
+                    except Exception as e:
+                        print(f"Error building listening result for {payload.get('id')}: {e}")
+                        self._forget([payload['id']])
+                        continue
+                await out.put((kind, source_key, payload))
+
+    @staticmethod
+    def _to_result(post: Dict, matches: List[Dict]) -> ListeningResult:
+        matched_trend = matches[0]["trend"] if matches else None
+        return ListeningResult(
+            id=post['id'],
+            source_platform=post['platform'],
+            author=post['author'],
+            content=post['display_content'],
+            timestamp=post['timestamp'],
+            matched_trend_id=matched_trend.id if matched_trend else None,
+            matched_trend_topic=matched_trend.topic if matched_trend else None,
+            severity=matched_trend.severity if matched_trend else "Low",
+            url=post['url'],
+            matched_trend_ids=[match["trend"].id for match in matches],
+            trend_similarities={match["trend"].id: round(match["similarity"], 4) for match in matches if "similarity" in match}
+        )
+
+    # Stage 5: group commits
+
+    async def _write_stage(self):
+        queue = self.queues["write"]
+        pending: List[ListeningResult] = []
+        yields: Dict[str, int] = {}
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, source_key, payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                kind = None
+
+            if kind == POST:
+                pending.append(payload)
+                yields[source_key] = yields.get(source_key, 0) + 1
+                if deadline is None:
+                    deadline = time.monotonic() + LISTENING_WRITE_INTERVAL_MS / 1000
+            elif kind == END:
+                # Every post of this poll has reached the writer
+                response = payload or {}
+                try:
+                    self.scheduler.record(source_key, yields.pop(source_key, 0), response.get("status"), response.get("headers"))
+                except Exception as e:
+                    print(f"Error rescheduling {source_key}: {e}")
+
+            if pending and (kind is None or len(pending) >= LISTENING_WRITE_BATCH_SIZE):
+                await self._flush(pending)
+                pending, deadline = [], None
+
+    async def _flush(self, results: List[ListeningResult]):
+        start = time.perf_counter()
+        try:
+            rows = await asyncio.to_thread(self._insert, results)
+        except Exception as e:
+            print(f"Error writing listening results: {e}")
+            # Not stored, so let dedup pass these posts again if they are re-fetched
+            self._forget([result.id for result in results])
+            return
+        elapsed = time.perf_counter() - start
+        self.stats["write"].record(len(rows), elapsed)
+        metrics.observe("listening.commit_ms", elapsed * 1000)
+        metrics.observe("listening.commit_rows", len(rows))
+        metrics.increment("listening.new_posts", len(rows))
+        print(f"Processed {len(rows)} new unique posts.")
+
+        if self.on_results and rows:
+            try:
+                self.on_results(rows)
+            except Exception as e:
+                print(f"Error publishing listening results: {e}")
+
+    @staticmethod
+    def _insert(results: List[ListeningResult]) -> List[Tuple[int, ListeningResult]]:
+        """Insert in one transaction. Returns (rowid, result) for the rows actually inserted."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        rows = []
+        for result in results:
+            cursor.execute(
+                "INSERT OR IGNORE INTO listening_results (id, source_platform, author, content, timestamp, matched_trend_id, matched_trend_topic, severity, url, matched_trend_ids, trend_similarities) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result.id, result.source_platform, result.author, result.content, result.timestamp, result.matched_trend_id, result.matched_trend_topic, result.severity, result.url, json.dumps(result.matched_trend_ids), json.dumps(result.trend_similarities))
+            )
+            if cursor.rowcount:
+                rows.append((cursor.lastrowid, result))
+        conn.commit()
+        conn.close()
+        return rows
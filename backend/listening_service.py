@@ -1,118 +1,236 @@
 import asyncio
+import json
+import os
 import random
 import uuid
 from datetime import datetime
 from typing import List, Dict, Optional
 from .models import ListeningResult, DisinformationTrend
-from .trend_monitor import get_active_trends
-from .connectors import RedditConnector, FourChanConnector
+from .trend_registry import trend_registry
+from .connectors import close_http_client
+from .connector_registry import build_connectors
 from .database import get_db_connection
+from .trend_matcher import TrendMatcher
+from .poll_scheduler import PollScheduler
+from .listening_pipeline import ListeningPipeline
+from .listening_hub import listening_hub
+from .semantic_matcher import SemanticMatcher, SEMANTIC_MATCH_ENABLED, merge_matches
+from .leader_election import WORKER_ID, LEASE_RENEW_SECONDS, try_acquire, release, get_lease, set_desired_state, get_desired_state
+
+# Lease and desired-state name shared by all workers
+LISTENING_LEASE = "listening"
+# Resume listening after a restart if it was running before; by default it starts stopped
+LISTENING_RESUME_ON_STARTUP = os.getenv("LISTENING_RESUME_ON_STARTUP", "false").lower() == "true"
+
+# Trend phrase matching options
+TREND_MATCH_WORD_BOUNDARY = os.getenv("TREND_MATCH_WORD_BOUNDARY", "false").lower() == "true"
+TREND_MATCH_NORMALIZE = os.getenv("TREND_MATCH_NORMALIZE", "true").lower() == "true"
 
 class ListeningService:
     def __init__(self):
-        self.connectors = [
-            # Monitoring subreddits known for potential radicalization vectors or harmful ideologies
-            RedditConnector(subreddits=["TheRedPill", "MensRights", "Antifeminists", "PurplePillDebate", "4chan", "greentext"]),
-            FourChanConnector(boards=["pol", "b", "r9k", "x"])
-        ]
+        # Built from connector_registry when listening starts
+        self.connectors = []
+        # source key (e.g. "reddit:MensRights") -> connector, each polled on its own schedule
+        self.sources = {}
+        self.scheduler = PollScheduler()
         # self.results removed in favor of DB
         self.max_history = 200 # Still useful for limiting DB query or cleanup
         self._task = None
+        self.pipeline: Optional[ListeningPipeline] = None
+        # Whether this worker runs the loop; see get_status for the cluster-wide state
         self.running = False
+        self._supervisor = None
+        self._supervise_lock = asyncio.Lock()
         self.trends: List[DisinformationTrend] = []
+        self.matcher = TrendMatcher([])
+        # Built in the background when SEMANTIC_MATCH_ENABLED, since trends must be embedded first
+        self.semantic_matcher: Optional[SemanticMatcher] = None
+        self._semantic_task = None
 
     async def start_listening(self):
+        """Ask for listening to run. Whichever worker holds the lease runs the loop."""
+        set_desired_state(LISTENING_LEASE, True)
+        await self._supervise_once()
+
+    async def stop_listening(self):
+        """Ask for listening to stop, on whichever worker is running it."""
+        set_desired_state(LISTENING_LEASE, False)
+        await self._supervise_once()
+
+    def start_supervisor(self):
+        """Start this worker's election loop; call once per worker at startup."""
+        if self._supervisor is None:
+            # A valid lease means this worker is joining a running deployment, which keeps its state
+            if not LISTENING_RESUME_ON_STARTUP and not get_lease(LISTENING_LEASE)["valid"]:
+                set_desired_state(LISTENING_LEASE, False)
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def shutdown(self):
+        """Stop the local loop and hand the lease to another worker."""
+        if self._supervisor:
+            self._supervisor.cancel()
+            self._supervisor = None
+        await self._stop_local()
+        release(LISTENING_LEASE)
+        listening_hub.set_tailing(False)
+
+    async def _supervise(self):
+        while True:
+            try:
+                await self._supervise_once()
+            except Exception as e:
+                print(f"Error in listening supervisor: {e}")
+            await asyncio.sleep(LEASE_RENEW_SECONDS)
+
+    async def _supervise_once(self):
+        """Reconcile this worker with the shared desired state and the lease."""
+        async with self._supervise_lock:
+            # Pick up trends written through other workers; subscribers rebuild the matcher
+            trend_registry.refresh()
+
+            if get_desired_state(LISTENING_LEASE):
+                if try_acquire(LISTENING_LEASE, running=self.running):
+                    if not self.running:
+                        await self._start_local()
+                        try_acquire(LISTENING_LEASE, running=True)
+                elif self.running:
+                    # Lease lost (this worker stalled past the TTL); another worker has taken over
+                    print("Listening lease lost, stopping local loop")
+                    await self._stop_local()
+            else:
+                await self._stop_local()
+                release(LISTENING_LEASE)
+
+            # Workers without the loop relay new results to their stream clients from the database
+            listening_hub.set_tailing(not self.running)
+
+    async def _start_local(self):
         if self.running:
             return
         
         self.running = True
-        self.trends = await get_active_trends()
+        self.configure_connectors()
+        self.set_trends(trend_registry.get_trends())
+        # Trend writes rebuild the matcher as they happen; the loop never polls for them
+        trend_registry.subscribe(self._on_trends_changed)
         self._task = asyncio.create_task(self._listen_loop())
-        print("Real Listening Service Started")
+        print(f"Real Listening Service Started on worker {WORKER_ID}")
+
+    async def _stop_local(self):
+        if not self.running:
+            return
 
-    async def stop_listening(self):
         self.running = False
+        trend_registry.unsubscribe(self._on_trends_changed)
         if self._task:
             self._task.cancel()
             try:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await close_http_client()
         print("Listening Service Stopped")
 
+    def get_status(self) -> Dict:
+        """Listening status across all workers, from the shared lease."""
+        lease = get_lease(LISTENING_LEASE)
+        return {
+            "running": lease["valid"] and lease["running"],
+            "desired": bool(get_desired_state(LISTENING_LEASE)),
+            "leader": lease["holder"],
+            "lease_expires_in_seconds": lease["expires_in_seconds"],
+            "worker": WORKER_ID,
+            "is_leader": lease["holder"] == WORKER_ID
+        }
+
+    def configure_connectors(self, configs: Optional[List[Dict]] = None):
+        """(Re)build connectors from the registry config; schedules of kept sources carry over."""
+        self.connectors = build_connectors(configs)
+        self.sources = {key: connector for connector in self.connectors for key in connector.source_keys()}
+        for key in list(self.scheduler.sources):
+            if key not in self.sources:
+                self.scheduler.unregister(key)
+        for key in self.sources:
+            self.scheduler.register(key)
+        print(f"Listening to {len(self.sources)} sources from {len(self.connectors)} connectors")
+
     def is_running(self) -> bool:
         return self.running
 
     async def _listen_loop(self):
-        while self.running:
-            try:
-                print("Fetching new posts from real sources...")
-                all_posts = []
-                
-                # Fetch from all connectors
-                for connector in self.connectors:
-                    if not self.running: break
-                    posts = await asyncio.to_thread(connector.fetch_posts, limit=20)
-                    all_posts.extend(posts)
-                
-                # Process and Match
-                new_results_count = 0
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                
-                for post in all_posts:
-                    # Check if already exists in DB (deduplication)
-                    cursor.execute("SELECT id FROM listening_results WHERE id = ?", (post['id'],))
-                    if cursor.fetchone():
-                        continue
-                        
-                    matched_trend = self._match_trends(post['content'])
-                    
-                    # Create result object
-                    result = ListeningResult(
-                        id=post['id'],
-                        source_platform=post['platform'],
-                        author=post['author'],
-                        content=post['content'][:500] + ("..." if len(post['content']) > 500 else ""), # Truncate for display
-                        timestamp=post['timestamp'],
-                        matched_trend_id=matched_trend.id if matched_trend else None,
-                        matched_trend_topic=matched_trend.topic if matched_trend else None,
-                        severity=matched_trend.severity if matched_trend else "Low",
-                        url=post['url']
-                    )
-                    
-                    # Insert into DB
-                    cursor.execute(
-                        "INSERT INTO listening_results (id, source_platform, author, content, timestamp, matched_trend_id, matched_trend_topic, severity, url) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (result.id, result.source_platform, result.author, result.content, result.timestamp, result.matched_trend_id, result.matched_trend_topic, result.severity, result.url)
-                    )
-                    new_results_count += 1
-                
-                conn.commit()
-                conn.close()
-                
-                print(f"Processed {new_results_count} new unique posts.")
-                
-                # Optional: Cleanup old results to keep DB size manageable
-                # self._cleanup_old_results()
+        # fetch -> normalize -> dedup -> match -> write, see listening_pipeline
+        self.pipeline = ListeningPipeline(self.sources, self.scheduler, self._match_batch, on_results=listening_hub.publish)
+        await self.pipeline.run()
 
-            except Exception as e:
-                print(f"Error in listening loop: {e}")
+    def get_pipeline_stats(self) -> List[Dict]:
+        """Throughput and queue depth of each pipeline stage."""
+        return self.pipeline.get_stats() if self.pipeline else []
+
+    def set_trends(self, trends: List[DisinformationTrend]):
+        """
+        Compile a new matcher for these trends, then swap it in. The loop only
+        ever sees a complete matcher.
+        """
+        matcher = TrendMatcher(trends, word_boundary=TREND_MATCH_WORD_BOUNDARY, normalize=TREND_MATCH_NORMALIZE)
+        self.matcher, self.trends = matcher, trends
+        print(f"Trend matcher built: {len(trends)} trends, {matcher.phrase_count} phrases")
+        self._rebuild_semantic_matcher(trends)
+
+    def _on_trends_changed(self, trends: List[DisinformationTrend], change: Dict):
+        # A new trend without phrases (e.g. from discover_trends) can never match a phrase
+        trend = change["trend"]
+        if change["action"] == "add" and trend is not None and not trend.common_phrases:
+            self.trends = trends
+            self._rebuild_semantic_matcher(trends)
+            return
+        self.set_trends(trends)
 
-            # Wait before next poll (avoid rate limits)
-            await asyncio.sleep(30) 
+    def _rebuild_semantic_matcher(self, trends: List[DisinformationTrend]):
+        if not SEMANTIC_MATCH_ENABLED:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._semantic_task = loop.create_task(self._build_semantic_matcher(trends))
 
-    def _match_trends(self, content: str) -> Optional[DisinformationTrend]:
+    async def _build_semantic_matcher(self, trends: List[DisinformationTrend]):
+        try:
+            matcher = await SemanticMatcher.build(trends)
+        except Exception as e:
+            print(f"Error building semantic matcher: {e}")
+            return
+        # Trends may have changed again while embedding
+        if trends is self.trends:
+            self.semantic_matcher = matcher
+            print(f"Semantic matcher built: {len(trends)} trends")
+
+    def _match_trends(self, content: str) -> List[Dict]:
         """
-        Simple keyword matching against active trends.
+        All trends whose phrases occur in content (one pass over the text),
+        highest severity first, each with its matched phrases and spans.
         """
-        content_lower = content.lower()
-        for trend in self.trends:
-            # Check common phrases
-            for phrase in trend.common_phrases:
-                if phrase.lower() in content_lower:
-                    return trend
-        return None
+        return self.matcher.match(content)
+
+    async def _match_batch(self, contents: List[str]) -> List[List[Dict]]:
+        """
+        Phrase matches for each post plus, when enabled, trends it is
+        semantically similar to (scored for the whole batch at once).
+        """
+        phrase_matches = [self._match_trends(content) for content in contents]
+        semantic_matcher = self.semantic_matcher
+        if semantic_matcher is None:
+            return phrase_matches
+
+        try:
+            semantic_matches = await semantic_matcher.match_batch(contents)
+        except Exception as e:
+            print(f"Error in semantic matching: {e}")
+            return phrase_matches
+        return [merge_matches(phrase, semantic) for phrase, semantic in zip(phrase_matches, semantic_matches)]
+
+    def get_schedule(self) -> List[Dict]:
+        return self.scheduler.get_schedule()
 
     def get_latest_results(self, page: int = 1, page_size: int = 20) -> Dict:
         offset = (page - 1) * page_size
@@ -139,7 +257,9 @@ class ListeningService:
                 matched_trend_id=row['matched_trend_id'],
                 matched_trend_topic=row['matched_trend_topic'],
                 severity=row['severity'],
-                url=row['url']
+                url=row['url'],
+                matched_trend_ids=json.loads(row['matched_trend_ids']) if row['matched_trend_ids'] else [],
+                trend_similarities=json.loads(row['trend_similarities']) if row['trend_similarities'] else {}
             ))
             
         return {
@@ -0,0 +1,225 @@
+"""
+OpenAI-compatible stand-in server for offline load testing.
+
+Serves /v1/chat/completions (plain and streaming) and /v1/embeddings from
+cassettes keyed by a hash of the request body.
+
+Modes (LLM_STANDIN_MODE):
+    record - forward to the real API, save each response as a cassette
+    replay - answer from cassettes only; misses get a synthetic response
+             (or a 404 if LLM_STANDIN_SYNTHETIC_ON_MISS=false)
+
+Latency (LLM_STANDIN_LATENCY_MS, LLM_STANDIN_JITTER_MS, LLM_STANDIN_TOKEN_DELAY_MS)
+and error injection (LLM_STANDIN_ERROR_RATE, LLM_STANDIN_ERROR_STATUS) are
+applied in both modes.
+
+Run it and point the backend at it:
+    uvicorn backend.llm_standin_server:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn backend.main:app
+"""
+
+from typing import Dict, List
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STANDIN_MODE = os.getenv("LLM_STANDIN_MODE", "replay")
+CASSETTE_DIR = os.getenv("LLM_STANDIN_CASSETTE_DIR", "llm_cassettes")
+UPSTREAM_URL = os.getenv("LLM_STANDIN_UPSTREAM_URL", "https://api.openai.com/v1")
+UPSTREAM_API_KEY = os.getenv("OPENAI_API_KEY")
+LATENCY_MS = float(os.getenv("LLM_STANDIN_LATENCY_MS", "0"))
+JITTER_MS = float(os.getenv("LLM_STANDIN_JITTER_MS", "0"))
+TOKEN_DELAY_MS = float(os.getenv("LLM_STANDIN_TOKEN_DELAY_MS", "0"))
+ERROR_RATE = float(os.getenv("LLM_STANDIN_ERROR_RATE", "0"))
+ERROR_STATUS = int(os.getenv("LLM_STANDIN_ERROR_STATUS", "500"))
+SYNTHETIC_ON_MISS = os.getenv("LLM_STANDIN_SYNTHETIC_ON_MISS", "true").lower() == "true"
+EMBEDDING_DIMENSIONS = int(os.getenv("LLM_STANDIN_EMBEDDING_DIMENSIONS", "1536"))
+
+# Request fields that don't change the answer and are left out of the cassette key
+UNKEYED_FIELDS = {"stream", "stream_options", "user"}
+
+app = FastAPI(title="LLM Stand-in", description="OpenAI-compatible record/replay server for load testing")
+
+stats = {"requests": 0, "hits": 0, "misses": 0, "recorded": 0, "injected_errors": 0}
+
+
+def request_key(endpoint: str, body: Dict) -> str:
+    """Stable hash of an API request, ignoring fields that don't affect the response."""
+    keyed = {k: v for k, v in body.items() if k not in UNKEYED_FIELDS}
+    canonical = json.dumps({"endpoint": endpoint, "body": keyed}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cassette_path(key: str) -> str:
+    return os.path.join(CASSETTE_DIR, f"{key}.json")
+
+
+def load_cassette(key: str):
+    path = cassette_path(key)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)["response"]
+
+
+def save_cassette(key: str, endpoint: str, body: Dict, response: Dict):
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    with open(cassette_path(key), "w") as f:
+        json.dump({"endpoint": endpoint, "request": body, "response": response}, f, indent=2, ensure_ascii=False)
+
+
+async def inject_latency_and_errors():
+    """Sleep for the configured latency and raise an injected error at the configured rate."""
+    delay = LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        stats["injected_errors"] += 1
+        raise HTTPException(status_code=ERROR_STATUS, detail={"error": {"message": "Injected error", "type": "standin_error"}})
+
+
+async def forward_upstream(endpoint: str, body: Dict) -> Dict:
+    """Send the (non-streaming) request to the real API."""
+    import httpx
+
+    upstream_body = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+    async with httpx.AsyncClient(timeout=120) as client:
+        response = await client.post(
+            f"{UPSTREAM_URL}/{endpoint}",
+            json=upstream_body,
+            headers={"Authorization": f"Bearer {UPSTREAM_API_KEY}"}
+        )
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.json())
+    return response.json()
+
+
+def synthetic_chat_completion(body: Dict) -> Dict:
+    """Deterministic placeholder completion for replay misses."""
+    wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+    last_message = body.get("messages", [{}])[-1].get("content", "")
+    content = "{}" if wants_json else f"Synthetic response to: {str(last_message)[:200]}"
+    return {
+        "id": f"chatcmpl-standin-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "standin"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+def synthetic_embeddings(body: Dict) -> Dict:
+    """Deterministic unit vectors derived from a hash of each input."""
+    inputs = body.get("input", [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    data = []
+    for index, text in enumerate(inputs):
+        rng = random.Random(hashlib.sha256(str(text).encode("utf-8")).hexdigest())
+        vector = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        data.append({"object": "embedding", "index": index, "embedding": [v / norm for v in vector]})
+
+    return {
+        "object": "list",
+        "data": data,
+        "model": body.get("model", "standin"),
+        "usage": {"prompt_tokens": 0, "total_tokens": 0}
+    }
+
+
+async def resolve(endpoint: str, body: Dict) -> Dict:
+    """Find the response for a request according to the current mode."""
+    stats["requests"] += 1
+    key = request_key(endpoint, body)
+
+    cached = load_cassette(key)
+    if cached is not None:
+        stats["hits"] += 1
+        return cached
+
+    stats["misses"] += 1
+    if STANDIN_MODE == "record":
+        response = await forward_upstream(endpoint, body)
+        save_cassette(key, endpoint, body, response)
+        stats["recorded"] += 1
+        return response
+
+    if not SYNTHETIC_ON_MISS:
+        raise HTTPException(status_code=404, detail={"error": {"message": f"No cassette for request {key}", "type": "cassette_miss"}})
+
+    if endpoint == "embeddings":
+        return synthetic_embeddings(body)
+    return synthetic_chat_completion(body)
+
+
+def split_for_streaming(content: str, size: int = 4) -> List[str]:
+    """Split a completion into small pieces to imitate token streaming."""
+    return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+
+async def stream_completion(completion: Dict):
+    """Replay a stored completion as OpenAI chat.completion.chunk events."""
+    content = completion["choices"][0]["message"].get("content") or ""
+    base = {
+        "id": completion.get("id", f"chatcmpl-standin-{uuid.uuid4().hex[:12]}"),
+        "object": "chat.completion.chunk",
+        "created": completion.get("created", int(time.time())),
+        "model": completion.get("model", "standin")
+    }
+
+    first = {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+    yield f"data: {json.dumps(first)}\n\n"
+
+    for piece in split_for_streaming(content):
+        if TOKEN_DELAY_MS:
+            await asyncio.sleep(TOKEN_DELAY_MS / 1000)
+        chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+
+    last = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    yield f"data: {json.dumps(last)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await inject_latency_and_errors()
+    completion = await resolve("chat/completions", body)
+
+    if body.get("stream"):
+        return StreamingResponse(stream_completion(completion), media_type="text/event-stream")
+    return JSONResponse(completion)
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    await inject_latency_and_errors()
+    return JSONResponse(await resolve("embeddings", body))
+
+
+@app.get("/standin/stats")
+async def standin_stats():
+    """Mode, configuration and hit/miss counts."""
+    return {
+        "mode": STANDIN_MODE,
+        "cassette_dir": CASSETTE_DIR,
+        "latency_ms": LATENCY_MS,
+        "jitter_ms": JITTER_MS,
+        "error_rate": ERROR_RATE,
+        **stats
+    }
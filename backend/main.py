@@ -1,16 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Optional
 from .models import AnalysisRequest, AnalysisResponse, ArgumentRequest, ArgumentResponse, DisinformationTrend
-from .ai_service import analyze_text, generate_argument
+from .ai_service import analyze_text, generate_argument, get_routing_stats
 from .trend_monitor import get_active_trends, add_trend
-from .rag_service import augment_analysis_with_context, chat_with_data, retrieve_context
+from .rag_service import augment_analysis_with_context, chat_with_data, stream_chat_with_data, retrieve_context
 from .database import init_db, get_db_connection
 from .subjects import router as subjects_router
 from .scanner_agent import router as scanner_router
 from .scraper_service import router as scraper_router_service
 from .clone_router import router as clone_router
 from .ingest_service import ingest_all_data
+from .streaming import sse_response
+from . import metrics
+from . import inference_pool
+from . import message_catalog
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
@@ -20,8 +24,16 @@ async def lifespan(app: FastAPI):
     init_db()
     # Ingest data into Vector DB on startup
     await ingest_all_data()
+    # Load the empathy/emotion models now rather than on the first request
+    await inference_pool.warm_up()
+    # Translate static strings for languages not yet in the message catalog
+    message_catalog.start_background_build()
+    # One worker (elected through a lease) runs the listening loop
+    listening_service.start_supervisor()
     yield
     # Shutdown
+    await listening_service.shutdown()
+    inference_pool.shutdown()
 
 app = FastAPI(title="RECAPTURE API", description="API for reversing radicalization in young people", lifespan=lifespan)
 
@@ -55,6 +67,25 @@ async def chat_endpoint(request: ChatRequest):
         "empathy_analysis": result.get("empathy_analysis", {})
     }
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Streaming variant of /chat as server-sent events: "token" events as the
+    answer is generated, then "sources", "empathy_analysis" and "done".
+    """
+    return sse_response(stream_chat_with_data(request.query, request.language), "chat_stream")
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """In-process latency series (e.g. time-to-first-token), counters and gauges."""
+    return metrics.get_metrics()
+
+@app.get("/api/empathy/cache-stats")
+async def empathy_cache_stats():
+    """Hit rate of the shared empathy/emotion result cache."""
+    from .empathy_service import get_affect_cache_stats
+    return get_affect_cache_stats()
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_content(request: AnalysisRequest):
     try:
@@ -87,6 +118,11 @@ async def analyze_content(request: AnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/routing/stats")
+async def routing_stats():
+    """Escalation rate, token spend and audited misses for analyze_text model routing."""
+    return get_routing_stats()
+
 @app.get("/trends", response_model=List[DisinformationTrend])
 async def get_trends():
     return await get_active_trends()
@@ -240,6 +276,17 @@ async def get_pipeline_stats():
 async def get_rag_documents(limit: int = 100, offset: int = 0):
     return get_all_documents(limit, offset)
 
+from .prefilter_service import train_prefilter, get_prefilter_stats
+
+@app.post("/pipeline/prefilter/train")
+async def train_pipeline_prefilter():
+    """Fit the local pre-filter on labelled raw_content and report held-out precision, recall and throughput."""
+    return await train_prefilter()
+
+@app.get("/pipeline/prefilter/stats")
+async def pipeline_prefilter_stats():
+    return get_prefilter_stats()
+
 from .pipeline_service import add_topic, get_topics
 
 @app.get("/topics", response_model=List[str])
@@ -253,7 +300,9 @@ async def create_topic(topic: str):
 
 # --- Deep Listening Endpoints ---
 from .listening_service import listening_service
-from .models import ListeningResult
+from .listening_hub import listening_hub, parse_filters
+from .connector_registry import get_connector_rows, save_connector_row, delete_connector_row, load_connector_configs
+from .models import ListeningResult, ListeningConnectorConfig
 
 @app.post("/api/listening/start")
 async def start_listening():
@@ -267,22 +316,82 @@ async def stop_listening():
 
 @app.get("/api/listening/status")
 async def get_listening_status():
-    return {"running": listening_service.is_running()}
+    return listening_service.get_status()
+
+@app.get("/api/listening/schedule")
+async def get_listening_schedule():
+    """Per-source poll interval, next poll time and yield."""
+    return listening_service.get_schedule()
+
+@app.get("/api/listening/pipeline")
+async def get_listening_pipeline():
+    """Throughput and queue depth of each listening pipeline stage."""
+    return listening_service.get_pipeline_stats()
+
+@app.get("/api/listening/stream")
+async def stream_listening_results(
+    request: Request,
+    severity: Optional[str] = None,
+    trend_id: Optional[str] = None,
+    platform: Optional[str] = None,
+    cursor: Optional[int] = None
+):
+    """
+    Server-sent events for newly stored listening results.
+    Filters take comma-separated values. Resumes after `cursor` (-1 for only
+    new results); the Last-Event-ID header an EventSource sends on reconnect
+    takes precedence.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        cursor = int(last_event_id)
+    filters = parse_filters(severity, trend_id, platform)
+    return sse_response(listening_hub.stream(filters, cursor or 0), "listening_stream")
+
+@app.get("/api/listening/connectors")
+async def get_listening_connectors():
+    """Connector configs stored in the database and the sources currently polled."""
+    return {
+        "configured": get_connector_rows(),
+        "active": load_connector_configs(),
+        "sources": list(listening_service.sources.keys())
+    }
+
+@app.put("/api/listening/connectors/{connector_id}")
+async def save_listening_connector(connector_id: str, connector: ListeningConnectorConfig):
+    """Add or replace a connector config. Applied the next time listening starts."""
+    try:
+        save_connector_row(connector_id, connector.type, connector.config, connector.enabled)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "saved", "id": connector_id}
+
+@app.delete("/api/listening/connectors/{connector_id}")
+async def delete_listening_connector(connector_id: str):
+    if not delete_connector_row(connector_id):
+        raise HTTPException(status_code=404, detail="Connector not found")
+    return {"status": "deleted", "id": connector_id}
 
 @app.get("/api/listening/feed")
 async def get_listening_feed(page: int = 1, page_size: int = 20):
     return listening_service.get_latest_results(page, page_size)
 
 @app.post("/api/listening/promote")
-async def promote_listening_result(result: ListeningResult):
+async def promote_listening_result(result: ListeningResult, force: bool = False):
     """
     Promotes a listening result to the main pipeline for training.
+    Unmatched results the local pre-filter judges benign are discarded unless force=true.
     """
     from .pipeline_service import add_raw_content
+    from .prefilter_service import screen_content, discard_summary
     from .models import RawContent
     import uuid
     from datetime import datetime
     
+    screening = {"keep": True}
+    if not force and not result.matched_trend_id:
+        screening = await screen_content(result.content)
+    
     # Create RawContent from ListeningResult
     content = RawContent(
         id=str(uuid.uuid4()),
@@ -295,8 +404,13 @@ async def promote_listening_result(result: ListeningResult):
         analysis_summary=f"Promoted from Listening Feed. Matched Trend: {result.matched_trend_topic}"
     )
     
+    if not screening["keep"]:
+        content.status = "discarded"
+        content.risk_score = screening["score"]
+        content.analysis_summary = discard_summary(screening)
+    
     await add_raw_content(content)
-    return {"status": "promoted", "id": content.id}
+    return {"status": "promoted" if screening["keep"] else "discarded", "id": content.id}
 
 # --- Risk Monitoring Endpoints ---
 from .risk_monitor import RiskMonitor
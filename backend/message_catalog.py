@@ -0,0 +1,154 @@
+"""
+Catalog of static user-facing strings (empathy suggestions, guidance and
+error messages) with pre-built translations for SUPPORTED_LANGUAGES.
+
+English templates live here; translations are generated into
+message_catalog.json and looked up locally, so no translation call is needed
+at request time. The API builds languages missing from the catalog in the
+background at start-up (MESSAGE_CATALOG_AUTOBUILD); a full rebuild is
+`python -m backend.generate_translations --catalog`. Until a language is
+complete, callers translate its strings live.
+"""
+
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import string
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = os.getenv(
+    "MESSAGE_CATALOG_PATH",
+    os.path.join(os.path.dirname(__file__), "message_catalog.json")
+)
+# Translate languages missing from the catalog when the API starts
+MESSAGE_CATALOG_AUTOBUILD = os.getenv("MESSAGE_CATALOG_AUTOBUILD", "true").lower() == "true"
+
+# English templates. Placeholders in {braces} are filled in at lookup time.
+MESSAGES = {
+    # suggest_empathetic_response
+    "empathy.high_distress": "⚠️ High distress detected. Acknowledge their feelings first: 'I can see this is really difficult for you...'",
+    "empathy.low_empathy": "💡 Low empathy in message. They may be defensive. Use validating language: 'It makes sense you'd feel that way given...'",
+    "empathy.anger": "😤 {emotion} detected. Don't argue directly. Try: 'I hear your frustration. Can we explore...'",
+    "empathy.sadness": "😔 {emotion} detected. Offer support: 'This sounds overwhelming. You're not alone in this...'",
+    "empathy.joy": "😊 Positive emotion detected. Build on it: 'It's great that you're curious about this...'",
+    "empathy.general": "💬 General tip: Start with validation, then gently introduce new perspectives.",
+    "emotion.anger": "Anger",
+    "emotion.disgust": "Disgust",
+    "emotion.sadness": "Sadness",
+    "emotion.fear": "Fear",
+    # get_empathy_guidance
+    "guidance.high_distress": "High distress - prioritize emotional support and safety",
+    "guidance.moderate_distress": "Moderate distress - acknowledge feelings before facts",
+    "guidance.empathetic": "Empathetic communication - maintain this tone",
+    "guidance.low_empathy": "Low empathy - try more validating language",
+    "guidance.balanced": "Balanced approach - continue with empathy",
+    # Errors and fallbacks
+    "chat.error": "Error generating response: {error}",
+}
+
+# language -> {key: translated template}
+_catalog = None
+_build_task = None
+
+
+def load_catalog() -> Dict[str, Dict[str, str]]:
+    """Load the generated translations once. Empty if the catalog hasn't been built."""
+    global _catalog
+
+    if _catalog is None:
+        try:
+            with open(CATALOG_PATH, "r") as f:
+                _catalog = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Message catalog not built yet ({CATALOG_PATH}); using English strings")
+            _catalog = {}
+        except Exception as e:
+            logger.error(f"Error loading message catalog: {e}")
+            _catalog = {}
+    return _catalog
+
+
+def has_language(language: str) -> bool:
+    """True if every string for this language can be served from the catalog."""
+    return language == "en" or MESSAGES.keys() <= load_catalog().get(language, {}).keys()
+
+
+def placeholders(template: str) -> set:
+    return {name for _, name, _, _ in string.Formatter().parse(template) if name}
+
+
+def missing_languages() -> List[str]:
+    from .translation_service import SUPPORTED_LANGUAGES
+    return [language for language in SUPPORTED_LANGUAGES if not has_language(language)]
+
+
+def save_catalog(catalog: Dict[str, Dict[str, str]]):
+    """Write the catalog in one rename, so a concurrent reader never sees half a file."""
+    directory = os.path.dirname(os.path.abspath(CATALOG_PATH))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".message_catalog-", suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(catalog, f, indent=4, ensure_ascii=False)
+    os.replace(temp_path, CATALOG_PATH)
+
+
+async def build_catalog(languages: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Translate every template into the given languages (default: all
+    supported) and save the catalog. A translation that loses a placeholder,
+    or comes back unchanged because the call failed, is left out, so that
+    language keeps being translated live.
+    """
+    global _catalog
+    from .translation_service import translate_batch, SUPPORTED_LANGUAGES
+
+    keys = list(MESSAGES.keys())
+    catalog = dict(load_catalog())
+    for language in languages if languages is not None else list(SUPPORTED_LANGUAGES):
+        if language == "en":
+            continue
+
+        logger.info(f"Building message catalog for {SUPPORTED_LANGUAGES.get(language, language)} ({language})")
+        translated = await translate_batch([MESSAGES[key] for key in keys], language, source_lang="en")
+
+        entries = {}
+        for key, text in zip(keys, translated):
+            if text == MESSAGES[key] or placeholders(text) != placeholders(MESSAGES[key]):
+                logger.warning(f"No usable {language} translation for {key}, keeping English")
+                continue
+            entries[key] = text
+        catalog[language] = entries
+
+    save_catalog(catalog)
+    _catalog = catalog
+    return catalog
+
+
+async def ensure_catalog():
+    """Build the languages that are missing or incomplete; errors are logged, not raised."""
+    languages = missing_languages()
+    if not languages:
+        return
+    try:
+        await build_catalog(languages)
+    except Exception as e:
+        logger.error(f"Error building message catalog: {e}")
+
+
+def start_background_build():
+    """Run ensure_catalog without delaying start-up. No-op unless MESSAGE_CATALOG_AUTOBUILD."""
+    global _build_task
+    if MESSAGE_CATALOG_AUTOBUILD and _build_task is None:
+        _build_task = asyncio.create_task(ensure_catalog())
+
+
+def get_message(key: str, language: str = "en", **params) -> str:
+    """
+    Look up a static string in the user's language, falling back to English.
+    Keyword arguments fill the template's placeholders.
+    """
+    template = load_catalog().get(language, {}).get(key) or MESSAGES[key]
+    return template.format(**params) if params else template
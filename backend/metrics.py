@@ -0,0 +1,74 @@
+"""
+In-process metrics registry.
+Keeps recent latency samples, counters and gauges so services can report
+timings (e.g. time-to-first-token) without an external monitoring stack.
+"""
+
+from typing import Dict, List
+from collections import deque
+import threading
+
+# Number of recent samples kept per latency series
+MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_samples: Dict[str, deque] = {}
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+
+
+def observe(name: str, value: float):
+    """Record a latency/size sample (e.g. milliseconds) for a named series."""
+    with _lock:
+        if name not in _samples:
+            _samples[name] = deque(maxlen=MAX_SAMPLES)
+        _samples[name].append(value)
+
+
+def increment(name: str, amount: float = 1):
+    """Increment a named counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name: str, value: float):
+    """Set a named gauge to its current value."""
+    with _lock:
+        _gauges[name] = value
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict:
+    """Count, mean and p50/p95/p99 of a list of samples."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2)
+    }
+
+
+def get_metrics() -> Dict:
+    """Snapshot of all series, counters and gauges."""
+    with _lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+
+    return {
+        "latencies": {name: summarize(values) for name, values in samples.items()},
+        "counters": counters,
+        "gauges": gauges
+    }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class AnalysisRequest(BaseModel):
     text: str
@@ -51,6 +51,8 @@ class ContentLog(BaseModel):
     analysis_id: Optional[str] = None
     detected_trends: List[str] = []
     risk_score: float = 0.0
+    # Set once screened; a log with a score but no analysis_id was skipped by the pre-filter
+    prefilter_score: Optional[float] = None
 
 class Source(BaseModel):
     id: Optional[str] = None
@@ -87,6 +89,14 @@ class ListeningResult(BaseModel):
     matched_trend_topic: Optional[str] = None
     severity: str = "Low"
     url: Optional[str] = None
+    matched_trend_ids: List[str] = []  # Every matching trend, highest severity first
+    trend_similarities: Dict[str, float] = {}  # Trend id -> semantic similarity, when semantic matching is on
+
+class ListeningConnectorConfig(BaseModel):
+    id: Optional[str] = None  # Set from URL path
+    type: str  # A connector_registry type, e.g. "reddit", "4chan", "replay"
+    config: Dict = {}  # Constructor arguments, e.g. {"subreddits": ["MensRights"]}
+    enabled: bool = True
 
 # Social Media Integration Models
 class SocialMediaFeed(BaseModel):
@@ -0,0 +1,127 @@
+"""
+ONNX Runtime backend for the empathy and emotion classifiers.
+
+Exports a Hugging Face sequence-classification model to ONNX, applies
+dynamic int8 quantization and caches the result on disk, so later loads
+skip the export. The loaded model is wrapped in a regular transformers
+text-classification pipeline, so callers see the same output format as
+the PyTorch backend.
+
+Requires the optional `optimum[onnxruntime]` dependency.
+"""
+
+from typing import Optional
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", "onnx_models")
+# Apply dynamic int8 quantization after export
+ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "true").lower() == "true"
+
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+
+def model_cache_dir(model_name: str, quantized: bool = True) -> str:
+    """Directory holding the exported (and optionally quantized) model."""
+    suffix = "int8" if quantized else "fp32"
+    return os.path.join(ONNX_CACHE_DIR, f"{model_name.replace('/', '__')}-{suffix}")
+
+
+def _quantization_config():
+    """Dynamic int8 config for the instruction set this CPU supports."""
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        flags = ""
+
+    if "avx512_vnni" in flags:
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    if "avx512f" in flags:
+        return AutoQuantizationConfig.avx512(is_static=False, per_channel=False)
+    if "avx2" in flags:
+        return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+
+
+def _publish(build_dir: str, target_dir: str, model_file: str):
+    """
+    Move a finished build into place in one rename, so concurrent exporters
+    (several inference or API workers) never see a half-written directory.
+    If another process got there first, its copy is kept and ours discarded.
+    """
+    try:
+        os.replace(build_dir, target_dir)
+    except OSError:
+        if not os.path.exists(os.path.join(target_dir, model_file)):
+            raise
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def export_model(model_name: str, quantized: bool = ONNX_QUANTIZE) -> str:
+    """
+    Export a model to ONNX (and quantize it) unless the artifacts are already cached.
+
+    Returns:
+        Path to the directory with the ONNX model and tokenizer
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from transformers import AutoTokenizer
+
+    target_dir = model_cache_dir(model_name, quantized)
+    model_file = QUANTIZED_FILE_NAME if quantized else "model.onnx"
+    if os.path.exists(os.path.join(target_dir, model_file)):
+        return target_dir
+
+    # Build in a private directory next to the target, then rename it into place
+    os.makedirs(ONNX_CACHE_DIR, exist_ok=True)
+    export_dir = model_cache_dir(model_name, quantized=False)
+    if not os.path.exists(os.path.join(export_dir, "model.onnx")):
+        logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+        build_dir = tempfile.mkdtemp(dir=ONNX_CACHE_DIR, prefix=".export-")
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(build_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(build_dir)
+        _publish(build_dir, export_dir, "model.onnx")
+
+    if quantized:
+        logger.info(f"Quantizing {model_name} to int8 in {target_dir}")
+        build_dir = tempfile.mkdtemp(dir=ONNX_CACHE_DIR, prefix=".quantize-")
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        quantizer.quantize(save_dir=build_dir, quantization_config=_quantization_config())
+        AutoTokenizer.from_pretrained(export_dir).save_pretrained(build_dir)
+        _publish(build_dir, target_dir, model_file)
+
+    return target_dir
+
+
+def load_onnx_pipeline(model_name: str, quantized: Optional[bool] = None):
+    """
+    Load a text-classification pipeline backed by ONNX Runtime, exporting on first use.
+    Raises ImportError if optimum/onnxruntime isn't installed.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+
+    if quantized is None:
+        quantized = ONNX_QUANTIZE
+
+    model_dir = export_model(model_name, quantized)
+    model = ORTModelForSequenceClassification.from_pretrained(
+        model_dir,
+        file_name=QUANTIZED_FILE_NAME if quantized else "model.onnx"
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+    return pipeline(
+        "text-classification",
+        model=model,
+        tokenizer=tokenizer,
+        top_k=None
+    )
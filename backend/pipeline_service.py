@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List
 from .models import Source, RawContent
 from .ai_service import analyze_text
+from .prefilter_service import screen, get_trend_phrases, discard_summary, PREFILTER_ENABLED
 from .database import get_db_connection
 import requests
 from bs4 import BeautifulSoup
@@ -119,6 +120,8 @@ async def run_pipeline():
     """
     print("Running Threat Intel Pipeline...")
     new_content_count = 0
+    prefiltered_count = 0
+    trend_phrases = await get_trend_phrases() if PREFILTER_ENABLED else []
     
     # 0. Discover New Sources via Agents
     if MONITORED_TOPICS:
@@ -134,7 +137,24 @@ async def run_pipeline():
                 content_text = item['snippet']
                 # Optional: Deep fetch logic here
                 
-                analysis = await analyze_text(content_text[:2000])
+                # Local pre-filter: discard obviously benign content without an API call
+                if PREFILTER_ENABLED:
+                    screening = screen(content_text, trend_phrases)
+                    if not screening["keep"]:
+                        await add_raw_content(RawContent(
+                            id=str(uuid.uuid4()),
+                            source_id="discovery_agent",
+                            content=f"Title: {item['title']}\n\n{content_text}",
+                            url=item['url'],
+                            timestamp=datetime.now().isoformat(),
+                            status="discarded",
+                            analysis_summary=discard_summary(screening),
+                            risk_score=screening["score"]
+                        ))
+                        prefiltered_count += 1
+                        continue
+                
+                analysis = await analyze_text(content_text)
                 
                 status = "pending"
                 if analysis.radicalization_score < 0.1:
@@ -163,7 +183,24 @@ async def run_pipeline():
             fetched_items = await fetch_from_source(source)
             
             for item in fetched_items:
-                analysis = await analyze_text(item['content'][:2000])
+                # Local pre-filter: discard obviously benign content without an API call
+                if PREFILTER_ENABLED:
+                    screening = screen(item['content'], trend_phrases)
+                    if not screening["keep"]:
+                        await add_raw_content(RawContent(
+                            id=str(uuid.uuid4()),
+                            source_id=source.id,
+                            content=item['content'],
+                            url=item['url'],
+                            timestamp=datetime.now().isoformat(),
+                            status="discarded",
+                            analysis_summary=discard_summary(screening),
+                            risk_score=screening["score"]
+                        ))
+                        prefiltered_count += 1
+                        continue
+                
+                analysis = await analyze_text(item['content'])
                 
                 status = "pending"
                 if analysis.radicalization_score < 0.1:
@@ -186,7 +223,7 @@ async def run_pipeline():
         except Exception as e:
             print(f"Error processing source {source.name}: {e}")
             
-    return {"status": "success", "new_items": new_content_count}
+    return {"status": "success", "new_items": new_content_count, "prefiltered": prefiltered_count}
 
 async def fetch_from_source(source: Source) -> List[dict]:
     """
@@ -266,9 +303,8 @@ async def add_trend_to_queue(trend_id: str):
     """
     Converts a trend into a RawContent item in the pending queue for training.
     """
-    from .trend_monitor import get_active_trends
-    trends = await get_active_trends()
-    trend = next((t for t in trends if t.id == trend_id), None)
+    from .trend_monitor import get_trend
+    trend = await get_trend(trend_id)
     
     if not trend:
         raise ValueError("Trend not found")
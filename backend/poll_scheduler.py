@@ -0,0 +1,191 @@
+"""
+Adaptive polling schedule for listening sources.
+
+Each source (one subreddit, one 4chan board) has its own poll interval:
+sources that keep producing new posts are polled more often, quiet ones back
+off, and rate-limited ones wait for as long as the server asks (Retry-After,
+x-ratelimit-*). Rate-limit headers apply to every source on the same
+platform, since the budget is per client rather than per subreddit.
+"""
+
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import os
+import time
+from . import metrics
+
+POLL_BASE_INTERVAL_SECONDS = float(os.getenv("POLL_BASE_INTERVAL_SECONDS", "30"))
+POLL_MIN_INTERVAL_SECONDS = float(os.getenv("POLL_MIN_INTERVAL_SECONDS", "10"))
+POLL_MAX_INTERVAL_SECONDS = float(os.getenv("POLL_MAX_INTERVAL_SECONDS", "600"))
+# Interval multipliers after a poll with new posts / without
+POLL_SPEEDUP_FACTOR = float(os.getenv("POLL_SPEEDUP_FACTOR", "0.7"))
+POLL_BACKOFF_FACTOR = float(os.getenv("POLL_BACKOFF_FACTOR", "1.5"))
+# Smoothing for the per-source yield average
+POLL_YIELD_ALPHA = 0.3
+
+
+def parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, retry_at.timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class PollScheduler:
+    def __init__(self):
+        self.sources: Dict[str, Dict] = {}
+        # platform -> epoch seconds before which none of its sources are polled
+        self.blocked_until: Dict[str, float] = {}
+        # platform -> minimum seconds between polls of one source, from x-ratelimit-*
+        self.min_spacing: Dict[str, float] = {}
+
+    @staticmethod
+    def platform(source_key: str) -> str:
+        return source_key.split(":", 1)[0]
+
+    def register(self, source_key: str, now: Optional[float] = None):
+        if source_key in self.sources:
+            return
+        self.sources[source_key] = {
+            "source": source_key,
+            "interval": POLL_BASE_INTERVAL_SECONDS,
+            "next_poll": now if now is not None else time.time(),
+            "polls": 0,
+            "new_posts": 0,
+            "last_new_posts": 0,
+            "yield_avg": 0.0,
+            "errors": 0,
+            "rate_limited": 0,
+            "last_status": None,
+            "last_poll": None
+        }
+
+    def unregister(self, source_key: str):
+        self.sources.pop(source_key, None)
+
+    def start(self, source_key: str):
+        """Mark a source as being polled; it is not due again until record()."""
+        self.sources[source_key]["next_poll"] = float("inf")
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Sources whose next poll time has passed, most overdue first."""
+        now = now if now is not None else time.time()
+        due = [
+            key for key, source in self.sources.items()
+            if source["next_poll"] <= now and self.blocked_until.get(self.platform(key), 0) <= now
+        ]
+        return sorted(due, key=lambda key: self.sources[key]["next_poll"])
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.time()
+        if not self.sources:
+            return POLL_BASE_INTERVAL_SECONDS
+        next_poll = min(
+            max(source["next_poll"], self.blocked_until.get(self.platform(key), 0))
+            for key, source in self.sources.items()
+        )
+        return max(0.0, next_poll - now)
+
+    def record(self, source_key: str, new_posts: int, status: Optional[int] = None, headers=None, now: Optional[float] = None):
+        """
+        Update a source's interval from the outcome of a poll.
+
+        Args:
+            new_posts: Posts that were new to the database
+            status: HTTP status of the poll, None if it failed before a response
+            headers: Response headers, for Retry-After and x-ratelimit-*
+        """
+        now = now if now is not None else time.time()
+        self.register(source_key, now)
+        source = self.sources[source_key]
+        platform = self.platform(source_key)
+        headers = headers or {}
+
+        source["polls"] += 1
+        source["last_poll"] = datetime.fromtimestamp(now).isoformat()
+        source["last_status"] = status
+        source["last_new_posts"] = new_posts
+        source["new_posts"] += new_posts
+        source["yield_avg"] = POLL_YIELD_ALPHA * new_posts + (1 - POLL_YIELD_ALPHA) * source["yield_avg"]
+
+        self._apply_rate_limit_headers(platform, headers, now)
+
+        if status == 429:
+            source["rate_limited"] += 1
+            metrics.increment("listening.rate_limited")
+            wait = parse_retry_after(headers.get("Retry-After"), now)
+            if wait is None:
+                wait = _header_float(headers, "x-ratelimit-reset")
+            if wait is None:
+                wait = source["interval"] * 2
+            # Everything on this platform shares the limit
+            self.blocked_until[platform] = max(self.blocked_until.get(platform, 0), now + wait)
+            source["interval"] = min(POLL_MAX_INTERVAL_SECONDS, source["interval"] * 2)
+        elif status is None or status >= 500:
+            source["errors"] += 1
+            source["interval"] = min(POLL_MAX_INTERVAL_SECONDS, source["interval"] * 2)
+        elif new_posts > 0:
+            source["errors"] = 0
+            source["interval"] = max(POLL_MIN_INTERVAL_SECONDS, source["interval"] * POLL_SPEEDUP_FACTOR)
+        else:
+            source["errors"] = 0
+            source["interval"] = min(POLL_MAX_INTERVAL_SECONDS, source["interval"] * POLL_BACKOFF_FACTOR)
+
+        interval = max(source["interval"], self.min_spacing.get(platform, 0))
+        source["next_poll"] = now + interval
+        metrics.observe("listening.poll_interval_s", interval)
+
+    def _apply_rate_limit_headers(self, platform: str, headers, now: float):
+        remaining = _header_float(headers, "x-ratelimit-remaining")
+        reset = _header_float(headers, "x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+
+        if remaining < 1:
+            self.blocked_until[platform] = max(self.blocked_until.get(platform, 0), now + reset)
+            return
+
+        # Spread the remaining budget over the window, across all of the platform's sources
+        platform_sources = sum(1 for key in self.sources if self.platform(key) == platform)
+        self.min_spacing[platform] = reset / remaining * platform_sources
+
+    def get_schedule(self, now: Optional[float] = None) -> List[Dict]:
+        """Per-source schedule and yield, soonest poll first."""
+        now = now if now is not None else time.time()
+        table = []
+        for key, source in self.sources.items():
+            next_poll = max(source["next_poll"], self.blocked_until.get(self.platform(key), 0))
+            in_flight = next_poll == float("inf")
+            table.append({
+                "source": key,
+                "interval_seconds": round(source["interval"], 1),
+                "next_poll_in_seconds": None if in_flight else round(max(0.0, next_poll - now), 1),
+                "in_flight": in_flight,
+                "polls": source["polls"],
+                "new_posts": source["new_posts"],
+                "last_new_posts": source["last_new_posts"],
+                "yield_per_poll": round(source["yield_avg"], 2),
+                "errors": source["errors"],
+                "rate_limited": source["rate_limited"],
+                "last_status": source["last_status"],
+                "last_poll": source["last_poll"]
+            })
+        return sorted(table, key=lambda row: row["next_poll_in_seconds"] if row["next_poll_in_seconds"] is not None else -1)
@@ -0,0 +1,258 @@
+"""
+Local Pre-filter Service
+CPU-only screening that runs before analyze_text so obviously benign content
+is discarded without an API call.
+
+Combines the existing keyword lexicons (RiskMonitor keywords, AuthorityMatcher
+theme words, trend common_phrases) with a TF-IDF + logistic regression model
+fitted on raw_content rows that were approved or discarded.
+"""
+from typing import Dict, List
+from datetime import datetime
+import os
+import pickle
+import time
+from .database import get_db_connection
+from .risk_monitor import RiskMonitor
+from .authority_matcher import AuthorityMatcher
+from .trend_registry import trend_registry
+from . import metrics
+
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() == "true"
+PREFILTER_MODEL_PATH = os.getenv("PREFILTER_MODEL_PATH", "prefilter_model.pkl")
+# Items whose harmful-class probability falls below this are discarded
+PREFILTER_THRESHOLD = float(os.getenv("PREFILTER_THRESHOLD", "0.15"))
+# Fewer labelled rows than this and the model isn't trained
+PREFILTER_MIN_TRAINING_ROWS = int(os.getenv("PREFILTER_MIN_TRAINING_ROWS", "40"))
+
+# Marks rows discarded by the pre-filter so they are never used as training labels
+PREFILTER_SUMMARY_PREFIX = "Auto-discarded by local pre-filter"
+
+# Loaded model bundle: {"vectorizer", "classifier", "evaluation", "trained_at"}
+_model = None
+_model_loaded = False
+
+
+def lexicon_features(text: str, trend_phrases: List[str]) -> Dict[str, int]:
+    """
+    Count keyword hits per lexicon.
+    """
+    content = text.lower()
+    features = {
+        "violence": sum(content.count(k) for k in RiskMonitor.VIOLENCE_KEYWORDS),
+        "isolation": sum(content.count(k) for k in RiskMonitor.ISOLATION_KEYWORDS),
+        "hopelessness": sum(content.count(k) for k in RiskMonitor.HOPELESSNESS_KEYWORDS),
+        "trend_phrases": sum(1 for phrase in trend_phrases if phrase and phrase.lower() in content)
+    }
+    for name, rule in AuthorityMatcher.THEME_KEYWORDS.items():
+        features[f"theme_{name}"] = sum(1 for k in rule["keywords"] if k in content)
+    return features
+
+
+def _feature_matrix(vectorizer, texts: List[str], trend_phrases: List[str]):
+    """TF-IDF features with the lexicon counts appended."""
+    from scipy.sparse import csr_matrix, hstack
+
+    lexicon = [list(lexicon_features(t, trend_phrases).values()) for t in texts]
+    return hstack([vectorizer.transform(texts), csr_matrix(lexicon, dtype=float)]).tocsr()
+
+
+def load_model():
+    """Load the trained model from disk once. Returns None if there isn't one."""
+    global _model, _model_loaded
+
+    if _model_loaded:
+        return _model
+
+    _model_loaded = True
+    if not os.path.exists(PREFILTER_MODEL_PATH):
+        print("Pre-filter model not trained yet; screening with lexicons only")
+        return None
+
+    try:
+        with open(PREFILTER_MODEL_PATH, "rb") as f:
+            _model = pickle.load(f)
+        print(f"Pre-filter model loaded (trained {_model.get('trained_at')})")
+    except Exception as e:
+        print(f"Error loading pre-filter model: {e}")
+        _model = None
+    return _model
+
+
+def screen(text: str, trend_phrases: List[str]) -> Dict:
+    """
+    Decide whether text needs LLM analysis.
+
+    Content with a trend phrase or violence keyword is always kept. Otherwise
+    the trained model decides; without a model everything is kept.
+
+    Returns:
+        {
+            "keep": bool,
+            "score": float (0-1, probability of harmful content; None without a model),
+            "reason": str,
+            "lexicon_hits": Dict[str, int]
+        }
+    """
+    start = time.perf_counter()
+    hits = lexicon_features(text, trend_phrases)
+    model = load_model()
+
+    if hits["trend_phrases"] or hits["violence"]:
+        keep, score, reason = True, None, "lexicon"
+    elif model is None:
+        keep, score, reason = True, None, "no_model"
+    else:
+        features = _feature_matrix(model["vectorizer"], [text], trend_phrases)
+        score = float(model["classifier"].predict_proba(features)[0][1])
+        keep = score >= PREFILTER_THRESHOLD
+        reason = "model"
+
+    metrics.observe("prefilter.screen_ms", (time.perf_counter() - start) * 1000)
+    metrics.increment("prefilter.kept" if keep else "prefilter.discarded")
+
+    return {
+        "keep": keep,
+        "score": score,
+        "reason": reason,
+        "lexicon_hits": {k: v for k, v in hits.items() if v}
+    }
+
+
+# Flattened common_phrases, rebuilt by the trend registry when trends change
+_trend_phrases = None
+
+
+def _on_trends_changed(trends, change):
+    global _trend_phrases
+    _trend_phrases = [phrase for trend in trends for phrase in trend.common_phrases]
+
+trend_registry.subscribe(_on_trends_changed)
+
+
+async def get_trend_phrases() -> List[str]:
+    """All common_phrases across active trends."""
+    if _trend_phrases is None:
+        _on_trends_changed(trend_registry.get_trends(), {})
+    return _trend_phrases
+
+
+async def screen_content(text: str) -> Dict:
+    """
+    Screen one item. Returns {"keep": True, ...} when the pre-filter is disabled.
+    """
+    if not PREFILTER_ENABLED:
+        return {"keep": True, "score": None, "reason": "disabled", "lexicon_hits": {}}
+    return screen(text, await get_trend_phrases())
+
+
+def discard_summary(result: Dict) -> str:
+    """analysis_summary for a row discarded by the pre-filter."""
+    return f"{PREFILTER_SUMMARY_PREFIX} (score {result['score']:.2f})"
+
+
+def load_training_data() -> tuple[List[str], List[int]]:
+    """
+    Labelled raw_content rows: approved/trained are harmful (1), discarded are benign (0).
+    Rows discarded by the pre-filter itself are excluded so it never trains on its own output.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """SELECT content, status FROM raw_content
+        WHERE status IN ('approved', 'trained', 'discarded')
+        AND (analysis_summary IS NULL OR analysis_summary NOT LIKE ?)""",
+        (f"{PREFILTER_SUMMARY_PREFIX}%",)
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    texts = [row['content'] for row in rows]
+    labels = [0 if row['status'] == 'discarded' else 1 for row in rows]
+    return texts, labels
+
+
+async def train_prefilter(holdout: float = 0.2) -> Dict:
+    """
+    Fit the TF-IDF + logistic regression model and evaluate it on a held-out split.
+    Saves the model to PREFILTER_MODEL_PATH and returns the evaluation report.
+    """
+    global _model, _model_loaded
+
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.model_selection import train_test_split
+    except ImportError:
+        return {"status": "error", "message": "scikit-learn is not installed"}
+
+    texts, labels = load_training_data()
+    positives = sum(labels)
+    if len(texts) < PREFILTER_MIN_TRAINING_ROWS or positives == 0 or positives == len(labels):
+        return {
+            "status": "insufficient_data",
+            "labelled_rows": len(texts),
+            "harmful_rows": positives,
+            "message": f"Need at least {PREFILTER_MIN_TRAINING_ROWS} labelled rows with both approved and discarded items"
+        }
+
+    trend_phrases = await get_trend_phrases()
+
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=holdout, stratify=labels, random_state=42
+    )
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_features=50000, sublinear_tf=True)
+    vectorizer.fit(train_texts)
+    classifier = LogisticRegression(class_weight="balanced", max_iter=1000)
+    classifier.fit(_feature_matrix(vectorizer, train_texts, trend_phrases), train_labels)
+
+    # Evaluate on the held-out split, including the lexicon keep rule
+    bundle = {"vectorizer": vectorizer, "classifier": classifier}
+    start = time.perf_counter()
+    probabilities = classifier.predict_proba(_feature_matrix(vectorizer, test_texts, trend_phrases))[:, 1]
+    predictions = []
+    for text, probability in zip(test_texts, probabilities):
+        hits = lexicon_features(text, trend_phrases)
+        predictions.append(1 if hits["trend_phrases"] or hits["violence"] or probability >= PREFILTER_THRESHOLD else 0)
+    elapsed = time.perf_counter() - start
+
+    true_positives = sum(1 for p, l in zip(predictions, test_labels) if p == 1 and l == 1)
+    kept = sum(predictions)
+    harmful = sum(test_labels)
+
+    evaluation = {
+        "threshold": PREFILTER_THRESHOLD,
+        "train_rows": len(train_texts),
+        "test_rows": len(test_texts),
+        "precision": round(true_positives / kept, 3) if kept else 0.0,
+        "recall": round(true_positives / harmful, 3) if harmful else 0.0,
+        "discard_rate": round(1 - kept / len(test_texts), 3),
+        "throughput_per_sec": round(len(test_texts) / elapsed, 1) if elapsed else None
+    }
+
+    bundle["evaluation"] = evaluation
+    bundle["trained_at"] = datetime.now().isoformat()
+    with open(PREFILTER_MODEL_PATH, "wb") as f:
+        pickle.dump(bundle, f)
+
+    _model = bundle
+    _model_loaded = True
+    print(f"Pre-filter trained: {evaluation}")
+
+    return {"status": "success", "evaluation": evaluation}
+
+
+def get_prefilter_stats() -> Dict:
+    """Current configuration, last evaluation and kept/discarded counts."""
+    model = load_model()
+    counters = metrics.get_metrics()["counters"]
+    return {
+        "enabled": PREFILTER_ENABLED,
+        "model_trained": model is not None,
+        "trained_at": model.get("trained_at") if model else None,
+        "threshold": PREFILTER_THRESHOLD,
+        "evaluation": model.get("evaluation") if model else None,
+        "kept": counters.get("prefilter.kept", 0),
+        "discarded": counters.get("prefilter.discarded", 0)
+    }
@@ -0,0 +1,136 @@
+"""
+Token-budgeted prompt assembly.
+Counts tokens with tiktoken and packs posts, history items and RAG passages
+into a per-model budget instead of slicing by characters or item counts.
+"""
+
+from typing import Dict, List, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Prompt-side token budgets per model. These leave headroom in the context
+# window for the fixed system prompt and the completion, and cap spend on
+# the large-context models.
+MODEL_BUDGETS = {
+    "gpt-4o": 16000,
+    "gpt-4o-mini": 16000,
+    "gpt-4": 6000,
+}
+DEFAULT_BUDGET = 6000
+FALLBACK_ENCODING = "cl100k_base"
+
+# Encoding cache (None means tiktoken or its BPE files are unavailable)
+_encodings = {}
+
+
+def get_encoding(model: str):
+    """
+    Return the tiktoken encoding for a model, cached per model name.
+    Returns None if tiktoken can't be loaded (e.g. offline without cached BPE files).
+    """
+    if model in _encodings:
+        return _encodings[model]
+
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable for {model}, using approximate token counts: {e}")
+        encoding = None
+
+    _encodings[model] = encoding
+    return encoding
+
+
+def get_budget(model: str, share: float = 1.0) -> int:
+    """
+    Token budget for the variable part of a prompt sent to `model`.
+    `share` splits the budget when several sections compete for it.
+    """
+    return int(MODEL_BUDGETS.get(model, DEFAULT_BUDGET) * share)
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens exactly with tiktoken (approximately if it is unavailable)."""
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """Cut text to at most `max_tokens` tokens."""
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def pack_items(
+    items: List[str],
+    budget: int,
+    model: str = "gpt-4o",
+    separator: str = "\n\n",
+    per_item_max: Optional[int] = None,
+    label: str = "items"
+) -> Dict:
+    """
+    Pack items into a token budget, in the order given.
+
+    Callers pass items already ordered by priority (most recent or most
+    relevant first). Packing stops at the first item that doesn't fit so the
+    priority order is never broken.
+
+    Args:
+        items: Pre-formatted item strings in priority order
+        budget: Token budget for the joined result
+        model: Model whose tokenizer is used for counting
+        separator: String placed between items
+        per_item_max: Optional cap per item, so one long post can't crowd out the rest
+        label: Name used in the log line when items are dropped
+
+    Returns:
+        dict with keys:
+            - text: The joined items that fit
+            - items: List of the included item strings
+            - included: Number of items included
+            - dropped: Number of items left out
+            - tokens: Token count of the packed text
+    """
+    packed = []
+    used = 0
+    separator_tokens = count_tokens(separator, model)
+
+    for item in items:
+        if per_item_max is not None:
+            item = truncate_to_tokens(item, per_item_max, model)
+        cost = count_tokens(item, model) + (separator_tokens if packed else 0)
+        if used + cost > budget:
+            break
+        packed.append(item)
+        used += cost
+
+    dropped = len(items) - len(packed)
+    if dropped:
+        logger.info(f"Prompt budget ({budget} tokens, {model}): packed {len(packed)} {label}, dropped {dropped}")
+
+    return {
+        "text": separator.join(packed),
+        "items": packed,
+        "included": len(packed),
+        "dropped": dropped,
+        "tokens": used
+    }
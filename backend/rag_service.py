@@ -1,27 +1,37 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from .models import DisinformationTrend
 from .vector_store import query_documents
 from .ai_service import client
-from .empathy_service import detect_empathy, detect_emotions, suggest_empathetic_response
-from .translation_service import translate_input_to_english, translate_output_from_english
+from .empathy_service import analyze_affect_async, suggest_empathetic_response
+from .message_catalog import get_message, has_language
+from .translation_service import translate_input_to_english, translate_output_from_english, translate_batch, stream_translate_sentences
+from .prompt_budget import get_budget, pack_items, truncate_to_tokens
+
+# Retrieval over-fetches; the token budget decides how many passages reach the prompt
+RAG_CANDIDATES = 8
 
 async def retrieve_context_with_sources(query: str) -> dict:
     """
     Retrieves relevant documents from the vector store.
-    Returns a dict with formatted context string and raw sources.
+    Passages are packed most-relevant first into the prompt token budget.
+    Returns a dict with formatted context string, raw sources and the dropped passage count.
     """
-    results = query_documents(query, n_results=3)
+    results = query_documents(query, n_results=RAG_CANDIDATES)
     
     if not results:
-        return {"context_str": "", "sources": []}
+        return {"context_str": "", "sources": [], "dropped": 0}
         
-    context_str = "\n\n".join([
-        f"--- Document ({r['metadata']['type']}) ---\n{r['content']}" 
-        for r in results
-    ])
+    packed = pack_items(
+        [f"--- Document ({r['metadata']['type']}) ---\n{r['content']}" for r in results],
+        budget=get_budget("gpt-4o", 0.25),
+        model="gpt-4o",
+        per_item_max=1000,
+        label="passages"
+    )
+    context_str = packed["text"]
     
     sources = []
-    for r in results:
+    for r in results[:packed["included"]]:
         source_info = {
             "type": r['metadata'].get('type', 'unknown'),
             "content": r['content'],
@@ -29,7 +39,7 @@ async def retrieve_context_with_sources(query: str) -> dict:
         }
         sources.append(source_info)
     
-    return {"context_str": context_str, "sources": sources}
+    return {"context_str": context_str, "sources": sources, "dropped": packed["dropped"]}
 
 async def retrieve_context(query: str) -> str:
     """
@@ -38,17 +48,18 @@ async def retrieve_context(query: str) -> str:
     result = await retrieve_context_with_sources(query)
     return result["context_str"]
 
-async def chat_with_data(query: str, language: str = "en") -> dict:
+async def prepare_chat(query: str, language: str = "en") -> dict:
     """
-    Answers a user query using RAG with empathy detection and translation support.
-    Returns: { "response": str, "sources": list, "empathy_analysis": dict }
+    Shared preparation for chat_with_data and its streaming variant:
+    translation, empathy analysis, retrieval and prompt construction.
     """
     # 0. Translate input if needed
     processed_query = await translate_input_to_english(query, language)
     
     # 1. Analyze query for emotional content (on English text)
-    empathy_result = detect_empathy(processed_query)
-    emotion_result = detect_emotions(processed_query)
+    affect = await analyze_affect_async(processed_query)
+    empathy_result = affect["empathy"]
+    emotion_result = affect["emotion"]
     
     # 2. Retrieve Context
     retrieval_result = await retrieve_context_with_sources(processed_query)
@@ -90,36 +101,111 @@ async def chat_with_data(query: str, language: str = "en") -> dict:
     User Question: {query}
     """
     
+    return {
+        "language": language,
+        "processed_query": processed_query,
+        "empathy_result": empathy_result,
+        "emotion_result": emotion_result,
+        "context": context,
+        "sources": sources,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    }
+
+def build_empathy_analysis(prepared: dict) -> dict:
+    """Empathy section of a chat response."""
+    empathy_result = prepared["empathy_result"]
+    emotion_result = prepared["emotion_result"]
+    return {
+        "query_empathy": empathy_result.get("empathy_score"),
+        "query_distress": empathy_result.get("distress_score"),
+        "dominant_emotion": emotion_result.get("dominant_emotion"),
+        "empathy_guidance": suggest_empathetic_response(
+            prepared["context"], prepared["processed_query"], empathy_result, emotion_result,
+            language=prepared["language"] if has_language(prepared["language"]) else "en"
+        )
+    }
+
+async def chat_with_data(query: str, language: str = "en") -> dict:
+    """
+    Answers a user query using RAG with empathy detection and translation support.
+    Returns: { "response": str, "sources": list, "empathy_analysis": dict }
+    """
+    prepared = await prepare_chat(query, language)
+    
     # 4. Call OpenAI
     try:
         response = await client.chat.completions.create(
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+            messages=prepared["messages"]
         )
         
         english_response = response.choices[0].message.content
-        final_response = await translate_output_from_english(english_response, language)
+        empathy_analysis = build_empathy_analysis(prepared)
+        
+        if has_language(language):
+            # Guidance already comes from the message catalog in the user's language
+            final_response = await translate_output_from_english(english_response, language)
+        else:
+            # Catalog not built for this language: translate the answer and guidance in one call
+            final_response, empathy_analysis["empathy_guidance"] = await translate_batch(
+                [english_response, empathy_analysis["empathy_guidance"]], language, "en"
+            )
         
         return {
             "response": final_response,
-            "sources": sources,
-            "empathy_analysis": {
-                "query_empathy": empathy_result.get("empathy_score"),
-                "query_distress": empathy_result.get("distress_score"),
-                "dominant_emotion": emotion_result.get("dominant_emotion"),
-                "empathy_guidance": suggest_empathetic_response(context, processed_query)
-            }
+            "sources": prepared["sources"],
+            "empathy_analysis": empathy_analysis
         }
     except Exception as e:
         return {
-            "response": f"Error generating response: {str(e)}",
+            "response": get_message("chat.error", language, error=str(e)),
             "sources": [],
             "empathy_analysis": {}
         }
 
+async def stream_chat_with_data(query: str, language: str = "en") -> AsyncIterator[Dict]:
+    """
+    Streaming variant of chat_with_data.
+    Yields {"event", "data"} dicts: "token" events as the answer is generated,
+    then trailing "sources", "empathy_analysis" and "done" events.
+    For non-English users each sentence of the English answer is translated as
+    soon as it is complete, and the translated sentences are streamed.
+    """
+    try:
+        prepared = await prepare_chat(query, language)
+        
+        stream = await client.chat.completions.create(
+            model="gpt-4o",
+            messages=prepared["messages"],
+            stream=True
+        )
+        
+        async def english_tokens():
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        tokens = english_tokens()
+        if language != "en":
+            tokens = stream_translate_sentences(tokens, language, "en")
+        response_parts = []
+        async for token in tokens:
+            response_parts.append(token)
+            yield {"event": "token", "data": token}
+        
+        empathy_analysis = build_empathy_analysis(prepared)
+        if not has_language(language):
+            empathy_analysis["empathy_guidance"] = await translate_output_from_english(empathy_analysis["empathy_guidance"], language)
+        
+        yield {"event": "sources", "data": prepared["sources"]}
+        yield {"event": "empathy_analysis", "data": empathy_analysis}
+        yield {"event": "done", "data": {"response": "".join(response_parts)}}
+    except Exception as e:
+        yield {"event": "error", "data": {"message": get_message("chat.error", language, error=str(e))}}
+
 async def augment_analysis_with_context(text: str, base_analysis: dict) -> dict:
     """
     Enhances the base analysis with context from the knowledge base.
@@ -130,7 +216,7 @@ async def augment_analysis_with_context(text: str, base_analysis: dict) -> dict:
     
     if results:
         base_analysis["context_notes"] = [
-            f"Similar content found: {r['content'][:100]}..." for r in results
+            f"Similar content found: {truncate_to_tokens(r['content'], 25)}..." for r in results
         ]
     
     return base_analysis
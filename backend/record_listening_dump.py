@@ -0,0 +1,60 @@
+"""
+Record posts from the configured listening connectors into a JSON Lines dump
+for ReplayConnector.
+
+    python -m backend.record_listening_dump --out dumps/listening.jsonl --rounds 3 --interval 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.connector_registry import build_connectors
+from backend.connectors import close_http_client
+
+
+async def record(out_path: str, rounds: int, interval: float, limit: int):
+    connectors = build_connectors()
+    seen = set()
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+    with open(out_path, "a") as f:
+        for round_number in range(rounds):
+            results = await asyncio.gather(
+                *[connector.fetch_posts_async(limit=limit) for connector in connectors],
+                return_exceptions=True
+            )
+            written = 0
+            for posts in results:
+                if isinstance(posts, Exception):
+                    print(f"Error fetching: {posts}")
+                    continue
+                for post in posts:
+                    if post["id"] in seen:
+                        continue
+                    seen.add(post["id"])
+                    f.write(json.dumps(post, ensure_ascii=False) + "\n")
+                    written += 1
+            print(f"Round {round_number + 1}/{rounds}: recorded {written} posts")
+
+            if round_number + 1 < rounds:
+                await asyncio.sleep(interval)
+
+    await close_http_client()
+    print(f"Saved {len(seen)} posts to {out_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record listening connector output for offline replay")
+    parser.add_argument("--out", default="dumps/listening.jsonl")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between rounds")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(record(args.out, args.rounds, args.interval, args.limit))
@@ -6,8 +6,9 @@ import os
 from openai import OpenAI
 from .database import get_db_connection
 from .models import RiskProfileAnalysis, SubjectSocialPost
+from .prompt_budget import get_budget, pack_items
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
 
 
 async def analyze_post_batch(posts: List[SubjectSocialPost]) -> Dict:
@@ -23,11 +24,14 @@ async def analyze_post_batch(posts: List[SubjectSocialPost]) -> Dict:
             'language_patterns': {}
         }
     
-    # Prepare posts for analysis
-    posts_text = "\n\n".join([
-        f"[{post.platform} - {post.posted_at}]: {post.content}"
-        for post in posts[:50]  # Limit to 50 most recent posts to stay within token limits
-    ])
+    # Prepare posts for analysis (posts arrive newest first; pack as many as fit the token budget)
+    posts_text = pack_items(
+        [f"[{post.platform} - {post.posted_at}]: {post.content}" for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         # Use OpenAI to analyze the posts
@@ -85,7 +89,14 @@ async def extract_themes(posts: List[SubjectSocialPost]) -> List[str]:
     if not posts:
         return []
     
-    posts_text = " ".join([post.content for post in posts[:30]])
+    posts_text = pack_items(
+        [post.content for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        separator=" ",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         response = client.chat.completions.create(
@@ -117,7 +128,14 @@ async def detect_radicalization_markers(posts: List[SubjectSocialPost]) -> List[
     if not posts:
         return []
     
-    posts_text = "\n".join([f"{post.platform}: {post.content}" for post in posts[:40]])
+    posts_text = pack_items(
+        [f"{post.platform}: {post.content}" for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        separator="\n",
+        per_item_max=500,
+        label="posts"
+    )["text"]
     
     try:
         response = client.chat.completions.create(
@@ -162,11 +180,17 @@ async def analyze_language_patterns(posts: List[SubjectSocialPost]) -> Dict:
     if not posts:
         return {}
     
-    # Group posts by time period for trend analysis
-    posts_text = "\n".join([
-        f"[{post.posted_at or 'unknown'}]: {post.content}"
-        for post in sorted(posts[:30], key=lambda p: p.posted_at or "")
-    ])
+    # Pack the most recent posts, then order them chronologically for trend analysis
+    packed = pack_items(
+        [f"[{post.posted_at or 'unknown'}]: {post.content}" for post in posts],
+        budget=get_budget("gpt-4"),
+        model="gpt-4",
+        separator="\n",
+        per_item_max=500,
+        label="posts"
+    )
+    chronological = sorted(zip(posts, packed["items"]), key=lambda pair: pair[0].posted_at or "")
+    posts_text = "\n".join([item for _, item in chronological])
     
     try:
         response = client.chat.completions.create(
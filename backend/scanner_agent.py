@@ -9,6 +9,7 @@ from .ai_service import analyze_text
 from .subjects import add_content_log
 from .database import get_db_connection
 from .rag_service import augment_analysis_with_context
+from .prefilter_service import screen_content
 
 router = APIRouter()
 
@@ -23,6 +24,21 @@ async def process_content_background(log: ContentLog):
     Background task to analyze content and update the log with results.
     """
     try:
+        # 0. Local pre-filter: obviously benign content skips LLM analysis
+        screening = await screen_content(log.content)
+        if not screening["keep"]:
+            # Record the skip so the log is not mistaken for one still being analyzed
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE content_logs SET detected_trends = ?, prefilter_score = ? WHERE id = ?",
+                (json.dumps([]), screening["score"], log.id)
+            )
+            conn.commit()
+            conn.close()
+            print(f"Pre-filter skipped content log {log.id} (score {screening['score']:.2f})")
+            return
+        
         # 1. Analyze Text
         analysis = await analyze_text(log.content)
         
@@ -36,10 +52,11 @@ async def process_content_background(log: ContentLog):
         
         # Update the log with the analysis ID and detected trends
         cursor.execute(
-            "UPDATE content_logs SET analysis_id = ?, detected_trends = ? WHERE id = ?",
+            "UPDATE content_logs SET analysis_id = ?, detected_trends = ?, prefilter_score = ? WHERE id = ?",
             (
                 analysis.id,
                 json.dumps(analysis_dict.get("detected_themes", [])),
+                screening["score"],
                 log.id
             )
         )
@@ -0,0 +1,158 @@
+"""
+Semantic trend matcher for the listening stream.
+
+Complements the exact-phrase TrendMatcher: each trend (topic, description
+and common phrases) is embedded once into a row of a normalized NumPy
+matrix, and a batch of posts is scored against every trend with a single
+matrix multiply. Trends above SEMANTIC_MATCH_THRESHOLD cosine similarity are
+reported with their similarity, so paraphrases of a narrative match even
+when none of its phrases occur verbatim.
+
+Embeddings are requested in batches and cached by content hash, so a
+repeated post or an unchanged trend is never embedded twice.
+"""
+
+from typing import Dict, List, Optional
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import threading
+import time
+import numpy as np
+from openai import AsyncOpenAI
+from .models import DisinformationTrend
+from .trend_matcher import SEVERITY_RANK
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_MATCH_ENABLED = os.getenv("SEMANTIC_MATCH_ENABLED", "false").lower() == "true"
+SEMANTIC_MATCH_MODEL = os.getenv("SEMANTIC_MATCH_MODEL", "text-embedding-3-small")
+# Minimum cosine similarity between a post and a trend to count as a match
+SEMANTIC_MATCH_THRESHOLD = float(os.getenv("SEMANTIC_MATCH_THRESHOLD", "0.45"))
+SEMANTIC_EMBED_BATCH_SIZE = int(os.getenv("SEMANTIC_EMBED_BATCH_SIZE", "64"))
+SEMANTIC_EMBED_CACHE_SIZE = int(os.getenv("SEMANTIC_EMBED_CACHE_SIZE", "20000"))
+# Characters of a post sent for embedding
+SEMANTIC_MAX_CHARS = int(os.getenv("SEMANTIC_MAX_CHARS", "2000"))
+
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+
+# sha256(text) -> unit-length float32 vector
+_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(text: str) -> str:
+    return hashlib.sha256(f"{SEMANTIC_MATCH_MODEL}\n{text}".encode("utf-8")).hexdigest()
+
+
+async def embed_texts(texts: List[str]) -> np.ndarray:
+    """
+    Unit-normalized embeddings, one row per text. Cached texts are not
+    re-requested; the rest go out in batches of SEMANTIC_EMBED_BATCH_SIZE.
+    """
+    keys = [_cache_key(text) for text in texts]
+    vectors: Dict[str, np.ndarray] = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _embedding_cache:
+                _embedding_cache.move_to_end(key)
+                vectors[key] = _embedding_cache[key]
+
+    missing = list(OrderedDict((key, text) for key, text in zip(keys, texts) if key not in vectors).items())
+    metrics.increment("semantic_embed_cache.hits", len(texts) - len(missing))
+    metrics.increment("semantic_embed_cache.misses", len(missing))
+
+    for start in range(0, len(missing), SEMANTIC_EMBED_BATCH_SIZE):
+        batch = missing[start:start + SEMANTIC_EMBED_BATCH_SIZE]
+        request_start = time.perf_counter()
+        response = await client.embeddings.create(model=SEMANTIC_MATCH_MODEL, input=[text for _, text in batch])
+        metrics.observe("semantic_embed.batch_ms", (time.perf_counter() - request_start) * 1000)
+
+        for (key, _), item in zip(batch, sorted(response.data, key=lambda item: item.index)):
+            vector = np.asarray(item.embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            vectors[key] = vector / norm if norm else vector
+
+        with _cache_lock:
+            for key, _ in batch:
+                _embedding_cache[key] = vectors[key]
+            while len(_embedding_cache) > SEMANTIC_EMBED_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+
+    return np.vstack([vectors[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+
+def trend_text(trend: DisinformationTrend) -> str:
+    """What a trend is embedded as."""
+    parts = [trend.topic, trend.description or ""]
+    if trend.common_phrases:
+        parts.append("Common phrases: " + "; ".join(trend.common_phrases))
+    return "\n".join(part for part in parts if part)
+
+
+class SemanticMatcher:
+    """
+    Immutable trend-embedding matrix over a snapshot of trends. Build a new
+    one with SemanticMatcher.build when trends change and swap the reference.
+    """
+
+    def __init__(self, trends: List[DisinformationTrend], matrix: np.ndarray, threshold: float = SEMANTIC_MATCH_THRESHOLD):
+        self.trends = trends
+        # (trends, dimensions), unit rows
+        self.matrix = matrix
+        self.threshold = threshold
+
+    @classmethod
+    async def build(cls, trends: List[DisinformationTrend], threshold: float = SEMANTIC_MATCH_THRESHOLD) -> "SemanticMatcher":
+        # Unchanged trends hit the embedding cache, so only new or edited ones are embedded
+        matrix = await embed_texts([trend_text(trend) for trend in trends]) if trends else None
+        return cls(trends, matrix, threshold)
+
+    def score(self, post_vectors: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every post (rows) to every trend (columns)."""
+        return post_vectors @ self.matrix.T
+
+    async def match_batch(self, contents: List[str]) -> List[List[Dict]]:
+        """
+        For each post, the trends at or above the threshold, highest severity
+        then similarity first.
+
+        Returns:
+            [[{"trend": DisinformationTrend, "similarity": float}, ...], ...]
+        """
+        if not contents or self.matrix is None:
+            return [[] for _ in contents]
+
+        start = time.perf_counter()
+        similarities = self.score(await embed_texts([content[:SEMANTIC_MAX_CHARS] for content in contents]))
+        metrics.observe("semantic_match.batch_ms", (time.perf_counter() - start) * 1000)
+
+        results = []
+        for row in similarities:
+            hits = [
+                {"trend": self.trends[index], "similarity": float(row[index])}
+                for index in np.flatnonzero(row >= self.threshold)
+            ]
+            hits.sort(key=lambda hit: (SEVERITY_RANK.get(hit["trend"].severity, 0), hit["similarity"]), reverse=True)
+            results.append(hits)
+        return results
+
+
+def merge_matches(phrase_matches: List[Dict], semantic_matches: Optional[List[Dict]]) -> List[Dict]:
+    """
+    Exact phrase matches first, in their order, then trends only matched
+    semantically. Every match that has one carries its similarity.
+    """
+    if not semantic_matches:
+        return phrase_matches
+
+    similarity = {hit["trend"].id: hit["similarity"] for hit in semantic_matches}
+    merged = [{**match, "similarity": similarity[match["trend"].id]} if match["trend"].id in similarity else match for match in phrase_matches]
+    matched_ids = {match["trend"].id for match in phrase_matches}
+    merged.extend(
+        {"trend": hit["trend"], "phrases": [], "spans": [], "similarity": hit["similarity"]}
+        for hit in semantic_matches if hit["trend"].id not in matched_ids
+    )
+    return merged
@@ -0,0 +1,76 @@
+"""
+Persisted polling cursors for listening sources.
+
+Each source (one subreddit, one 4chan board) keeps a small JSON state
+(Reddit's newest fullname, the 4chan thread numbers already emitted) and the
+ETag / Last-Modified validators of its last response, so polls after a
+restart send conditional requests and only fetch what changed.
+"""
+
+from typing import Dict, Optional
+from datetime import datetime
+import json
+import os
+from .database import get_db_connection
+
+SOURCE_CURSORS_ENABLED = os.getenv("SOURCE_CURSORS_ENABLED", "true").lower() == "true"
+
+
+def empty_cursor() -> Dict:
+    return {"state": {}, "etag": None, "last_modified": None}
+
+
+def load_cursor(source_key: str) -> Dict:
+    """The stored cursor for a source, or an empty one."""
+    if not SOURCE_CURSORS_ENABLED:
+        return empty_cursor()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT state, etag, last_modified FROM source_cursors WHERE source_key = ?", (source_key,))
+    row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return empty_cursor()
+    return {
+        "state": json.loads(row['state']) if row['state'] else {},
+        "etag": row['etag'],
+        "last_modified": row['last_modified']
+    }
+
+
+def save_cursor(source_key: str, source_cursor: Dict):
+    if not SOURCE_CURSORS_ENABLED:
+        return
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT OR REPLACE INTO source_cursors (source_key, state, etag, last_modified, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            source_key,
+            json.dumps(source_cursor["state"]),
+            source_cursor["etag"],
+            source_cursor["last_modified"],
+            datetime.now().isoformat()
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def conditional_headers(source_cursor: Dict, headers: Optional[Dict] = None) -> Dict:
+    """Request headers plus If-None-Match / If-Modified-Since from the last response."""
+    merged = dict(headers or {})
+    if source_cursor.get("etag"):
+        merged["If-None-Match"] = source_cursor["etag"]
+    if source_cursor.get("last_modified"):
+        merged["If-Modified-Since"] = source_cursor["last_modified"]
+    return merged
+
+
+def update_validators(source_cursor: Dict, response_headers) -> None:
+    """Remember the validators of a 200 response for the next conditional request."""
+    source_cursor["etag"] = response_headers.get("ETag")
+    source_cursor["last_modified"] = response_headers.get("Last-Modified")
@@ -0,0 +1,48 @@
+"""
+Server-sent event helpers for streaming chat endpoints.
+Services yield {"event": ..., "data": ...} dicts; this module turns them
+into SSE frames and records time-to-first-token for each stream.
+"""
+
+from typing import AsyncIterator, Dict
+import json
+import time
+from fastapi.responses import StreamingResponse
+from . import metrics
+
+
+def format_sse(event: str, data, event_id=None) -> str:
+    """
+    Encode one server-sent event frame. Non-string data is sent as JSON.
+    An event_id is sent back by the browser as Last-Event-ID on reconnect.
+    """
+    payload = data if isinstance(data, str) else json.dumps(data)
+    lines = "\n".join(f"data: {line}" for line in payload.split("\n"))
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\n{lines}\n\n"
+
+
+async def sse_events(events: AsyncIterator[Dict], metric_name: str) -> AsyncIterator[str]:
+    """
+    Wrap a service event stream as SSE frames.
+    Records `<metric_name>.ttft_ms` at the first token and `<metric_name>.total_ms` at the end.
+    """
+    start = time.perf_counter()
+    first_token = True
+
+    async for event in events:
+        if event["event"] == "token" and first_token:
+            first_token = False
+            metrics.observe(f"{metric_name}.ttft_ms", (time.perf_counter() - start) * 1000)
+        yield format_sse(event["event"], event["data"], event.get("id"))
+
+    metrics.observe(f"{metric_name}.total_ms", (time.perf_counter() - start) * 1000)
+
+
+def sse_response(events: AsyncIterator[Dict], metric_name: str) -> StreamingResponse:
+    """Build a text/event-stream response that isn't buffered by proxies."""
+    return StreamingResponse(
+        sse_events(events, metric_name),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
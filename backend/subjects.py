@@ -103,7 +103,8 @@ async def get_content_logs(subject_id: str):
             source_url=row['source_url'],
             timestamp=row['timestamp'],
             analysis_id=row['analysis_id'],
-            detected_trends=json.loads(row['detected_trends']) if row['detected_trends'] else []
+            detected_trends=json.loads(row['detected_trends']) if row['detected_trends'] else [],
+            prefilter_score=row['prefilter_score']
         ))
     return logs
 
@@ -0,0 +1,54 @@
+"""
+Test script for local language identification.
+"""
+
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from language_id import identify_language, is_language
+
+# Sentences that are not part of the seed texts
+TEST_SENTENCES = {
+    "en": "My daughter keeps talking about the blackpill and I do not know what to do.",
+    "sw": "Asante kwa ushauri wako, umetusaidia sana.",
+    "zu": "Ngiyabonga ngeseluleko sakho, sikusizile kakhulu.",
+    "xh": "Unyana wam uthetha ngale nto yonke imihla, ndenze ntoni?",
+    "yo": "Ọmọbìnrin mi ń sọ̀rọ̀ nípa èyí lójoojúmọ́, kí ni kí n ṣe?",
+    "ig": "Nwa m nwanyị na-ekwu maka nke a kwa ụbọchị, gịnị ka m ga-eme?",
+    "ha": "Yata tana magana game da wannan kowace rana, me zan yi?",
+    "am": "ልጄ በየቀኑ ስለዚህ ጉዳይ ትናገራለች፣ ምን ላድርግ?",
+    "so": "Gabadhaydu maalin kasta way ka hadashaa arrintan, maxaan sameeyaa?",
+    "sn": "Mwanasikana wangu anotaura nezvenyaya iyi mazuva ose, ndoita sei?",
+    "af": "Dankie vir die raad, dit het ons baie gehelp.",
+    "om": "Intalli koo guyyaa guyyaan waa'ee kanaa dubbatti, maal gochuun qaba?",
+    "rw": "Umukobwa wanjye avuga kuri ibi buri munsi, nkore iki?",
+    "tw": "Me babaa ka ho asɛm da biara, dɛn na menyɛ?",
+    "st": "Ke a leboha ka keletso ya hao, e re thusitse haholo."
+}
+
+
+def test_language_id():
+    print("🧪 Testing Local Language Identification\n")
+    print("=" * 60)
+
+    for language, sentence in TEST_SENTENCES.items():
+        result = identify_language(sentence)
+        status = "✅" if result["best_guess"] == language else "❌"
+        print(f"{status} {language}: guessed {result['best_guess']} "
+              f"(confident: {result['language'] is not None}, margin {result['margin']})")
+        assert result["best_guess"] == language, f"Misidentified {language} as {result['best_guess']}"
+
+    # English input is confidently recognised, so translation can be skipped
+    assert is_language(TEST_SENTENCES["en"], "en")
+    # Short strings are never identified
+    assert identify_language("Hello")["language"] is None
+
+    print("\n" + "=" * 60)
+    print("✅ All language identification tests passed!\n")
+
+
+if __name__ == "__main__":
+    test_language_id()
@@ -0,0 +1,85 @@
+"""
+Accuracy parity between the PyTorch and ONNX (int8) empathy/emotion backends.
+Exports the ONNX models on first run (needs optimum[onnxruntime]).
+"""
+
+import sys
+import os
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.empathy_service import (
+    EMPATHY_MODEL_NAME,
+    EMOTION_MODEL_NAME,
+    _load_pipeline,
+    _scores_by_label
+)
+
+# Allowed per-label score difference and minimum top-label agreement
+MAX_SCORE_DIFF = 0.05
+MIN_TOP_LABEL_AGREEMENT = 0.95
+
+TEST_MESSAGES = [
+    "I can really understand how you're feeling. I've been there too, and I'm here for you.",
+    "You're just wrong about this. The facts clearly show otherwise.",
+    "I can't take this anymore. Everything feels hopeless and I don't know what to do.",
+    "This is absolutely ridiculous! Nobody understands what I'm going through!",
+    "Can you explain what you mean by that? I'm interested in learning more.",
+    "It's over for guys like us, the system is rigged from the start.",
+    "Thanks for listening, honestly it helps more than you know.",
+    "Why would I trust anyone who says that? They've lied before.",
+    "I'm scared about what happens next, but I'm glad we talked.",
+    "Women only care about status, it's biology, accept it.",
+    "My son barely leaves his room anymore and I'm worried sick.",
+    "That's a fair point, I hadn't thought about it that way."
+]
+
+
+def compare(model_name: str) -> bool:
+    print(f"\n📝 Model: {model_name}")
+    print("-" * 60)
+
+    try:
+        from backend.onnx_backend import load_onnx_pipeline
+        onnx_model = load_onnx_pipeline(model_name)
+    except ImportError as e:
+        print(f"❌ ONNX backend unavailable: {e}")
+        return False
+    torch_model = _load_pipeline(model_name, backend="pytorch")
+
+    torch_results = [_scores_by_label(r) for r in torch_model(TEST_MESSAGES)]
+    onnx_results = [_scores_by_label(r) for r in onnx_model(TEST_MESSAGES)]
+
+    max_diff = 0.0
+    agreements = 0
+    for torch_scores, onnx_scores in zip(torch_results, onnx_results):
+        max_diff = max(max_diff, max(abs(torch_scores[label] - onnx_scores.get(label, 0.0)) for label in torch_scores))
+        if max(torch_scores, key=torch_scores.get) == max(onnx_scores, key=onnx_scores.get):
+            agreements += 1
+
+    agreement = agreements / len(TEST_MESSAGES)
+    print(f"Max score difference: {max_diff:.4f} (limit {MAX_SCORE_DIFF})")
+    print(f"Top-label agreement: {agreement:.0%} (minimum {MIN_TOP_LABEL_AGREEMENT:.0%})")
+
+    passed = max_diff <= MAX_SCORE_DIFF and agreement >= MIN_TOP_LABEL_AGREEMENT
+    print("✅ Parity OK" if passed else "❌ Parity check failed")
+    return passed
+
+
+def test_onnx_parity():
+    # The ONNX backend is an optional dependency; skip rather than fail without it
+    pytest.importorskip("optimum.onnxruntime")
+
+    print("🧪 Testing ONNX backend parity\n")
+    print("=" * 60)
+
+    results = [compare(EMPATHY_MODEL_NAME), compare(EMOTION_MODEL_NAME)]
+
+    print("\n" + "=" * 60)
+    assert all(results), "ONNX backend diverges from PyTorch"
+
+
+if __name__ == "__main__":
+    test_onnx_parity()
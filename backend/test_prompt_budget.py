@@ -0,0 +1,42 @@
+"""
+Test script for token-budgeted prompt assembly.
+"""
+
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from prompt_budget import count_tokens, truncate_to_tokens, pack_items, get_budget
+
+
+def test_prompt_budget():
+    print("🧪 Testing Prompt Budget\n")
+    print("=" * 60)
+
+    text = "The quick brown fox jumps over the lazy dog. " * 50
+    tokens = count_tokens(text)
+    print(f"✓ Counted {tokens} tokens in {len(text)} characters")
+    assert tokens > 0
+
+    truncated = truncate_to_tokens(text, 20)
+    print(f"✓ Truncated to 20 tokens: \"{truncated[:60]}...\"")
+    assert count_tokens(truncated) <= 21
+
+    posts = [f"Post {i}: " + "some words about the topic " * 10 for i in range(50)]
+    packed = pack_items(posts, budget=300, label="posts")
+    print(f"✓ Packed {packed['included']} posts ({packed['tokens']} tokens), dropped {packed['dropped']}")
+    assert packed["included"] + packed["dropped"] == len(posts)
+    assert packed["tokens"] <= 300
+    # Priority order is kept: the packed items are a prefix of the input
+    assert packed["items"] == posts[:packed["included"]]
+
+    print(f"✓ gpt-4 budget: {get_budget('gpt-4')} tokens, gpt-4o half share: {get_budget('gpt-4o', 0.5)} tokens")
+
+    print("\n" + "=" * 60)
+    print("✅ All prompt budget tests completed!\n")
+
+
+if __name__ == "__main__":
+    test_prompt_budget()
@@ -0,0 +1,68 @@
+"""
+Test script for the Aho-Corasick trend matcher.
+"""
+
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backend.models import DisinformationTrend
+from backend.trend_matcher import TrendMatcher
+
+
+def make_trend(trend_id: str, severity: str, phrases):
+    return DisinformationTrend(
+        id=trend_id,
+        topic=f"Topic {trend_id}",
+        description="",
+        severity=severity,
+        common_phrases=phrases,
+        counter_arguments=[]
+    )
+
+
+def test_trend_matcher():
+    print("🧪 Testing Trend Matcher\n")
+    print("=" * 60)
+
+    trends = [
+        make_trend("blackpill", "High", ["blackpill", "it's over", "lie down and rot"]),
+        make_trend("alpha", "Medium", ["alpha male", "high value man"]),
+        make_trend("shared", "Low", ["it's over"])
+    ]
+    matcher = TrendMatcher(trends)
+
+    post = "Honestly the BLACKPILL is right, it’s over for us.\nBe an  Alpha\tMale instead."
+    matches = matcher.match(post)
+    matched_ids = [match["trend"].id for match in matches]
+    print(f"Matched trends: {matched_ids}")
+
+    # Every matching trend is returned, highest severity first
+    assert matched_ids == ["blackpill", "alpha", "shared"], matched_ids
+
+    # Spans point back into the original (un-normalized) text
+    spans = [post[start:end] for start, end in matches[0]["spans"]]
+    print(f"Blackpill spans: {spans}")
+    assert spans == ["BLACKPILL", "it’s over"], spans
+    assert post[slice(*matches[1]["spans"][0])] == "Alpha\tMale"
+
+    # By default phrases match as substrings, like the original scan: plurals and hashtags count
+    assert matcher.first_match("alpha males everywhere").id == "alpha"
+    assert matcher.first_match("#blackpillforever").id == "blackpill"
+
+    # Word boundaries: punctuation ends a phrase, but "alpha males" is a different word
+    bounded = TrendMatcher(trends, word_boundary=True)
+    assert bounded.first_match("alpha male, everywhere").id == "alpha"
+    assert bounded.first_match("alpha males everywhere") is None
+    assert bounded.first_match("#blackpillforever") is None
+
+    assert matcher.match("Nothing to see here") == []
+
+    print("\n" + "=" * 60)
+    print("✅ All trend matcher tests passed!\n")
+
+
+if __name__ == "__main__":
+    test_trend_matcher()
@@ -4,15 +4,26 @@ Uses OpenAI to translate between English and target African languages.
 """
 
 import os
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import json
 import logging
+import re
+from datetime import datetime
 from openai import AsyncOpenAI
+from .database import get_db_connection
+from .language_id import is_language
+from . import metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+
+# Successful translations are cached in SQLite, keyed by (text hash, source, target)
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
 
 SUPPORTED_LANGUAGES = {
     "en": "English",
@@ -32,6 +43,82 @@ SUPPORTED_LANGUAGES = {
     "st": "Sesotho"
 }
 
+def build_translation_prompt(target_lang: str) -> str:
+    """System prompt for translating into the target language."""
+    target_lang_name = SUPPORTED_LANGUAGES.get(target_lang, target_lang)
+    
+    return f"""You are a professional translator. 
+    Translate the following text into {target_lang_name}.
+    Maintain the tone, nuance, and emotional context of the original text.
+    If the text is technical or specific to the Recapture application context (radicalization, social media), ensure accurate terminology.
+    Return ONLY the translated text, no introductory or concluding remarks.
+    """
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_cached_translations(texts: List[str], target_lang: str, source_lang: str) -> Dict[str, str]:
+    """
+    Look up cached translations.
+    
+    Returns:
+        {original text: translated text} for the texts found in the cache
+    """
+    if not TRANSLATION_CACHE_ENABLED or not texts:
+        return {}
+    
+    hashes = {_text_hash(text): text for text in texts}
+    placeholders = ",".join("?" for _ in hashes)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""SELECT text_hash, translated_text FROM translation_cache
+        WHERE source_lang = ? AND target_lang = ? AND text_hash IN ({placeholders})""",
+        (source_lang, target_lang, *hashes.keys())
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    
+    cached = {hashes[row['text_hash']]: row['translated_text'] for row in rows}
+    metrics.increment("translation_cache.hits", len(cached))
+    metrics.increment("translation_cache.misses", len(hashes) - len(cached))
+    return cached
+
+
+def store_translations(translations: Dict[str, str], target_lang: str, source_lang: str):
+    """Cache successful translations ({original text: translated text})."""
+    if not TRANSLATION_CACHE_ENABLED or not translations:
+        return
+    
+    now = datetime.now().isoformat()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        """INSERT OR REPLACE INTO translation_cache
+        (text_hash, source_lang, target_lang, translated_text, created_at)
+        VALUES (?, ?, ?, ?, ?)""",
+        [
+            (_text_hash(text), source_lang, target_lang, translated, now)
+            for text, translated in translations.items()
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+def already_in_language(text: str, target_lang: str) -> bool:
+    """
+    True if local language ID is confident text is already in target_lang,
+    so the translation call can be skipped. Skips are counted in metrics.
+    """
+    if is_language(text, target_lang):
+        metrics.increment("language_id.translations_skipped")
+        return True
+    return False
+
+
 async def translate_text(text: str, target_lang: str, source_lang: str = "auto") -> str:
     """
     Translate text to the target language using OpenAI.
@@ -44,22 +131,29 @@ async def translate_text(text: str, target_lang: str, source_lang: str = "auto")
     Returns:
         Translated text
     """
+    # Nothing to translate; blank text is returned unchanged, as translate_batch does
     if not text or not text.strip():
-        return ""
+        return text or ""
         
     # If target is English and source is English (or auto and text looks English), 
     # we might skip, but for now let's rely on the caller to check if translation is needed.
     if target_lang == "en" and source_lang == "en":
         return text
 
-    target_lang_name = SUPPORTED_LANGUAGES.get(target_lang, target_lang)
+    # e.g. a user with language "zu" who typed in English
+    if already_in_language(text, target_lang):
+        return text
+
+    cached = get_cached_translations([text], target_lang, source_lang)
+    if text in cached:
+        return cached[text]
     
-    system_prompt = f"""You are a professional translator. 
-    Translate the following text into {target_lang_name}.
-    Maintain the tone, nuance, and emotional context of the original text.
-    If the text is technical or specific to the Recapture application context (radicalization, social media), ensure accurate terminology.
-    Return ONLY the translated text, no introductory or concluding remarks.
-    """
+    return await _translate_uncached(text, target_lang, source_lang)
+
+
+async def _translate_uncached(text: str, target_lang: str, source_lang: str) -> str:
+    """One translation API call; successful results are cached."""
+    system_prompt = build_translation_prompt(target_lang)
 
     try:
         response = await client.chat.completions.create(
@@ -72,6 +166,8 @@ async def translate_text(text: str, target_lang: str, source_lang: str = "auto")
         )
         
         translated_text = response.choices[0].message.content.strip()
+        if translated_text:
+            store_translations({text: translated_text}, target_lang, source_lang)
         return translated_text
         
     except Exception as e:
@@ -79,6 +175,133 @@ async def translate_text(text: str, target_lang: str, source_lang: str = "auto")
         # Fallback: return original text if translation fails
         return text
 
+async def translate_batch(texts: List[str], target_lang: str, source_lang: str = "auto") -> List[str]:
+    """
+    Translate many strings with one API call.
+    Cached strings are not sent; if the batched response can't be matched up
+    with the inputs, each remaining string is translated on its own.
+    
+    Returns:
+        Translations in the same order as texts
+    """
+    if target_lang == source_lang:
+        return list(texts)
+    
+    unique = list(dict.fromkeys(text for text in texts if text and text.strip()))
+    translations = {text: text for text in unique if already_in_language(text, target_lang)}
+    translations.update(get_cached_translations(
+        [text for text in unique if text not in translations], target_lang, source_lang
+    ))
+    missing = [text for text in unique if text not in translations]
+    
+    if len(missing) == 1:
+        translations[missing[0]] = await _translate_uncached(missing[0], target_lang, source_lang)
+    elif missing:
+        target_lang_name = SUPPORTED_LANGUAGES.get(target_lang, target_lang)
+        system_prompt = f"""{build_translation_prompt(target_lang)}
+    You will receive a JSON object {{"texts": [...]}}. Translate every string into {target_lang_name}.
+    Return a JSON object {{"translations": [...]}} with exactly one translation per input string, in the same order.
+    """
+        batch = []
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": json.dumps({"texts": missing}, ensure_ascii=False)}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            batch = json.loads(response.choices[0].message.content).get("translations", [])
+        except Exception as e:
+            logger.error(f"Batch translation error: {e}")
+        
+        if len(batch) == len(missing) and all(isinstance(t, str) and t.strip() for t in batch):
+            translated = {text: t.strip() for text, t in zip(missing, batch)}
+            store_translations(translated, target_lang, source_lang)
+            translations.update(translated)
+        else:
+            logger.warning(f"Batch translation returned {len(batch)} of {len(missing)} items, translating individually")
+            results = await asyncio.gather(*[_translate_uncached(text, target_lang, source_lang) for text in missing])
+            translations.update(zip(missing, results))
+    
+    # Blank strings are returned unchanged
+    return [translations.get(text, text) if text and text.strip() else text or "" for text in texts]
+
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) before whitespace, or a line break
+SENTENCE_END = re.compile(r'[.!?…]["\'”’)\]]*\s+|\n+')
+# Shorter pieces are joined to the next sentence
+MIN_SENTENCE_CHARS = 20
+# A period after these doesn't end a sentence
+ABBREVIATIONS = {"e.g", "i.e", "etc", "vs", "mr", "mrs", "ms", "dr", "prof", "st", "no"}
+
+
+def split_sentences(buffer: str):
+    """
+    Split complete sentences off the front of buffer.
+
+    Returns:
+        (sentences, rest): sentences keep their trailing whitespace; rest is
+        the unfinished tail
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(buffer):
+        words = buffer[start:match.start()].split()
+        if buffer[match.start()] == "." and words and words[-1].lower() in ABBREVIATIONS:
+            continue
+        if match.end() - start >= MIN_SENTENCE_CHARS:
+            sentences.append(buffer[start:match.end()])
+            start = match.end()
+    return sentences, buffer[start:]
+
+
+async def stream_translate_sentences(tokens: AsyncIterator[str], target_lang: str, source_lang: str = "auto") -> AsyncIterator[str]:
+    """
+    Translate a token stream sentence by sentence while it is still being
+    generated. Each sentence is translated (through the cache) as soon as it
+    is complete, and translations are yielded in order, so the first
+    translated sentence arrives after one sentence rather than after the
+    whole text. Each sentence is translated without the others as context.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+
+    def translate(segment: str):
+        content = segment.rstrip()
+        return asyncio.create_task(translate_text(content, target_lang, source_lang)), segment[len(content):]
+
+    async def read_tokens():
+        buffer = ""
+        try:
+            async for token in tokens:
+                sentences, buffer = split_sentences(buffer + token)
+                for sentence in sentences:
+                    pending.put_nowait(translate(sentence))
+            if buffer.strip():
+                pending.put_nowait(translate(buffer))
+        finally:
+            pending.put_nowait(None)
+
+    reader = asyncio.create_task(read_tokens())
+    try:
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            task, whitespace = item
+            yield await task + whitespace
+        # Re-raise a failure of the source stream
+        await reader
+    finally:
+        reader.cancel()
+        while not pending.empty():
+            item = pending.get_nowait()
+            if item is not None:
+                item[0].cancel()
+
+
 async def translate_input_to_english(text: str, source_lang: str) -> str:
     """Helper to translate user input to English for processing"""
     if source_lang == "en":
@@ -0,0 +1,158 @@
+"""
+Multi-pattern trend matcher for the listening stream.
+
+Compiles every trend's common_phrases into one Aho-Corasick automaton, so a
+post is scanned once regardless of how many trends and phrases there are,
+and every matching trend is returned with the spans it matched.
+
+Phrases match anywhere in a post by default, as the original substring scan
+did, so "alpha male" also matches "alpha males" and "#alpha male".
+word_boundary=True restricts matches to whole words, trading that recall for
+fewer false positives.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+import unicodedata
+from .models import DisinformationTrend
+
+SEVERITY_RANK = {"High": 3, "Medium": 2, "Low": 1}
+
+# Typographic quotes and dashes folded to their ASCII forms
+PUNCTUATION_FOLDING = str.maketrans({"‘": "'", "’": "'", "ʼ": "'", "“": '"', "”": '"', "–": "-", "—": "-"})
+
+
+def normalize_with_offsets(text: str, normalize: bool = True) -> Tuple[str, List[int]]:
+    """
+    Casefold and NFKC-normalize text, fold typographic quotes and collapse
+    whitespace runs to one space.
+
+    Returns:
+        (normalized text, original index of each normalized character)
+    """
+    if not normalize:
+        return text, list(range(len(text)))
+
+    chars: List[str] = []
+    offsets: List[int] = []
+    for index, char in enumerate(text):
+        if char.isspace():
+            if chars and chars[-1] != " ":
+                chars.append(" ")
+                offsets.append(index)
+            continue
+        for normalized in unicodedata.normalize("NFKC", char).casefold().translate(PUNCTUATION_FOLDING):
+            chars.append(normalized)
+            offsets.append(index)
+    return "".join(chars), offsets
+
+
+class TrendMatcher:
+    """
+    Immutable automaton over a snapshot of trends. Build a new one when trends
+    change and swap the reference; matching never sees a half-built state.
+    """
+
+    def __init__(self, trends: List[DisinformationTrend], word_boundary: bool = False, normalize: bool = True):
+        self.trends = {trend.id: trend for trend in trends}
+        self.word_boundary = word_boundary
+        self.normalize = normalize
+
+        # Trie as parallel lists: goto transitions, failure links, output phrase ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # phrase id -> (normalized phrase, trend ids using it)
+        self._phrases: List[Tuple[str, List[str]]] = []
+
+        phrase_ids: Dict[str, int] = {}
+        for trend in trends:
+            for phrase in trend.common_phrases:
+                normalized, _ = normalize_with_offsets(phrase.strip(), normalize)
+                if not normalized:
+                    continue
+                if normalized not in phrase_ids:
+                    phrase_ids[normalized] = len(self._phrases)
+                    self._phrases.append((normalized, []))
+                    self._insert(normalized, phrase_ids[normalized])
+                trend_ids = self._phrases[phrase_ids[normalized]][1]
+                if trend.id not in trend_ids:
+                    trend_ids.append(trend.id)
+
+        self._build_failure_links()
+
+    @property
+    def phrase_count(self) -> int:
+        return len(self._phrases)
+
+    def _insert(self, phrase: str, phrase_id: int):
+        node = 0
+        for char in phrase:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node].append(phrase_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit the outputs of the longest proper suffix
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _is_boundary(self, text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def match(self, content: str) -> List[Dict]:
+        """
+        Every trend whose phrases occur in content, highest severity first.
+
+        Returns:
+            [{"trend": DisinformationTrend, "phrases": [...], "spans": [(start, end), ...]}]
+            with spans as offsets into the original content
+        """
+        text, offsets = normalize_with_offsets(content, self.normalize)
+        hits: Dict[str, Dict] = {}
+
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for phrase_id in self._output[node]:
+                phrase, trend_ids = self._phrases[phrase_id]
+                start = position - len(phrase) + 1
+                if self.word_boundary and not self._is_boundary(text, start, position + 1):
+                    continue
+
+                span = (offsets[start], offsets[position] + 1)
+                for trend_id in trend_ids:
+                    hit = hits.setdefault(trend_id, {"trend": self.trends[trend_id], "phrases": [], "spans": []})
+                    if phrase not in hit["phrases"]:
+                        hit["phrases"].append(phrase)
+                    hit["spans"].append(span)
+
+        return sorted(
+            hits.values(),
+            key=lambda hit: (SEVERITY_RANK.get(hit["trend"].severity, 0), len(hit["spans"])),
+            reverse=True
+        )
+
+    def first_match(self, content: str) -> Optional[DisinformationTrend]:
+        """The highest-severity matching trend, if any."""
+        matches = self.match(content)
+        return matches[0]["trend"] if matches else None
@@ -4,32 +4,23 @@ from .models import DisinformationTrend, RedFlag
 
 import uuid
 import json
-from typing import List
+from typing import List, Optional
 from .models import DisinformationTrend
 from .database import get_db_connection
+from .trend_registry import trend_registry
 
 async def get_active_trends() -> List[DisinformationTrend]:
     """
-    Retrieves currently active disinformation trends from the database.
+    Retrieves currently active disinformation trends.
+    Served from the in-memory registry; the database is read once.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM trends")
-    rows = cursor.fetchall()
-    conn.close()
-    
-    trends = []
-    for row in rows:
-        trends.append(DisinformationTrend(
-            id=row['id'],
-            topic=row['topic'],
-            description=row['description'],
-            severity=row['severity'],
-            common_phrases=json.loads(row['common_phrases']),
-            counter_arguments=json.loads(row['counter_arguments']),
-            sources=json.loads(row['sources']) if row['sources'] else []
-        ))
-    return trends
+    return trend_registry.get_trends()
+
+async def get_trend(trend_id: str) -> Optional[DisinformationTrend]:
+    """
+    Looks up one trend by id.
+    """
+    return trend_registry.get_trend(trend_id)
 
 async def add_trend(trend: DisinformationTrend):
     """
@@ -53,5 +44,8 @@ async def add_trend(trend: DisinformationTrend):
     
     conn.commit()
     conn.close()
+
+    # Subscribers (listening matcher, vector store, pre-filter) pick up the change
+    trend_registry.upsert(trend)
     return trend
 
@@ -0,0 +1,133 @@
+"""
+In-memory registry of disinformation trends.
+
+Trends are read from the database once, kept as parsed DisinformationTrend
+objects and updated by trend writes (trend_monitor.add_trend). Every change
+bumps a version number and notifies subscribers, so derived indexes (the
+listening matcher, the vector store, the pre-filter phrase list) are rebuilt
+only when trends actually change.
+
+Each worker process has its own registry. Writes also bump the shared
+"trends" version in the database, and refresh() reloads a registry whose
+worker missed a write made by another worker.
+"""
+
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import threading
+from .models import DisinformationTrend
+from .database import get_db_connection
+from .leader_election import bump_version, get_version
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Shared version counter bumped on every trend write
+TRENDS_VERSION = "trends"
+
+# callback(trends, change) where change is {"version", "action", "trend"}
+Subscriber = Callable[[List[DisinformationTrend], Dict], None]
+
+
+def _row_to_trend(row) -> DisinformationTrend:
+    return DisinformationTrend(
+        id=row['id'],
+        topic=row['topic'],
+        description=row['description'],
+        severity=row['severity'],
+        common_phrases=json.loads(row['common_phrases']),
+        counter_arguments=json.loads(row['counter_arguments']),
+        sources=json.loads(row['sources']) if row['sources'] else []
+    )
+
+
+class TrendRegistry:
+    def __init__(self):
+        self._trends: Dict[str, DisinformationTrend] = {}
+        self._snapshot: List[DisinformationTrend] = []
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version = 0
+        # Shared version the in-memory trends correspond to
+        self._shared_version = 0
+
+    def load(self):
+        """Read every trend from the database. Called lazily on first access."""
+        # Read before the rows, so a write that lands in between triggers another refresh
+        shared_version = get_version(TRENDS_VERSION)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM trends")
+        rows = cursor.fetchall()
+        conn.close()
+
+        with self._lock:
+            self._trends = {row['id']: _row_to_trend(row) for row in rows}
+            self._snapshot = list(self._trends.values())
+            self._loaded = True
+            self._shared_version = shared_version
+            self.version += 1
+            trends, version = self._snapshot, self.version
+        metrics.set_gauge("trends.version", version)
+        self._notify(trends, {"version": version, "action": "load", "trend": None})
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def refresh(self) -> bool:
+        """Reload if another worker has written trends since the last load. Returns whether it did."""
+        if not self._loaded:
+            return False
+        if get_version(TRENDS_VERSION) == self._shared_version:
+            return False
+        self.load()
+        return True
+
+    def get_trends(self) -> List[DisinformationTrend]:
+        """The current trends. The list is a snapshot; callers must not mutate it."""
+        self._ensure_loaded()
+        return self._snapshot
+
+    def get_trend(self, trend_id: str) -> Optional[DisinformationTrend]:
+        self._ensure_loaded()
+        return self._trends.get(trend_id)
+
+    def upsert(self, trend: DisinformationTrend):
+        """Record a trend that has just been written to the database."""
+        self._ensure_loaded()
+        shared_version = bump_version(TRENDS_VERSION)
+        with self._lock:
+            action = "update" if trend.id in self._trends else "add"
+            # Otherwise another worker wrote too, and refresh() picks up both
+            if shared_version == self._shared_version + 1:
+                self._shared_version = shared_version
+            self._trends[trend.id] = trend
+            self._snapshot = list(self._trends.values())
+            self.version += 1
+            trends, version = self._snapshot, self.version
+        metrics.set_gauge("trends.version", version)
+        self._notify(trends, {"version": version, "action": action, "trend": trend})
+
+    def subscribe(self, callback: Subscriber):
+        """Call callback(trends, change) after every change to the registry."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _notify(self, trends: List[DisinformationTrend], change: Dict):
+        for callback in list(self._subscribers):
+            try:
+                callback(trends, change)
+            except Exception as e:
+                # One failing index must not stop the write or the other subscribers
+                logger.error(f"Trend subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+# Global instance
+trend_registry = TrendRegistry()
@@ -13,6 +13,7 @@ client = chromadb.PersistentClient(path="./chroma_db")
 # Use OpenAI Embedding Function
 openai_ef = embedding_functions.OpenAIEmbeddingFunction(
     api_key=os.getenv("OPENAI_API_KEY"),
+    api_base=os.getenv("OPENAI_BASE_URL"),
     model_name="text-embedding-3-small"
 )
 
@@ -36,6 +37,20 @@ def add_documents(documents: List[str], metadatas: List[Dict], ids: List[str]):
     except Exception as e:
         print(f"Error adding documents: {e}")
 
+def upsert_documents(documents: List[str], metadatas: List[Dict], ids: List[str]):
+    """
+    Adds documents to the vector store, replacing any with the same ids.
+    """
+    try:
+        collection.upsert(
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids
+        )
+        print(f"Successfully upserted {len(documents)} documents in vector store.")
+    except Exception as e:
+        print(f"Error upserting documents: {e}")
+
 def query_documents(query_text: str, n_results: int = 5) -> List[Dict]:
     """
     Queries the vector store for relevant documents.
@@ -13,16 +13,24 @@ const ListeningFeed = () => {
     const itemsPerPage = 5;
     const feedEndRef = useRef(null);
 
-    // Poll for updates when listening
+    // Push updates from the live stream when listening
     useEffect(() => {
         fetchFeed(currentPage);
         checkStatus();
 
-        let interval;
+        let source;
         if (isListening) {
-            interval = setInterval(() => fetchFeed(currentPage, true), 3000); // Silent refresh
+            // Only results stored from now on; the browser resumes from the last event id on reconnect
+            source = new EventSource(`http://localhost:8000/api/listening/stream?cursor=-1`);
+            source.addEventListener('result', (event) => {
+                const item = JSON.parse(event.data);
+                setStats(prev => ({ ...prev, total: prev.total + 1 }));
+                if (currentPage === 1) {
+                    setFeed(prev => [item, ...prev.filter(existing => existing.id !== item.id)].slice(0, itemsPerPage));
+                }
+            });
         }
-        return () => clearInterval(interval);
+        return () => source && source.close();
     }, [isListening, currentPage]);
 
     const checkStatus = async () => {